@@ -0,0 +1,17 @@
+// Generated by inline_sprites.py from the PNGs in client/public. Do not edit;
+// re-run `python inline_sprites.py` after changing a sprite.
+
+// Sprites whose optimized encoding is at most 8192 bytes, as data URIs
+export const INLINE_SPRITES: Record<string, string> = {
+  // 96x96, 2704 bytes
+  '/images/bomb.png': 'data:image/webp;base64,UklGRogKAABXRUJQVlA4WAoAAAAQAAAAXwAAXwAAQUxQSCkEAAABDAVtGzk1f9g3fiCIiAnIvyxg0N5IyUz+pUTbtmnbmWut/W0bsW3btoq2naJt20nRTs1OSrbx7XvO3nvNwsVvbZ9bTVpETADd2raWbVUHNEAhFEAPdOMU4NADoafukbtL5C73fZ6zVnDO87zf7SAiJgD/K1C0XaSbWLAQtE+oBUFXCyYAFJ3FmiemADB02lobrTdrNNpNFdj3pqfuP2cTQKRZYgC27jh6+d2v0H8fHpzctX0LgLXeZsd3jgCsSQYMP+6l75ZYv39k+9l/sKrJViRfmAFrjChGXPADaWstAojobemSc1iTv8whq4p/bA1riAJHf0fGGMh0RGf0D1YfNm7/V8kWF20CbUTA+GfImL2rIzznlL/cGwCOnsMWfxil0oCAjb5lzPQeHejunslbNAzAWj+wxRth5QXsvIC19z6qU+Rzg2QQ1lmY0qIJkNIM2y5n9K4WOOde8ZUBOggXcQWPRihMsfocJiYFtHCCik9igK7Sin5laWJDvmD00oFkma94CWzSsuzXlWa4kzV7KpXaUY55G5zIFTypMMP2jO4uKlnAkROe+O4Ri3NszYQWpfYJo7PrwIwJk7jTSbZ4AwwlBxzO6G2MFUVNoEl395wS3xikUpTKhx7d3ZMgWaSW+VQ9PgSCkg1bMntn0/+c+A2gKDrggAuggslCdBNEbJPCxB7aGRa1sAlZ3I9QlGKtzqSAIOVmmpegRQUcbatEBJBSnTJB+Gk0pKwrXJIIA1OgrhJwY2hZT9pcg6LKSAGhBzQPhJWkeMPmdCU++SGViuPm8QhlvWNHQaUQsbv/tsEod8/dsi+eX5bgIztZABmKagUCdk+cTxeVpXjblgRUlGgAARNZUVk8vyzDKzbJghmHE2agd1g8oayAh2wAAgh07+wyQKYocvMgWFmXuUi2Cp8fF2ReGYabQUsy7G9PqiiIAjqlCArhl7GQkhTT/sjaaAJzgHXzIhRFC27YJ0zKai3AxT0IZQVcztqd7lYqm6Fj9k1hZSnWqN3d6YDzU2CV/FMRFK54mdHd3QoQ5hTEtsgTEUoz7MTUjVJcgSrunvzXYSKlQfEGo3e2AGVeKCJPREDxho3TyqioKAQICO6RnwWV8mC4hnUHqWCkyDDHvBUMDRQb8CEjBaWBJBT481jGFS+FoZGKVf5loruTdJBh+HqnuY3uFZ9FkGbAsM1SprYFj/cGSmdWfGuQCpoasNMi1p45/56VIQY13xoGRXMDNv+JdSbpyAZT5jODoWhywOQXyDpHl6GjVDNfCiiabcBpc8g6szrV5CfbQwVNF8WMe5aRfekxirZA/nTmAAT0QwPWuPZHVXpbltbNH5w2ClD0RzFg6J43vzeXnfNvr1yyKQAT9E0NADB2o32OO+mkY3dfexgABEFfFQuCHjUo+rGohRCCqeC/1AEAVlA4IDgGAACwHACdASpgAGAAPjEYiUMiIaEU6XTMIAMEtABrFsbdl/j/yM9m2sf1D8CesnoY458vTl7/R/bX2i/yj7AH6W/5vqNeYD9gP1s7AH+I9QD+p/2/0qvYJ9AD9ZvVa/3v7bfA1+0H7KfAJ+vH/f6wDgM9GCOL8J/vvxAb1jAzSXzLvGt9EewJ+qv/U6/fogfsWxzaDwJfugcQ2vOMec9KpH5qpGKvkTyoZBDjdWMulpVlCT+fwapU/X3HfZPtXDmq6erpzMlL40yBzW5S2piuYFxgSlR0tHraGLyqd0cLsYycMhM7g5ioJQAVEMYnXkoAAP7/YBgBd//icE0YKneDms2CmPNT5FarOv+9/+rz34pwuH2sdcj/8Kxyv6Lf8lmuLn5XO2+vhb5CmPQYLk6GAfZMYyZaqk6kfeDqq6FNRM64jioC2SgVSGpcib5OPNakzsXC6HW/DHEl17q+z3hvpCnWALcJur/GH+56chI0PiVvJI6k5ZKd4vtfLHUcBB/HiP9GaCqmbEJBfnheLQ9W/sQh9OfN0eAP79Fuh2xU0ZDSBgNUtwE/ItigA0Nngdu1q6WStoxcbfL0Wvc0awlOyBvyKEN5rw85mPIYLpUYZ5nH4NauQ+I5Mm0go7ByHadfa3vwweQ8yw7R2O/RMxgsQRb3Vj9r9CwGx84HT701dmFtPmIn1KipSV1Xqm/GrmU2SS1TXfTXp1eInf8l7kiDxIUds2n3/5AFqDrnhMrV+Pitquv99glwnp4aHt44BF9amO+lyrMJWFM17lkx5UQD7FbZFXuqOaB8t+L1pirYMEUzeLgfxWkf8QmYm6MOvk3t1Xd98mdr9hbLR5PT1v4yiFNyyoR4vMwnLW5cX3mkQnH9n36s+RhgIYrs1xtX5PDOkTtWOPyNiw00yk2LALmCnb1Irmdls392Usi6/H/7ZAoqtyHR8+VZL6QxlEhiFKFOS3hC9j0QFreLf4pW+RBZdMGl0UTb17xpjIvBLABMjF4lge4/n3noBq0EC0A+KFjaesBtX+DkNXMu/+1J1r64QmkK33TbpRdjpt52M3GLpfnLElrugOI+XRCMcxEJwvTcyZXgwd9v1ultksZLuznJpYYYx2lBqlnwmWTot/l767h4oLlpb02u9ThvFmzDdre84RW7Zacu4o6zgNDHEbMP+L4aUE/v8b+LtZoBR5P2hhboIhQL1pnR5uSseXezbxcr912yavuTRJ0nbR5dFNZonmfjVMXttn2V3sJQxPqDYCTut+j+g+uQaN7++IpATemNTUoGtxw4J5foT0lHe9JO/of4wZPvdjOQviBJ4+zvyerH/x5sWW5XMffX/40rhMvvb0wrpeqg2qYJcTnHAzGcOJV1nmee9dswrWr2NzSGiJ236e7rX184C0weJ1veZP2yfBYpuH8HWqQUAHW539NecYceNuv+BpJ27v6+MMW0xD1nOCyWYpCo0QUT7QbspIP8N3FYPn64nz18GbLBJuw3mgY9/TWQotxYq6ydSDz3tgQ2n1X/fpJVjoUHltDo4XwSfIyDx6LqKMFPhw4d4IH/v9h+zedcWjgD/a6ftil2Q+45YVR7f2j/BsGNcqdL4Bztfwt/thQP5IEM9z2kfbScBQcZREJtoP/R9k0qedIVffbb9yZySt24fV1UBbW6Hwt4ELNsePVjoX8sHzlswn8ynxqwe2EsJR10TUAfFmxbv0jXg5ZVT7jb2J1Am+XePi52dPbAwvA4IemU84LJeYAuxSBGoxieak5nSouB8Oh3rNyLuuk6CjS3jy6kfCZZ/Pg1Q4UKBp1T5eT/BCXH/507wXUroOHhveGqhRj/JL68OxW0pth9hy8Do4zpbyxzY+BukfjvpSt6soVcggoNF8WGlubO24VHayo3G7rz7/KXX0a7LpsVz6Cl1vPUjTVrGdk6rJr/jX6PjgRkHepf6ld2PEKNfApLgiJZOLXkeKnZQRH0vn7fvT521eOkUSXEiN4pNWcujwQcCDz9N3/2T6gHEAjXb49ylm6Kbd2FRpCjqFSb6jVn3XHk0XJhDOPXNKuuuHa9cWBE69LQBy7cjpxRT72BZv/lzekxq7HRPCf8T7oDtGWzteKSCAG0xdwAWiNsSdqy1R4AAAAAAA==',
+  // 96x96, 2130 bytes
+  '/images/diamond.png': 'data:image/webp;base64,UklGRkoIAABXRUJQVlA4WAoAAAAQAAAAXwAAXwAAQUxQSE4DAAABoIRtexnher8kx7Zt2zZWtrWyrZ1t27Zt27bt0yTvu5h2pn/a7bmuiJgA/L+iOe+d9ZP5EDwafQjeWX+YC8FQO8lcq644x8So98FbD7jgMTjVMtsfe/Or3ycpfvv63afvtvrMDgBc8NYlCwZg3EV2vfCFn1Wfs+r/fvu6fVeaFACCdcYAzL3z1R9pkDHGRFLMKcaYNfjtvQctPQ5gHXGY4ehn/pOkGFMm1UgNMseYJen9s2eC64R5/7ykFDMliWqTOUVKzwZvXQg4WP8kiqSoWjawYZD5Xx2O0AFnc/+dskRSIiWOQknUINN/C8OX5/GIosQaSVSrHFDS895baR67KkpSHUVKbKAoUaLqow5GKMzZDL/kTEkiKapGbGpkHdO/88GVFXCLkuopkaSGaTHpcfNWksdmihqRFNmeovZEKMi5Kb7NuYENkjQGcvpjNnPlBFymqFHGeNI98MV4rK3INtgSaxS1LXwh5if4iElDkA0SmzhMY87fT+VcGR4nK6qWAyo16gr4IjyWzol1hUetDV+A2UTvMamTOX82hVkBbsJnNALL0efTlgCHab5QHqpdDkE25PzXInAo0WPpfxPHVJuM2gQeZQZso8jiKh2GgFIDjlEllhV1GQKKtYDbFcVyqKinxvJWDpyb6G0lFZz0xbRwKNljnl9zHontMf2zFDzKDlhfkaO0z6jNEFB6wP6qSql0OALKD7hYlSSyjmJblS5HsA6YH+tJRRUY9fQ43tBFh2k/VxbrOMA2kj6bFg7d9Fjq30TVsmZI1lDK+a/F4dHVgG0VWaeWGbUhAro7Fk5QVdN6pYMQ0GELuEuxhgMcqdL5COi0s0nfU5LEmiFZE/WA89YteMz/e85qOenNSc2h6wEbKLKdrB/mhEf3Aw5VJYkj5fTfivDoQQu4WlGjM2orBPSiuXFfVBqFrHQYxkJPOsz6A/MIqnQBAnrTY/Uc83BR95q3/kDAbqpEsSHq9YnNoU/HwtmKak76dlY49Kp5/6iiWJPzX0vDo2edTfO5kgYZtQECetdj6f9SlsRKu2Ms9HDAdqooVToGY6GXA05WpUqXIlg/WbB79Y/u9t7Q086m+EDPTGAOve2x1GNTwqHHDYCh1w2Gnjf87zpWUDgg1gQAABAZAJ0BKmAAYAA+MRiIQyIhoRVarYAgAwSxAEsr1RHLugcptwD3a5HU1vV+0AfofuAP106kXoAfsT1gHoAfrN6n/+P/YP4CP2m/cn4Av1q/+jS+nAoPSPL/EeqvoB+nvYC/lH9F/2/YA/YD2Gv0rPXqQY/gZKPyiytgYkKRvty4+L1z7s+2hGjSNkKk3B0fMGaPOCVTkOvw9ns/5BcI3TpzbzDmDxA+JiEPQOHoPQr3eMBMHWqXXnq+wumFTrFjXY0ZC3f3Y8b+ek3EI/o6u7uAAP7/DWTN//6g5F8Qf+dHz8QCNwwnwGv2hgWvTojmZ//9fGPPs6JwP3KRHQs5LK2c+iDTQAYFU2Ran/5Esc8y/LjjpGMn/8LtT1GZN8JiUl/4P+j/jYu0Cv5T92CsHTiWy5/GBTovnxF5NlEPBY4NEF35t4nsqHTaDn0Wgod1QGQZ3nX2Sgmn7JenZ6pnZvU7+fvD+mWYdmOZJQ9/zwiI6pqkPDA5/hdF/J5lP+q14wDzamk/gFTV4lhWI1c3SMVYO3Xer+jW8tzQDDgj+sIgZfz6ZZvbeaI9iNpm4tco4KCKvjpWdcvaCX3a2d/+Z7dN693H2dG+/MY3cWkAhaCI86y58PcqO2UXsVSWapfJYfbd7+Op99xMLQbdIfpqWeBlPT2uIA8gW+wC89M9BVGSpIaBveuFBg//+w3L9Nq5dzd2a0uf+6bf7WdigbYfL8Efx+d41b823q88Vn05ifwUqRGoGxOOAyNCmPOLJgRNUUhyW9RszpsseL7VPjeJfP9DTqwCxjcrsyDo4zTn+rlSi0vYmeXxdnPSyy3QLDzdli3WfTkpCJrTv9GyBs5HuhsuGBH+1d7+HwzxY9+zZwZVohZI/nhX5l2tCs2Ncye2x+UB6xlRMNa59RfX+6nqLfmLHDr3rm72halBVunvVIfaH1tiIMHHHGQCM2QVkFedVEuvxroZ59oBHg6hLiTcjIgjaHzj/gf/rFc7jQlJmODnxaPC52He1vqT1lBZkX90ltWNRQiMvQrVgIUPqdiz9Tm/xTtuNqawiyxHQ6e/wOUBoBrE+V/gAeXw81QUxobjgNlvC/XAO0/KOQU3wdKJKKz/89/6Pnc9bQP5QFoXfyGzNeeS2x8RoCyMG+sStd9eyzuKyD1OzgvJ7fPGy6ExdazHF07cHpcx0A99hhPJiw6Ft+tldGPDsJ+2ikeERpyM+ZyrDnyULgiPBqmQaDyyCZBnKM7RvJMLDVJAWnX9LENL4rVKibO0W7+wbfNMVC+wBYbMypzPVmZOoI8vX5gL+ecn/34yt88jzVF10CSfJjOOts2ZV70vCFLS/L6wMaLhq/WvaJD/pAkmA6CbfK4dwVHzEO8n53wi78Ea9Bj9RzDqUKhPjp2K3Xd9iU2C7OzGUzABrp3fIxmtLgEXt5AnTUw22RwDT0FU781toPly4cznDmQOos/pobAEDkRVpjic0JcCUvJU0yZ8u1H+u2bTehFTdhxTdOWxI1E2sBa/dXdinVGDnmm0DXzyCOKK9MYx29VZCEwcxY4kpHj8P8nnFhawCAK3MvDHmOll/+sJDGLV/+3tSItqbDRPkcgjawkWYhYnnZjw6ssfaF7e+7QKwnF2adQedwL4IpE3Qu0UL/1f0AAAAAAA',
+  // 96x96, 2130 bytes
+  '/images/games/green-diamond.png': 'data:image/webp;base64,UklGRkoIAABXRUJQVlA4WAoAAAAQAAAAXwAAXwAAQUxQSE4DAAABoIRtexnher8kx7Zt2zZWtrWyrZ1t27Zt27bt0yTvu5h2pn/a7bmuiJgA/L+iOe+d9ZP5EDwafQjeWX+YC8FQO8lcq644x8So98FbD7jgMTjVMtsfe/Or3ycpfvv63afvtvrMDgBc8NYlCwZg3EV2vfCFn1Wfs+r/fvu6fVeaFACCdcYAzL3z1R9pkDHGRFLMKcaYNfjtvQctPQ5gHXGY4ehn/pOkGFMm1UgNMseYJen9s2eC64R5/7ykFDMliWqTOUVKzwZvXQg4WP8kiqSoWjawYZD5Xx2O0AFnc/+dskRSIiWOQknUINN/C8OX5/GIosQaSVSrHFDS895baR67KkpSHUVKbKAoUaLqow5GKMzZDL/kTEkiKapGbGpkHdO/88GVFXCLkuopkaSGaTHpcfNWksdmihqRFNmeovZEKMi5Kb7NuYENkjQGcvpjNnPlBFymqFHGeNI98MV4rK3INtgSaxS1LXwh5if4iElDkA0SmzhMY87fT+VcGR4nK6qWAyo16gr4IjyWzol1hUetDV+A2UTvMamTOX82hVkBbsJnNALL0efTlgCHab5QHqpdDkE25PzXInAo0WPpfxPHVJuM2gQeZQZso8jiKh2GgFIDjlEllhV1GQKKtYDbFcVyqKinxvJWDpyb6G0lFZz0xbRwKNljnl9zHontMf2zFDzKDlhfkaO0z6jNEFB6wP6qSql0OALKD7hYlSSyjmJblS5HsA6YH+tJRRUY9fQ43tBFh2k/VxbrOMA2kj6bFg7d9Fjq30TVsmZI1lDK+a/F4dHVgG0VWaeWGbUhAro7Fk5QVdN6pYMQ0GELuEuxhgMcqdL5COi0s0nfU5LEmiFZE/WA89YteMz/e85qOenNSc2h6wEbKLKdrB/mhEf3Aw5VJYkj5fTfivDoQQu4WlGjM2orBPSiuXFfVBqFrHQYxkJPOsz6A/MIqnQBAnrTY/Uc83BR95q3/kDAbqpEsSHq9YnNoU/HwtmKak76dlY49Kp5/6iiWJPzX0vDo2edTfO5kgYZtQECetdj6f9SlsRKu2Ms9HDAdqooVToGY6GXA05WpUqXIlg/WbB79Y/u9t7Q086m+EDPTGAOve2x1GNTwqHHDYCh1w2Gnjf87zpWUDgg1gQAABAZAJ0BKmAAYAA+MRiIQyIhoRVarYAgAwSxAEsr1RHLugcptwD3a5HU1vV+0AfofuAP106kXoAfsT1gHoAfrN6n/+P/YP4CP2m/cn4Av1q/+jS+nAoPSPL/EeqvoB+nvYC/lH9F/2/YA/YD2Gv0rPXqQY/gZKPyiytgYkKRvty4+L1z7s+2hGjSNkKk3B0fMGaPOCVTkOvw9ns/5BcI3TpzbzDmDxA+JiEPQOHoPQr3eMBMHWqXXnq+wumFTrFjXY0ZC3f3Y8b+ek3EI/o6u7uAAP7/DWTN//6g5F8Qf+dHz8QCNwwnwGv2hgWvTojmZ//9fGPPs6JwP3KRHQs5LK2c+iDTQAYFU2Ran/5Esc8y/LjjpGMn/8LtT1GZN8JiUl/4P+j/jYu0Cv5T92CsHTiWy5/GBTovnxF5NlEPBY4NEF35t4nsqHTaDn0Wgod1QGQZ3nX2Sgmn7JenZ6pnZvU7+fvD+mWYdmOZJQ9/zwiI6pqkPDA5/hdF/J5lP+q14wDzamk/gFTV4lhWI1c3SMVYO3Xer+jW8tzQDDgj+sIgZfz6ZZvbeaI9iNpm4tco4KCKvjpWdcvaCX3a2d/+Z7dN693H2dG+/MY3cWkAhaCI86y58PcqO2UXsVSWapfJYfbd7+Op99xMLQbdIfpqWeBlPT2uIA8gW+wC89M9BVGSpIaBveuFBg//+w3L9Nq5dzd2a0uf+6bf7WdigbYfL8Efx+d41b823q88Vn05ifwUqRGoGxOOAyNCmPOLJgRNUUhyW9RszpsseL7VPjeJfP9DTqwCxjcrsyDo4zTn+rlSi0vYmeXxdnPSyy3QLDzdli3WfTkpCJrTv9GyBs5HuhsuGBH+1d7+HwzxY9+zZwZVohZI/nhX5l2tCs2Ncye2x+UB6xlRMNa59RfX+6nqLfmLHDr3rm72halBVunvVIfaH1tiIMHHHGQCM2QVkFedVEuvxroZ59oBHg6hLiTcjIgjaHzj/gf/rFc7jQlJmODnxaPC52He1vqT1lBZkX90ltWNRQiMvQrVgIUPqdiz9Tm/xTtuNqawiyxHQ6e/wOUBoBrE+V/gAeXw81QUxobjgNlvC/XAO0/KOQU3wdKJKKz/89/6Pnc9bQP5QFoXfyGzNeeS2x8RoCyMG+sStd9eyzuKyD1OzgvJ7fPGy6ExdazHF07cHpcx0A99hhPJiw6Ft+tldGPDsJ+2ikeERpyM+ZyrDnyULgiPBqmQaDyyCZBnKM7RvJMLDVJAWnX9LENL4rVKibO0W7+wbfNMVC+wBYbMypzPVmZOoI8vX5gL+ecn/34yt88jzVF10CSfJjOOts2ZV70vCFLS/L6wMaLhq/WvaJD/pAkmA6CbfK4dwVHzEO8n53wi78Ea9Bj9RzDqUKhPjp2K3Xd9iU2C7OzGUzABrp3fIxmtLgEXt5AnTUw22RwDT0FU781toPly4cznDmQOos/pobAEDkRVpjic0JcCUvJU0yZ8u1H+u2bTehFTdhxTdOWxI1E2sBa/dXdinVGDnmm0DXzyCOKK9MYx29VZCEwcxY4kpHj8P8nnFhawCAK3MvDHmOll/+sJDGLV/+3tSItqbDRPkcgjawkWYhYnnZjw6ssfaF7e+7QKwnF2adQedwL4IpE3Qu0UL/1f0AAAAAAA',
+};
+
+// The inlined copy of a sprite when there is one, otherwise its URL
+export function inlineSprite(src: string): string {
+  return INLINE_SPRITES[src] ?? src;
+}
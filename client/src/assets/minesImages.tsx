@@ -1,9 +1,10 @@
 import React from 'react';
+import { inlineSprite } from './inlineSprites';
 
-// Use PNG images directly with relative URLs
+// Inlined by inline_sprites.py, so the first frame needs no image requests
 export const DiamondImage = () => (
   <img 
-    src="/images/games/diamond.png"
+    src={inlineSprite('/images/diamond.png')}
     alt="Diamond"
     width="48"
     height="48"
@@ -12,7 +13,7 @@ export const DiamondImage = () => (
 
 export const BombImage = () => (
   <img 
-    src="/images/games/bomb.png"
+    src={inlineSprite('/images/bomb.png')}
     alt="Bomb"
     width="48"
     height="48"
@@ -21,9 +22,10 @@ export const BombImage = () => (
 
 export const DarkerDiamondImage = () => (
   <img 
-    src="/images/games/darker-diamond.png"
+    src={inlineSprite('/images/diamond.png')}
     alt="Darker Diamond"
     width="48"
     height="48"
+    style={{ opacity: 0.8, filter: 'brightness(0.9)' }}
   />
-);
\ No newline at end of file
+);
@@ -1,9 +1,10 @@
 import React from 'react';
+import { inlineSprite } from './inlineSprites';
 
-// Use SVG directly for most reliable rendering with updated size to 40px to match larger tiles
+// Sprites are inlined by inline_sprites.py, so the first frame of the board needs no image requests
 export const DiamondImage = () => (
   <img 
-    src="https://res.cloudinary.com/dq8b1e8qy/image/upload/v1745059444/ChatGPT_Image_Apr_17_2025_09_51_53_PM_jjposq.svg"
+    src={inlineSprite('/images/diamond.png')}
     alt="Diamond"
     width="40"
     height="40"
@@ -13,7 +14,7 @@ export const DiamondImage = () => (
 
 export const BombImage = () => (
   <img 
-    src="https://res.cloudinary.com/dq8b1e8qy/image/upload/v1745059444/ChatGPT_Image_Apr_17_2025_09_51_50_PM_gfvhjp.svg"
+    src={inlineSprite('/images/bomb.png')}
     alt="Bomb"
     width="40"
     height="40"
@@ -23,7 +24,7 @@ export const BombImage = () => (
 
 export const DarkerDiamondImage = () => (
   <img 
-    src="https://res.cloudinary.com/dq8b1e8qy/image/upload/v1745059444/ChatGPT_Image_Apr_17_2025_09_51_53_PM_jjposq.svg"
+    src={inlineSprite('/images/diamond.png')}
     alt="Darker Diamond"
     width="40"
     height="40"
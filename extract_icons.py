@@ -1,324 +1,854 @@
-from PIL import Image
+# Slices the slot sprite sheets listed in icon_sheets.json into individual icons.
+# Each sheet entry gives the source image, grid, padding, keying steps and the
+# cell -> "theme/file.png" mapping. Re-running only rebuilds icons whose source
+# sheet or manifest entry changed (see .icon_build_cache.json); use --force to
+# rebuild everything. Stale icons are built across a process pool (--jobs).
+# Sheets with "crop": "tight" are trimmed to each symbol's own extent. The
+# manifest's "variants" block adds WebP/AVIF copies at 1x/2x/3x of a display
+# width next to each PNG. icon_manifest.json in the output directory lists, per
+# icon, where it sat in its grid cell and every file the frontend can choose from.
+# With an "atlas" block every theme's icons are also packed into one image,
+# atlases/<theme>.png, with a TexturePacker-style frame map in atlases/<theme>.json.
+# With a "dedupe" block, icons that look the same (perceptual hash) are stored
+# once; icon_aliases.json maps every dropped name to the file that was kept.
+# Each worker holds one decoded sheet at a time; --memory-budget caps how many
+# workers run at once, and a sheet's "max_cell_size" decodes it at reduced
+# resolution (JPEG draft mode where possible) when its icons are wanted smaller.
+
+from PIL import Image, features
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import argparse
+import hashlib
+import math
+import resource
+import json
+import numpy as np
 import os
+import sys
+
+# Pixels darker than this in every channel are keyed out on black-background sheets
+COLOR_KEY_THRESHOLD = 20
+
+MANIFEST_PATH = "icon_sheets.json"
+CACHE_PATH = ".icon_build_cache.json"
+
+# Alpha at or above this joins a pixel to the symbol when trimming ("crop": "tight")
+TRIM_ALPHA_THRESHOLD = 8
+ICON_MANIFEST_FILE = "icon_manifest.json"
+
+# Variant formats: Pillow format name, MIME type and encoder settings
+VARIANT_FORMATS = {
+    "avif": ("AVIF", "image/avif", {"quality": 60, "speed": 8}),
+    "webp": ("WEBP", "image/webp", {"quality": 85, "method": 4}),
+}
+
+ALIASES_FILE = "icon_aliases.json"
+
+# Perceptual hash: DCT of a HASH_SIZE x HASH_SIZE luminance thumbnail, low 8x8 block
+HASH_SIZE = 32
+HASH_MAX_DISTANCE = 5  # differing bits still counted as the same picture
+HASH_MAX_COLOR_DELTA = 12  # the hash ignores hue, so mean RGB must also match this closely
+HASH_MAX_SIZE_DELTA = 0.1  # and the sizes within 10%
+
+ATLAS_DIR = "atlases"
+ATLAS_PADDING = 2  # transparent pixels between frames, so texture filtering doesn't bleed
+ATLAS_WIDTH_FACTORS = (0.9, 1.0, 1.1, 1.2, 1.3, 1.45, 1.6)  # strip widths tried, times sqrt(area)
+
+# Below this many stale icons a process pool costs more than it saves
+MIN_PARALLEL_ICONS = 8
+
+# Resident memory of a worker before it decodes anything (interpreter, NumPy, Pillow)
+WORKER_BASE_BYTES = 80 * 1024 * 1024
+
+# Bump when the cell processing changes, so every cached icon is rebuilt once
+PIPELINE_VERSION = 4
+
+def apply_edge_mask(pixels):
+    """
+    Make pixels near the edges of an icon transparent unless they are prominent.
+
+    `pixels` is an (height, width, 4) uint8 RGBA array and is modified in place.
+    A pixel within min(width, height) // 10 of an edge is cleared when it is dark
+    (mean RGB below 100) or semi-transparent (alpha below 200), which removes bits
+    of neighbouring icons that bleed into the crop.
+    """
+    height, width = pixels.shape[:2]
+    edge = min(width, height) // 10
+    if edge == 0:
+        return pixels
+    # The four border bands are views into pixels, so the writes land in place
+    for band in (pixels[:edge], pixels[height - edge:], pixels[:, :edge], pixels[:, width - edge:]):
+        rgb_sum = band[..., 0].astype(np.uint16) + band[..., 1] + band[..., 2]
+        not_prominent = (rgb_sum < 300) | (band[..., 3] < 200)
+        band[..., 3][not_prominent] = 0
+    return pixels
+
+def apply_color_key(pixels, threshold=COLOR_KEY_THRESHOLD):
+    """Make near-black pixels fully transparent (in place)."""
+    dark = (pixels[..., 0] < threshold) & (pixels[..., 1] < threshold) & (pixels[..., 2] < threshold)
+    pixels[dark] = 0
+    return pixels
 
-def extract_icons():
-    # Create output directories
-    os.makedirs("client/public/images/games/slots/classic", exist_ok=True)
-    os.makedirs("client/public/images/games/slots/space", exist_ok=True)
-    os.makedirs("client/public/images/games/slots/fantasy", exist_ok=True)
-    os.makedirs("client/public/images/games/slots/sports", exist_ok=True)
-    os.makedirs("client/public/images/games/slots/adventure", exist_ok=True)
-    os.makedirs("client/public/images/games/slots/generic", exist_ok=True)
-    os.makedirs("client/public/images/games/slots/aztec", exist_ok=True)
-    os.makedirs("client/public/images/games/slots/celestial", exist_ok=True)
+def clear_transparent(pixels):
+    """
+    Same result as Image.alpha_composite onto a (255, 255, 255, 0) background:
+    opaque and partly transparent pixels are kept, fully transparent ones become
+    (255, 255, 255, 0). Done in place.
+    """
+    pixels[pixels[..., 3] == 0] = (255, 255, 255, 0)
+    return pixels
+
+def save_icon(pixels, output_path, verbose=True):
+    # optimize is lossless, it only spends more time on zlib
+    Image.fromarray(pixels, "RGBA").save(output_path, format="PNG", optimize=True)
+    if verbose:
+        print(f"Saved {output_path}")
+
+def variant_sizes(anchor, variants):
+    """
+    (density, width, height) for every variant of an icon.
+
+    A density's width is display_width * density for the whole cell, so trimmed
+    icons keep their size relative to the slot. Sizes are never upscaled past the
+    source; densities that would only repeat the full-size icon are dropped.
+    """
+    cell_width = anchor["cell"][0]
+    width, height = anchor["size"]
+    sizes = []
+    for density in variants["densities"]:
+        scale = min(variants["display_width"] * density / cell_width, 1.0)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        if sizes and sizes[-1][1:] == size:
+            continue
+        sizes.append((density, *size))
+    return sizes
+
+def save_variants(pixels, output_path, anchor, variants):
+    """Encode the resized WebP/AVIF copies next to output_path; returns their manifest entries."""
+    if not variants:
+        return []
+    icon = Image.fromarray(pixels, "RGBA")
+    stem = os.path.splitext(output_path)[0]
+    entries = []
+    for density, width, height in variant_sizes(anchor, variants):
+        resized = icon if (width, height) == icon.size else icon.resize((width, height), Image.LANCZOS)
+        for name in variants["formats"]:
+            pil_format, mime, options = VARIANT_FORMATS[name]
+            path = f"{stem}@{density}x.{name}"
+            resized.save(path, format=pil_format, **options)
+            entries.append({"file": os.path.basename(path), "type": mime, "density": density,
+                            "width": width, "height": height, "bytes": os.path.getsize(path)})
+    return entries
+
+@lru_cache(maxsize=1)
+def dct_matrix(size=HASH_SIZE):
+    k = np.arange(size)
+    return np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * size))
+
+def perceptual_hash(pixels):
+    """
+    A 64-bit pHash of an RGBA icon plus its mean colour.
+
+    Luminance is premultiplied by alpha, so the transparent background reads as
+    black whatever RGB it carries. Bit i is set when DCT coefficient i of the
+    low-frequency 8x8 block is above the block's median.
+    """
+    thumb = Image.fromarray(pixels, "RGBA").resize((HASH_SIZE, HASH_SIZE), Image.LANCZOS)
+    values = np.asarray(thumb, dtype=np.float64)
+    alpha = values[..., 3] / 255
+    luminance = (values[..., :3] @ (0.299, 0.587, 0.114)) * alpha
+    dct = dct_matrix()
+    block = (dct @ luminance @ dct.T)[:8, :8].ravel()
+    bits = block > np.median(block[1:])
     
-    # Image 1 - Main slot icons
-    img1_path = "attached_assets/ChatGPT Image May 8, 2025, 07_59_38 PM.png"
-    img1 = Image.open(img1_path)
+    coverage = alpha.sum()
+    color = (values[..., :3] * alpha[..., None]).sum(axis=(0, 1)) / coverage if coverage else np.zeros(3)
+    return {"phash": f"{int(np.packbits(bits).view('>u8')[0]):016x}", "color": [round(c) for c in color]}
+
+def looks_same(a, b, max_distance=HASH_MAX_DISTANCE):
+    """Whether two icons' hashes, mean colours and sizes say they are one picture."""
+    distance = bin(int(a["phash"], 16) ^ int(b["phash"], 16)).count("1")
+    if distance > max_distance:
+        return False
+    if max(abs(x - y) for x, y in zip(a["color"], b["color"])) > HASH_MAX_COLOR_DELTA:
+        return False
+    return all(abs(x - y) <= HASH_MAX_SIZE_DELTA * max(x, y) for x, y in zip(a["size"], b["size"]))
+
+# Keying steps a sheet can list in the manifest, applied in order
+KEYING_STEPS = {
+    "color_key": apply_color_key,
+    "edge": apply_edge_mask,
+}
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """
+    Read the sheet manifest and resolve its paths relative to the manifest file.
+
+    Each sheet lists its source image, grid, padding (fraction of the cell width
+    trimmed from every side), keying steps and the cells to export. With
+    "crop": "tight" the padded box only marks where the symbol is; the icon is
+    cut from the whole cell and trimmed to the symbol's bounding box. When several
+    cells map to the same output file, the last one listed wins.
+    """
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    manifest["output_dir"] = os.path.join(base_dir, manifest.get("output_dir", "."))
+    manifest["variants"] = load_variants(manifest.get("variants"))
+    for sheet in manifest["sheets"]:
+        sheet["path"] = os.path.join(base_dir, sheet["path"])
+        if sheet.get("crop", "padding") not in ("padding", "tight"):
+            raise ValueError(f"Unknown crop mode {sheet['crop']!r} in sheet {sheet['name']!r}")
+        for step in sheet.get("keying", []):
+            if step not in KEYING_STEPS:
+                raise ValueError(f"Unknown keying step {step!r} in sheet {sheet['name']!r}")
+    return manifest
+
+def load_variants(variants):
+    """Validate the "variants" block and drop formats this Pillow build cannot write."""
+    if not variants:
+        return None
+    formats = []
+    for name in variants.get("formats", []):
+        if name not in VARIANT_FORMATS:
+            raise ValueError(f"Unknown variant format {name!r}")
+        if features.check(name):
+            formats.append(name)
+        else:
+            print(f"Warning: this Pillow build cannot write {name.upper()}, skipping those variants")
+    return {
+        "display_width": variants["display_width"],
+        "densities": sorted(variants.get("densities", [1, 2, 3])),
+        "formats": formats,
+    }
+
+def cell_box(sheet_size, sheet, row, col, padding=None):
+    """Crop box for a grid cell, inset by the sheet's padding."""
+    width, height = sheet_size
+    icon_width = width // sheet["grid"]["cols"]
+    icon_height = height // sheet["grid"]["rows"]
+    # Add padding to ensure we don't get partial neighboring icons
+    if padding is None:
+        padding = sheet.get("padding", 0.25)
+    padding = int(icon_width * padding)
+    return (col * icon_width + padding,
+            row * icon_height + padding,
+            (col + 1) * icon_width - padding,
+            (row + 1) * icon_height - padding)
+
+def symbol_mask(pixels, inset, threshold=TRIM_ALPHA_THRESHOLD):
+    """
+    The symbol's pixels in a whole-cell RGBA array.
+
+    Grows the visible pixels inside the padded centre of the cell (`inset` pixels
+    from each side) through everything 4-connected to them. Bits of neighbouring
+    symbols that bleed in from the cell border are not connected, so they drop out.
+    """
+    visible = pixels[..., 3] >= threshold
+    height, width = visible.shape
+    region = np.zeros_like(visible)
+    region[inset:height - inset, inset:width - inset] = visible[inset:height - inset, inset:width - inset]
+    while True:
+        grown = region.copy()
+        grown[1:] |= region[:-1]
+        grown[:-1] |= region[1:]
+        grown[:, 1:] |= region[:, :-1]
+        grown[:, :-1] |= region[:, 1:]
+        grown &= visible
+        if np.array_equal(grown, region):
+            return region
+        region = grown
+
+def trim_to_symbol(pixels, inset):
+    """
+    Clear everything but the symbol and crop to its bounding box.
+
+    Returns the trimmed array and the (x, y) offset of its top-left corner in the
+    cell, or (None, None) when the centre of the cell is empty.
+    """
+    mask = symbol_mask(pixels, inset)
+    rows, cols = np.flatnonzero(mask.any(axis=1)), np.flatnonzero(mask.any(axis=0))
+    if rows.size == 0:
+        return None, None
+    pixels[~mask, 3] = 0
+    top, bottom, left, right = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+    return pixels[top:bottom, left:right], (int(left), int(top))
+
+def crop_cell(img, sheet, row, col):
+    """
+    Cut one cell out of a decoded sheet as an RGBA array.
+
+    Returns the pixels and the crop box. Tight sheets are cut from the whole cell,
+    everything else from the padded box.
+    """
+    tight = sheet.get("crop", "padding") == "tight"
+    box = cell_box(img.size, sheet, row, col, padding=0 if tight else None)
     
-    # Image dimensions and grid info
-    width, height = img1.size
-    rows, cols = 5, 5
-    icon_width = width // cols
-    icon_height = height // rows
+    # Only the cell is ever converted to RGBA, never the whole sheet, and the
+    # intermediate images are dropped as soon as the array holds the pixels
+    icon = img.crop(box)
+    if icon.mode != 'RGBA':
+        icon = icon.convert('RGBA')
+    pixels = np.array(icon)
+    del icon
+    return pixels, box
+
+def key_cell(pixels, img_size, sheet, row, col, box):
+    """
+    Apply the sheet's keying (and trimming, for tight sheets) to a cropped cell.
+
+    Returns the final pixel array and its anchor: the cell size and the icon's
+    offset inside the cell.
+    """
+    for step in sheet.get("keying", []):
+        KEYING_STEPS[step](pixels)
     
-    # Dictionary to store icon info (row, col): (filename, theme_folder)
-    icons_info = {
-        # Row 1
-        (0, 0): ("bonus_purple.png", "generic"),
-        (0, 1): ("crystal_purple.png", "space"),
-        (0, 2): ("saxophone_gold.png", "classic"),
-        (0, 3): ("moai_head.png", "adventure"),
-        (0, 4): ("ring_turquoise.png", "adventure"),
-        
-        # Row 2
-        (1, 0): ("scatter_mask.png", "adventure"),
-        (1, 1): ("gem_green.png", "adventure"),
-        (1, 2): ("snake_red.png", "adventure"),
-        (1, 3): ("alien_green.png", "space"),
-        (1, 4): ("cherries_red.png", "classic"),
-        
-        # Row 3
-        (2, 0): ("wild_red.png", "generic"),
-        (2, 1): ("mushroom_red.png", "fantasy"),
-        (2, 2): ("horseshoe_gold.png", "classic"),
-        (2, 3): ("clover_four_leaf.png", "classic"),
-        (2, 4): ("leaf_green.png", "classic"),
-        
-        # Row 4
-        (3, 0): ("bonus_star.png", "generic"),
-        (3, 1): ("dragon_gold.png", "fantasy"),
-        (3, 2): ("gold_bar.png", "classic"),
-        (3, 3): ("coins_stack.png", "classic"),
-        (3, 4): ("dragon_red.png", "fantasy"),
-        
-        # Row 5
-        (4, 0): ("wild_football.png", "sports"),
-        (4, 1): ("boot_orange.png", "sports"),
-        (4, 2): ("jersey_green.png", "sports"),
-        (4, 3): ("trophy_gold.png", "sports"),
-        (4, 4): ("gloves_goalkeeper.png", "sports"),
+    anchor = {"cell": [box[2] - box[0], box[3] - box[1]], "offset": [0, 0]}
+    if sheet.get("crop", "padding") == "tight":
+        inset = cell_box(img_size, sheet, row, col)[0] - box[0]
+        trimmed, offset = trim_to_symbol(pixels, inset)
+        if trimmed is not None:
+            # Copy so the encoder gets a contiguous buffer, not a view of the whole cell
+            pixels = np.ascontiguousarray(trimmed)
+            anchor["offset"] = list(offset)
+    anchor["size"] = [pixels.shape[1], pixels.shape[0]]
+    return clear_transparent(pixels), anchor
+
+def process_cell(img, sheet, row, col):
+    """Crop and key one cell; returns the RGBA pixel array and its anchor."""
+    pixels, box = crop_cell(img, sheet, row, col)
+    return key_cell(pixels, img.size, sheet, row, col, box)
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class BuildCache:
+    """
+    Content-hash cache of previous builds.
+
+    Source sheets are re-hashed only when their size or mtime changes. An output is
+    up to date when its cell key (sheet content + manifest entry + pipeline version)
+    matches and the file on disk is the one that was written.
+    """
+
+    def __init__(self, path=CACHE_PATH, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self.sources = {}
+        self.outputs = {}
+        if enabled and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") == PIPELINE_VERSION:
+                self.sources = data.get("sources", {})
+                self.outputs = data.get("outputs", {})
+
+    @staticmethod
+    def _stat(path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def source_hash(self, path):
+        stat = self._stat(path)
+        entry = self.sources.get(path)
+        if entry and entry["stat"] == stat:
+            return entry["sha256"]
+        sha = file_digest(path)
+        self.sources[path] = {"stat": stat, "sha256": sha}
+        return sha
+
+    def _files_unchanged(self, entry):
+        for path, stat in entry["files"].items():
+            if not os.path.exists(path) or self._stat(path) != stat:
+                return False
+        return True
+
+    def is_fresh(self, output_path, key):
+        entry = self.outputs.get(output_path)
+        return (self.enabled and entry is not None and entry["key"] == key
+                and self._files_unchanged(entry))
+
+    def icon(self, output_path):
+        """The anchor and variants recorded for an output, or None."""
+        entry = self.outputs.get(output_path)
+        return entry and entry.get("icon")
+
+    def record(self, output_path, key, icon):
+        directory = os.path.dirname(output_path)
+        files = [output_path] + [os.path.join(directory, v["file"]) for v in icon["variants"]]
+        self.outputs[output_path] = {"key": key, "files": {path: self._stat(path) for path in files},
+                                     "icon": icon}
+
+    def key(self, output_path):
+        entry = self.outputs.get(output_path)
+        return entry and entry["key"]
+
+    def alias_of(self, output_path):
+        entry = self.outputs.get(output_path)
+        return entry and entry.get("alias")
+
+    def mark_alias(self, output_path, canonical):
+        """Drop an output's files, it is served by `canonical` from now on."""
+        entry = self.outputs[output_path]
+        for path in entry["files"]:
+            if os.path.exists(path):
+                os.remove(path)
+        entry["files"] = {}
+        entry["alias"] = canonical
+
+    def forget(self, output_path):
+        self.outputs.pop(output_path, None)
+
+    def record_files(self, output_path, key, files):
+        """Record a build product that is not an icon (an atlas and its frame map)."""
+        self.outputs[output_path] = {"key": key, "files": {path: self._stat(path) for path in files},
+                                     "icon": None}
+
+    def save(self):
+        # Saved even when disabled (--force): the rebuilt outputs are recorded, so the next
+        # normal run finds them fresh instead of rebuilding everything again
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": PIPELINE_VERSION, "sources": self.sources, "outputs": self.outputs}, f)
+        os.replace(tmp_path, self.path)
+
+
+def cell_key(source_sha, sheet, row, col, variants=None):
+    """Everything that determines an output icon's pixels and its variants."""
+    spec = {
+        "variants": variants,
+        "version": PIPELINE_VERSION,
+        "source": source_sha,
+        "grid": sheet["grid"],
+        "padding": sheet.get("padding", 0.25),
+        "crop": sheet.get("crop", "padding"),
+        "max_cell_size": sheet.get("max_cell_size"),
+        "keying": sheet.get("keying", []),
+        "cell": [row, col],
     }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+def plan_outputs(manifest):
+    """Map every output path to the (sheet, row, col) that produces it; later entries win."""
+    outputs = {}
+    for sheet in manifest["sheets"]:
+        for entry in sheet["cells"]:
+            row, col = entry["cell"]
+            outputs[os.path.join(manifest["output_dir"], entry["output"])] = (sheet, row, col)
+    return outputs
+
+def decoded_size(size, sheet):
+    """Size a sheet is decoded at: shrunk by a whole factor so its cells fit max_cell_size."""
+    limit = sheet.get("max_cell_size")
+    if not limit:
+        return size
+    cell = max(size[0] // sheet["grid"]["cols"], size[1] // sheet["grid"]["rows"])
+    factor = max(1, math.ceil(cell / limit))
+    return (size[0] // factor, size[1] // factor)
+
+def sheet_memory(sheet):
+    """Bytes one worker needs to hold the decoded sheet, read from the header only."""
+    with Image.open(sheet["path"]) as img:
+        width, height = decoded_size(img.size, sheet)
+        return width * height * len(img.getbands())
+
+@lru_cache(maxsize=1)
+def open_sheet(path, size=None):
+    """
+    Decode a sheet, keeping only the most recent one per process.
+
+    Tasks arrive grouped by sheet, so holding one decoded sheet is enough and
+    bounds a worker's memory to its largest sheet. A smaller `size` is decoded
+    straight at reduced scale for JPEGs (draft mode, the full-size image never
+    exists); other formats are reduced after decoding.
+    """
+    img = Image.open(path)
+    if size and size != img.size and img.format == "JPEG":
+        img.draft(img.mode, size)
+    img.load()
+    if size and size != img.size:
+        img = img.resize(size, Image.LANCZOS, reducing_gap=2.0)
+    return img
+
+def load_sheet(sheet):
+    if not sheet.get("max_cell_size"):
+        return open_sheet(sheet["path"])
+    with Image.open(sheet["path"]) as header:
+        size = decoded_size(header.size, sheet)
+    return open_sheet(sheet["path"], size)
+
+def build_icon(task):
+    """Crop, key and encode one icon. Runs in the parent or in a pool worker."""
+    sheet, row, col, output_path, variants = task
+    pixels, anchor = process_cell(load_sheet(sheet), sheet, row, col)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    save_icon(pixels, output_path, verbose=False)
+    return output_path, {**anchor, **perceptual_hash(pixels),
+                         "variants": save_variants(pixels, output_path, anchor, variants)}
+
+def build_icons(tasks, jobs=None, memory_budget=None):
+    """
+    Build every task, spreading them over a process pool when it is worth it.
+
+    Tasks are ordered by sheet and handed out in contiguous chunks, so each worker
+    decodes only the sheets its chunk touches. Results come back in task order,
+    which keeps the log and the build cache deterministic. With memory_budget
+    (bytes), only as many workers run as fit next to each other when every one
+    holds the largest sheet.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if memory_budget and tasks:
+        per_worker = WORKER_BASE_BYTES + max(sheet_memory(task[0]) for task in tasks)
+        fits = max(1, memory_budget // per_worker)
+        if fits < jobs:
+            print(f"Memory budget allows {fits} worker(s) of ~{per_worker / 1e6:.0f} MB each")
+            jobs = fits
+    if jobs == 1 or len(tasks) < MIN_PARALLEL_ICONS:
+        try:
+            return [build_icon(task) for task in tasks]
+        finally:
+            # Don't keep the last sheet alive in the parent for the rest of the run
+            open_sheet.cache_clear()
     
-    # Extract and save icons
-    for (row, col), (filename, theme) in icons_info.items():
-        # Add padding to ensure we don't get partial neighboring icons
-        padding = int(icon_width * 0.25)  # 25% padding for better isolation
-        left = col * icon_width + padding
-        upper = row * icon_height + padding
-        right = (col + 1) * icon_width - padding
-        lower = (row + 1) * icon_height - padding
-        
-        icon = img1.crop((left, upper, right, lower))
-        
-        # Create transparent background
-        if icon.mode != 'RGBA':
-            icon = icon.convert('RGBA')
-            
-        # Apply additional processing to remove any partial neighboring icons
-        # by adding an alpha threshold mask - make pixels near edges more likely to be transparent
-        data = icon.getdata()
-        new_data = []
-        width, height = icon.size
-        for y in range(height):
-            for x in range(width):
-                idx = y * width + x
-                r, g, b, a = data[idx]
-                
-                # Check if near edge and not very prominent (semi-transparent or grayish)
-                edge_threshold = min(width, height) // 10
-                is_near_edge = (x < edge_threshold or x >= width - edge_threshold or 
-                               y < edge_threshold or y >= height - edge_threshold)
-                
-                is_not_prominent = (r + g + b) / 3 < 100 or a < 200
-                
-                if is_near_edge and is_not_prominent:
-                    new_data.append((r, g, b, 0))  # Make transparent
-                else:
-                    new_data.append((r, g, b, a))
-        
-        # Create a white background image
-        background = Image.new('RGBA', icon.size, (255, 255, 255, 0))
-        
-        # Composite the icon onto the transparent background
-        final_icon = Image.alpha_composite(background, icon)
+    workers = min(jobs, len(tasks))
+    chunksize = max(1, -(-len(tasks) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(build_icon, tasks, chunksize=chunksize))
+
+def find_duplicates(output_paths, cache, max_distance=HASH_MAX_DISTANCE):
+    """
+    Map every icon that looks like an earlier one to that earlier icon.
+
+    The first icon of a look-alike group in manifest order is kept; the rest
+    become aliases of it.
+    """
+    kept, aliases = [], {}
+    for output_path in output_paths:
+        icon = cache.icon(output_path)
+        if not icon:
+            continue
+        for canonical, canonical_icon in kept:
+            if looks_same(icon, canonical_icon, max_distance):
+                aliases[output_path] = canonical
+                break
+        else:
+            kept.append((output_path, icon))
+    return aliases
+
+def write_aliases(output_dir, aliases):
+    def relative(path):
+        return os.path.relpath(path, output_dir).replace(os.sep, "/")
+    
+    with open(os.path.join(output_dir, ALIASES_FILE), "w") as f:
+        json.dump({relative(alias): relative(canonical) for alias, canonical in aliases.items()},
+                  f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def write_icon_manifest(output_dir, output_paths, cache):
+    """
+    Write the frontend's view of every icon, keyed by path under output_dir.
+
+    cell/offset/size say where the icon sat in its grid cell: untrimmed icons have
+    offset [0, 0] and size == cell, and a trimmed icon drawn in a cell-sized slot
+    goes at offset scaled by slot_size / cell. "variants" lists the WebP/AVIF
+    files (path under output_dir, MIME type, density, pixel size and bytes) so the
+    client can take the smallest one it supports that covers its display size,
+    and "fallback" is the full-size PNG. De-duplicated icons have "alias" set
+    and every file pointing at the icon that was kept.
+    """
+    icons = {}
+    for output_path in output_paths:
+        icon = cache.icon(output_path)
+        if not icon:
+            continue
+        stored = cache.alias_of(output_path) or output_path
+        stored_icon = cache.icon(stored)
+        relative = os.path.relpath(output_path, output_dir).replace(os.sep, "/")
+        stored_relative = os.path.relpath(stored, output_dir).replace(os.sep, "/")
+        directory = os.path.dirname(stored_relative)
+        icons[relative] = {
+            "cell": stored_icon["cell"],
+            "offset": stored_icon["offset"],
+            "size": stored_icon["size"],
+            "fallback": stored_relative,
+            "bytes": os.path.getsize(stored),
+            "variants": [{**v, "file": "/".join(filter(None, [directory, v["file"]]))}
+                         for v in stored_icon["variants"]],
+        }
+        if stored != output_path:
+            icons[relative]["alias"] = stored_relative
+    
+    path = os.path.join(output_dir, ICON_MANIFEST_FILE)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(icons, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def pack_skyline(sizes, width):
+    """
+    Bottom-left skyline packing of (width, height) boxes into a strip `width` wide.
+
+    Boxes are placed tallest first, each at the lowest spot the skyline allows
+    (leftmost on ties). Returns the (x, y) of every box, in input order, and the
+    height used.
+    """
+    skyline = [(0, 0, width)]  # segments of (x, y, width), left to right
+    positions = [None] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0], i))
+    for i in order:
+        box_width, box_height = sizes[i]
+        best = None
+        for start, (x, _, _) in enumerate(skyline):
+            if x + box_width > width:
+                break
+            # Resting height over every segment the box would cover
+            y, covered, end = 0, 0, start
+            while covered < box_width:
+                y = max(y, skyline[end][1])
+                covered += skyline[end][2] - (x - skyline[end][0] if end == start else 0)
+                end += 1
+            if best is None or (y + box_height, x) < (best[1] + box_height, best[0]):
+                best = (x, y)
+        if best is None:
+            raise ValueError(f"A {box_width}px wide box does not fit a {width}px atlas")
         
-        output_path = f"client/public/images/games/slots/{theme}/{filename}"
-        final_icon.save(output_path, format="PNG")
-        print(f"Saved {output_path}")
+        x, y = best
+        positions[i] = best
+        # Raise the skyline under the box, keeping what sticks out on either side
+        top = y + box_height
+        right = x + box_width
+        updated = []
+        for seg_x, seg_y, seg_width in skyline:
+            seg_right = seg_x + seg_width
+            if seg_right <= x or seg_x >= right:
+                updated.append((seg_x, seg_y, seg_width))
+                continue
+            if seg_x < x:
+                updated.append((seg_x, seg_y, x - seg_x))
+            if seg_right > right:
+                updated.append((right, seg_y, seg_right - right))
+        updated.append((x, top, box_width))
+        updated.sort()
+        # Merge neighbours at the same height
+        skyline = [updated[0]]
+        for seg in updated[1:]:
+            last = skyline[-1]
+            if last[1] == seg[1] and last[0] + last[2] == seg[0]:
+                skyline[-1] = (last[0], last[1], last[2] + seg[2])
+            else:
+                skyline.append(seg)
     
-    # Image 2 - Themed slot game icons
-    img2_path = "attached_assets/ChatGPT Image May 8, 2025, 07_59_52 PM.png"
-    img2 = Image.open(img2_path)
+    height = max((y + sizes[i][1] for i, (_, y) in enumerate(positions)), default=0)
+    return positions, height
+
+def build_atlas(theme, icons, output_dir, padding=ATLAS_PADDING, formats=(), aliases=None):
+    """
+    Pack one theme's icons into atlases/<theme>.png and write its frame map.
+
+    `icons` is a list of (frame name, PNG path, anchor). A handful of strip widths
+    around the square root of the padded area are tried and the smallest atlas
+    wins (the squarer one on ties). The frame map uses the TexturePacker JSON-hash layout
+    that Pixi and Phaser load directly; spriteSourceSize/sourceSize carry the
+    anchors, so trimmed icons still line up with their grid cell. `aliases` adds
+    extra frame names that reuse a packed frame. Returns the files written.
+    """
+    sizes = [(anchor["size"][0] + padding, anchor["size"][1] + padding) for _, _, anchor in icons]
+    widest = max(w for w, _ in sizes)
+    side = math.sqrt(sum(w * h for w, h in sizes))
+    best = None
+    for factor in ATLAS_WIDTH_FACTORS:
+        width = max(widest, math.ceil(side * factor))
+        positions, height = pack_skyline(sizes, width)
+        score = (width * height, abs(width - height))
+        if best is None or score < best[0]:
+            best = (score, width, height, positions)
+    _, width, height, positions = best
     
-    # Image dimensions and grid info (same as image 1)
-    width, height = img2.size
-    rows, cols = 5, 5
-    icon_width = width // cols
-    icon_height = height // rows
+    atlas = Image.new("RGBA", (width, height), (255, 255, 255, 0))
+    frames = {}
+    for (name, path, anchor), (x, y) in zip(icons, positions):
+        with Image.open(path) as icon:
+            atlas.paste(icon, (x, y))
+        icon_width, icon_height = anchor["size"]
+        cell_width, cell_height = anchor["cell"]
+        frames[name] = {
+            "frame": {"x": x, "y": y, "w": icon_width, "h": icon_height},
+            "rotated": False,
+            "trimmed": anchor["size"] != anchor["cell"],
+            "spriteSourceSize": {"x": anchor["offset"][0], "y": anchor["offset"][1],
+                                 "w": icon_width, "h": icon_height},
+            "sourceSize": {"w": cell_width, "h": cell_height},
+        }
+    for alias, name in (aliases or {}).items():
+        frames[alias] = frames[name]
     
-    # Dictionary to store icon info for image 2
-    icons_info_2 = {
-        # Row 1
-        (0, 0): ("cosmic_spins_logo.png", "space"),
-        (0, 1): ("planet_purple.png", "space"),
-        (0, 2): ("diamond_blue.png", "space"),
-        (0, 3): ("letter_k_green.png", "space"),
-        (0, 4): ("moon_gray.png", "space"),
-        
-        # Row 2
-        (1, 0): ("temple_quest_logo.png", "adventure"),
-        (1, 1): ("mask_gold.png", "adventure"),
-        (1, 2): ("letter_q_red.png", "adventure"),
-        (1, 3): ("letter_j_blue.png", "adventure"),
-        (1, 4): ("pyramid_gold.png", "adventure"),
-        
-        # Row 3
-        (2, 0): ("lucky_sevens_logo.png", "classic"),
-        (2, 1): ("seven_red_triple.png", "classic"),
-        (2, 2): ("seven_red_single.png", "classic"),
-        (2, 3): ("seven_red_single.png", "classic"),  # Duplicate, will be overwritten
-        (2, 4): ("cherry_red.png", "classic"),
-        
-        # Row 4
-        (3, 0): ("dragons_gold_logo.png", "fantasy"),
-        (3, 1): ("dragon_red_face.png", "fantasy"),
-        (3, 2): ("coin_dragon.png", "fantasy"),
-        (3, 3): ("bar_symbol.png", "classic"),
-        (3, 4): ("lemon_yellow.png", "classic"),
-        
-        # Row 5
-        (4, 0): ("football_frenzy_logo.png", "sports"),
-        (4, 1): ("football_ball.png", "sports"),
-        (4, 2): ("trophy_cup.png", "sports"),
-        (4, 3): ("letter_a_red.png", "sports"),
-        (4, 4): ("letter_k_blue_boot.png", "sports"),
+    atlas_dir = os.path.join(output_dir, ATLAS_DIR)
+    os.makedirs(atlas_dir, exist_ok=True)
+    image_path = os.path.join(atlas_dir, f"{theme}.png")
+    atlas.save(image_path, format="PNG", optimize=True)
+    written = [image_path]
+    images = {}
+    for name in formats:
+        pil_format, mime, options = VARIANT_FORMATS[name]
+        variant_path = os.path.join(atlas_dir, f"{theme}.{name}")
+        atlas.save(variant_path, format=pil_format, **options)
+        images[mime] = os.path.basename(variant_path)
+        written.append(variant_path)
+    
+    frame_map = {
+        "frames": frames,
+        "meta": {
+            "image": os.path.basename(image_path),
+            "images": images,
+            "format": "RGBA8888",
+            "size": {"w": width, "h": height},
+            "scale": "1",
+        },
     }
+    map_path = os.path.join(atlas_dir, f"{theme}.json")
+    with open(map_path, "w") as f:
+        json.dump(frame_map, f, indent=2, sort_keys=True)
+        f.write("\n")
+    written.append(map_path)
+    return written
+
+def build_atlases(manifest, output_paths, cache):
+    """Rebuild the atlas of every theme whose icons changed since the last build."""
+    config = manifest.get("atlas")
+    if not config:
+        return 0
+    padding = config.get("padding", ATLAS_PADDING)
+    formats = manifest["variants"]["formats"] if manifest["variants"] and config.get("variants", True) else []
     
-    # Extract and save icons from image 2
-    for (row, col), (filename, theme) in icons_info_2.items():
-        # Add padding to ensure we don't get partial neighboring icons
-        padding = int(icon_width * 0.25)  # 25% padding for better isolation
-        left = col * icon_width + padding
-        upper = row * icon_height + padding
-        right = (col + 1) * icon_width - padding
-        lower = (row + 1) * icon_height - padding
-        
-        icon = img2.crop((left, upper, right, lower))
-        
-        # Create transparent background
-        if icon.mode != 'RGBA':
-            icon = icon.convert('RGBA')
-            
-        # Apply additional processing to remove any partial neighboring icons
-        # by adding an alpha threshold mask - make pixels near edges more likely to be transparent
-        data = icon.getdata()
-        new_data = []
-        width, height = icon.size
-        for y in range(height):
-            for x in range(width):
-                idx = y * width + x
-                r, g, b, a = data[idx]
-                
-                # Check if near edge and not very prominent (semi-transparent or grayish)
-                edge_threshold = min(width, height) // 10
-                is_near_edge = (x < edge_threshold or x >= width - edge_threshold or 
-                               y < edge_threshold or y >= height - edge_threshold)
-                
-                is_not_prominent = (r + g + b) / 3 < 100 or a < 200
-                
-                if is_near_edge and is_not_prominent:
-                    new_data.append((r, g, b, 0))  # Make transparent
-                else:
-                    new_data.append((r, g, b, a))
-        
-        icon.putdata(new_data)
-        
-        # Create a white background image
-        background = Image.new('RGBA', icon.size, (255, 255, 255, 0))
-        
-        # Composite the icon onto the transparent background
-        final_icon = Image.alpha_composite(background, icon)
+    def theme_and_name(path):
+        relative = os.path.relpath(path, manifest["output_dir"])
+        return os.path.dirname(relative) or "default", os.path.splitext(os.path.basename(relative))[0]
+    
+    themes, theme_aliases = {}, {}
+    for output_path in output_paths:
+        icon = cache.icon(output_path)
+        if not icon:
+            continue
+        theme, name = theme_and_name(output_path)
+        canonical = cache.alias_of(output_path)
+        if canonical is None:
+            themes.setdefault(theme, []).append((name, output_path, icon))
+        elif theme_and_name(canonical)[0] == theme:
+            # Same theme: the alias name becomes a second name for the kept frame
+            theme_aliases.setdefault(theme, {})[name] = theme_and_name(canonical)[1]
+    
+    rebuilt = 0
+    for theme, icons in sorted(themes.items()):
+        icons.sort()
+        aliases = theme_aliases.get(theme, {})
+        key = hashlib.sha256(json.dumps({
+            "icons": [(name, cache.key(path)) for name, path, _ in icons],
+            "aliases": sorted(aliases.items()),
+            "padding": padding,
+            "formats": formats,
+        }).encode()).hexdigest()
+        atlas_path = os.path.join(manifest["output_dir"], ATLAS_DIR, f"{theme}.png")
+        if cache.is_fresh(atlas_path, key):
+            continue
+        written = build_atlas(theme, icons, manifest["output_dir"], padding, formats, aliases)
+        cache.record_files(atlas_path, key, written)
+        print(f"Packed {len(icons)} icons into {atlas_path}")
+        rebuilt += 1
+    return rebuilt
+
+def build_stale(manifest, planned, cache, jobs=None, only=None, memory_budget=None):
+    """Rebuild the planned outputs (or just `only`) that the cache can't vouch for."""
+    # Work out which outputs are stale, grouped by sheet so each sheet is decoded at most once
+    stale = {}
+    skipped = 0
+    for output_path, (sheet, row, col) in planned.items():
+        if not os.path.exists(sheet["path"]) or (only is not None and output_path not in only):
+            continue
+        key = cell_key(cache.source_hash(sheet["path"]), sheet, row, col, manifest["variants"])
+        if cache.is_fresh(output_path, key):
+            skipped += 1
+            continue
+        stale.setdefault(sheet["name"], []).append((output_path, row, col, key))
+    
+    tasks, keys = [], []
+    for sheet in manifest["sheets"]:
+        if not os.path.exists(sheet["path"]):
+            message = f"Could not find {sheet['path']}"
+            if not sheet.get("optional"):
+                raise FileNotFoundError(message)
+            if only is None:
+                print(f"Warning: {message}")
+            continue
         
-        output_path = f"client/public/images/games/slots/{theme}/{filename}"
-        final_icon.save(output_path, format="PNG")
+        for output_path, row, col, key in stale.get(sheet["name"], []):
+            tasks.append((sheet, row, col, output_path, manifest["variants"]))
+            keys.append(key)
+    
+    for (output_path, icon), key in zip(build_icons(tasks, jobs, memory_budget), keys):
         print(f"Saved {output_path}")
+        cache.record(output_path, key, icon)
+    return len(tasks), skipped
+
+def extract_icons(manifest_path=MANIFEST_PATH, cache_path=CACHE_PATH, force=False, output_dir=None, jobs=None,
+                  memory_budget=None):
+    manifest = load_manifest(manifest_path)
+    if output_dir:
+        manifest["output_dir"] = output_dir
+    cache = BuildCache(cache_path, enabled=not force)
     
-    # Image 3 - Aztec and Celestial themed icons
-    img3_path = "attached_assets/ChatGPT Image May 8, 2025, 08_08_57 PM.png"
+    planned = plan_outputs(manifest)
+    if not manifest.get("dedupe"):
+        # De-duplication was switched off: aliases need their own files again
+        for path in [path for path in planned if cache.alias_of(path)]:
+            cache.forget(path)
+    built, skipped = build_stale(manifest, planned, cache, jobs, memory_budget=memory_budget)
     
-    if os.path.exists(img3_path):
-        img3 = Image.open(img3_path)
-        
-        # Image dimensions and grid info (same as previous images)
-        width, height = img3.size
-        rows, cols = 5, 5
-        icon_width = width // cols
-        icon_height = height // rows
-        
-        # Dictionary to store icon info for image 3
-        icons_info_3 = {
-            # Row 1
-            (0, 0): ("moon_crater.png", "space"),
-            (0, 1): ("planet_orange.png", "space"),
-            (0, 2): ("crystals_colorful.png", "fantasy"),
-            (0, 3): ("sun_face.png", "celestial"),
-            (0, 4): ("crescent_moon.png", "celestial"),
-            
-            # Row 2
-            (1, 0): ("wild_planet.png", "space"),
-            (1, 1): ("meteor.png", "space"),
-            (1, 2): ("emerald.png", "fantasy"),
-            (1, 3): ("aztec_face.png", "aztec"),
-            (1, 4): ("roman_helmet.png", "adventure"),
-            
-            # Row 3
-            (2, 0): ("aztec_chief.png", "aztec"),
-            (2, 1): ("bonus_plate.png", "generic"),
-            (2, 2): ("letter_q_green.png", "generic"),
-            (2, 3): ("letter_q_gold.png", "generic"),
-            (2, 4): ("letter_k_blue.png", "generic"),
-            
-            # Row 4
-            (3, 0): ("diamond_blue.png", "fantasy"),
-            (3, 1): ("pyramid.png", "aztec"),
-            (3, 2): ("stone_face.png", "aztec"),
-            (3, 3): ("coins_stack_gold.png", "classic"),
-            (3, 4): ("number_10_gold.png", "generic"),
-            
-            # Row 5
-            (4, 0): ("coins_small.png", "classic"),
-            (4, 1): ("number_5_gold.png", "generic"),
-            (4, 2): ("coins_medium.png", "classic"),
-            (4, 3): ("lucky_seven.png", "classic"),
-            (4, 4): ("seven_red.png", "classic"),
-        }
-        
-        # Extract and save icons from image 3
-        for (row, col), (filename, theme) in icons_info_3.items():
-            # Add padding to ensure we don't get partial neighboring icons
-            padding = int(icon_width * 0.25)  # 25% padding for better isolation
-            left = col * icon_width + padding
-            upper = row * icon_height + padding
-            right = (col + 1) * icon_width - padding
-            lower = (row + 1) * icon_height - padding
-            
-            icon = img3.crop((left, upper, right, lower))
-            
-            # Create a transparent background by replacing black
-            if icon.mode != 'RGBA':
-                icon = icon.convert('RGBA')
-            
-            # First make black background transparent
-            data = icon.getdata()
-            new_data = []
-            for item in data:
-                # If pixel is very dark (close to black), make it transparent
-                if item[0] < 20 and item[1] < 20 and item[2] < 20:
-                    new_data.append((0, 0, 0, 0))
-                else:
-                    new_data.append(item)
-            
-            icon.putdata(new_data)
-            
-            # Apply edge transparency to remove any artifacts at the edges
-            data = icon.getdata()
-            new_data = []
-            width, height = icon.size
-            for y in range(height):
-                for x in range(width):
-                    idx = y * width + x
-                    r, g, b, a = data[idx]
-                    
-                    # Check if near edge and not very prominent
-                    edge_threshold = min(width, height) // 10
-                    is_near_edge = (x < edge_threshold or x >= width - edge_threshold or 
-                                   y < edge_threshold or y >= height - edge_threshold)
-                    
-                    is_not_prominent = (r + g + b) / 3 < 100 or a < 200
-                    
-                    if is_near_edge and is_not_prominent:
-                        new_data.append((r, g, b, 0))  # Make transparent
-                    else:
-                        new_data.append((r, g, b, a))
-            
-            icon.putdata(new_data)
-            
-            # Create a white background image
-            background = Image.new('RGBA', icon.size, (255, 255, 255, 0))
-            
-            # Composite the icon onto the transparent background
-            final_icon = Image.alpha_composite(background, icon)
-            
-            output_path = f"client/public/images/games/slots/{theme}/{filename}"
-            final_icon.save(output_path, format="PNG")
-            print(f"Saved {output_path}")
-        
-        print("Aztec and Celestial icons processed successfully!")
-    else:
-        print(f"Warning: Could not find {img3_path}")
+    aliases = {}
+    if manifest.get("dedupe"):
+        aliases = find_duplicates(planned, cache, manifest["dedupe"].get("max_distance", HASH_MAX_DISTANCE))
+        # Icons that stopped looking like their old twin need their own files again
+        revived = [path for path in planned if cache.alias_of(path) and path not in aliases]
+        for path in revived:
+            cache.forget(path)
+        built += build_stale(manifest, planned, cache, jobs, set(revived), memory_budget)[0]
+        skipped -= len(revived)
+        for alias, canonical in aliases.items():
+            if cache.alias_of(alias) != canonical:
+                cache.mark_alias(alias, canonical)
+                print(f"{alias} looks the same as {canonical}, stored once")
+        write_aliases(manifest["output_dir"], aliases)
+    elif os.path.exists(os.path.join(manifest["output_dir"], ALIASES_FILE)):
+        os.remove(os.path.join(manifest["output_dir"], ALIASES_FILE))
     
-    print("All icons extracted and saved successfully!")
+    write_icon_manifest(manifest["output_dir"], planned, cache)
+    build_atlases(manifest, planned, cache)
+    cache.save()
+    print(f"All icons extracted and saved successfully! ({built} rebuilt, {skipped} up to date, "
+          f"{len(aliases)} de-duplicated)")
 
 if __name__ == "__main__":
-    extract_icons()
\ No newline at end of file
+    # The shared profiling hooks live with the other tooling in scripts/
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+    from profiling import add_profile_arguments, profiled
+
+    parser = argparse.ArgumentParser(description="Slice the slot sprite sheets into icons")
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="Sheet manifest (JSON)")
+    parser.add_argument("--cache", default=CACHE_PATH, help="Build cache file")
+    parser.add_argument("--force", action="store_true", help="Rebuild every icon, ignoring the cache")
+    parser.add_argument("--output-dir", help="Write icons here instead of the manifest's output_dir")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: all cores, 1 = no pool)")
+    parser.add_argument("--memory-budget", type=int, metavar="MB",
+                        help="Run only as many workers as fit in this much memory")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiled("extract_icons", args.profile, args.profile_dir, args.profile_memory, near=args.cache):
+        extract_icons(args.manifest, args.cache, args.force, args.output_dir, args.jobs,
+                      args.memory_budget * 1024 * 1024 if args.memory_budget else None)
+    peak = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    print(f"Peak memory of any process: {peak / 1024:.0f} MB")
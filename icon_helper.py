@@ -1,71 +1,190 @@
+import argparse
+import hashlib
+import json
 import os
 import shutil
+import sys
 from pathlib import Path
 
 # This script helps you copy pre-cropped icons to the correct folders
 # Just place all your icons in the 'slot_icons' folder and run this script
 # Icons should be named with the pattern 'name_theme.png'
 # For example: 'seven_classic.png', 'alien_space.png', etc.
+#
+# Every icon is stored once under a content-hashed name (seven_classic.3f2a9c1b4d5e.png),
+# so it can be served with far-future immutable cache headers, and asset-manifest.json
+# maps each plain name to its current hashed file. Content already in the store is
+# skipped; new content is written once, and the plain name is kept as a separate copy
+# of the hashed file for code that still references it.
 
-def setup_slot_icons():
+BASE_PATH = "client/public/images/games/slots"
+SOURCE_DIR = "slot_icons"
+THEMES = [
+    "classic", "space", "fantasy", "sports",
+    "adventure", "generic", "aztec", "celestial"
+]
+ASSET_MANIFEST = "asset-manifest.json"
+HASH_LENGTH = 12  # hex digits of sha256 in the stored name
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hashed_name(filename, digest):
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+def place(source, destination):
+    """Copy source to destination atomically, so a server never sees a half-written file."""
+    tmp_path = f"{destination}.tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, destination)
+
+def same_file(a, b):
+    return os.path.exists(a) and os.path.exists(b) and os.path.samefile(a, b)
+
+def load_asset_manifest(base_path=BASE_PATH):
+    path = os.path.join(base_path, ASSET_MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def write_asset_manifest(manifest, base_path=BASE_PATH):
+    path = os.path.join(base_path, ASSET_MANIFEST)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+def store_icon(png_file, theme, base_path=BASE_PATH):
+    """
+    Put one icon in the content-addressed store.
+
+    Returns (plain path, hashed path, stored) with paths relative to base_path;
+    stored is False when the content was already in the store.
+
+    The hashed file is never a link to the file in slot_icons or to the plain name:
+    cp, most editors and save_icon rewrite a file in place, which would silently
+    change "immutable" content.
+    """
+    filename = png_file.name
+    theme_dir = os.path.join(base_path, theme)
+    digest = file_digest(png_file)
+    stored = os.path.join(theme_dir, hashed_name(filename, digest))
+    plain = os.path.join(theme_dir, filename)
+
+    # Same hash, same bytes: an existing stored file never needs rewriting
+    is_new = not os.path.exists(stored)
+    if is_new:
+        place(png_file, stored)
+
+    # Keep the plain name at the current content as its own copy; a plain name that is
+    # still a hard link to the stored file (as earlier versions made it) is split off
+    if same_file(plain, stored) or not os.path.exists(plain) or file_digest(plain) != digest:
+        place(stored, plain)
+
+    return (os.path.relpath(plain, base_path).replace(os.sep, "/"),
+            os.path.relpath(stored, base_path).replace(os.sep, "/"),
+            is_new)
+
+def prune_store(manifest, base_path=BASE_PATH):
+    """Delete hashed icons the manifest no longer points at; returns how many were removed."""
+    current = set(manifest.values())
+    removed = 0
+    for theme in THEMES:
+        for path in Path(base_path, theme).glob("*.png"):
+            relative = f"{theme}/{path.name}"
+            stem = path.stem.rsplit(".", 1)
+            is_hashed = len(stem) == 2 and len(stem[1]) == HASH_LENGTH and all(
+                c in "0123456789abcdef" for c in stem[1])
+            if is_hashed and relative not in current and f"{theme}/{stem[0]}.png" in manifest:
+                path.unlink()
+                removed += 1
+    return removed
+
+def setup_slot_icons(prune=False):
     # Ensure base directories exist
-    base_path = "client/public/images/games/slots"
-    themes = [
-        "classic", "space", "fantasy", "sports", 
-        "adventure", "generic", "aztec", "celestial"
-    ]
-    
+    base_path = BASE_PATH
+    themes = THEMES
+
     for theme in themes:
         os.makedirs(os.path.join(base_path, theme), exist_ok=True)
-    
+
     # Source directory where you'll place all icons
-    source_dir = "slot_icons"
+    source_dir = SOURCE_DIR
     os.makedirs(source_dir, exist_ok=True)
-    
+
     print(f"Please place all your slot icons in the '{source_dir}' folder.")
     print("Each icon should be named in the format: name_theme.png")
     print("For example: seven_classic.png, alien_space.png, etc.")
     print("Then run this script again to organize them automatically.")
-    
+
     # Check if source directory has any PNG files
-    png_files = list(Path(source_dir).glob("*.png"))
-    
+    png_files = sorted(Path(source_dir).glob("*.png"))
+
     if not png_files:
         print(f"\nNo PNG files found in {source_dir}. Please add your icon files first.")
         return
-    
+
+    manifest = load_asset_manifest(base_path)
+
     # Process each PNG file
-    successful_copies = 0
+    stored_count = unchanged_count = 0
     for png_file in png_files:
         filename = png_file.name
-        
+
         # Skip files that don't contain an underscore
         if "_" not in filename:
             print(f"Skipping {filename}: Missing theme identifier (e.g., name_theme.png)")
             continue
-        
+
         # Extract theme from filename
         name_parts = filename.rsplit('_', 1)
         if len(name_parts) != 2:
             print(f"Skipping {filename}: Invalid filename format")
             continue
-        
+
         name, theme_ext = name_parts
         theme = theme_ext.split('.')[0]
-        
+
         # Check if theme is valid
         if theme not in themes:
             print(f"Skipping {filename}: Unknown theme '{theme}'")
             continue
-        
-        # Copy file to appropriate theme folder
-        destination = os.path.join(base_path, theme, filename)
-        shutil.copy2(png_file, destination)
-        print(f"Copied {filename} to {theme} folder")
-        successful_copies += 1
-    
-    print(f"\nSuccessfully organized {successful_copies} icons into theme folders.")
-    print("Now update the server/routes/slots.ts file to reference these icons if needed.")
+
+        plain, stored, is_new = store_icon(png_file, theme, base_path)
+        manifest[plain] = stored
+        if is_new:
+            print(f"Stored {filename} as {stored}")
+            stored_count += 1
+        else:
+            unchanged_count += 1
+
+    write_asset_manifest(manifest, base_path)
+
+    print(f"\nOrganized {stored_count + unchanged_count} icons into theme folders: "
+          f"{stored_count} new, {unchanged_count} already stored.")
+    if prune:
+        print(f"Pruned {prune_store(manifest, base_path)} superseded hashed icons.")
+    print(f"Hashed paths are listed in {os.path.join(base_path, ASSET_MANIFEST)}; "
+          "hashed files never change, so they can be cached as immutable.")
 
 if __name__ == "__main__":
-    setup_slot_icons()
\ No newline at end of file
+    # The shared profiling hooks live with the other tooling in scripts/
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+    from profiling import add_profile_arguments, profiled
+
+    parser = argparse.ArgumentParser(description="Store pre-cropped icons in the slot theme folders under content-hashed names")
+    parser.add_argument("--prune", action="store_true",
+                        help="Delete hashed icons that asset-manifest.json no longer references")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiled("icon_helper", args.profile, args.profile_dir, args.profile_memory):
+        setup_slot_icons(args.prune)
@@ -0,0 +1,125 @@
+# Generates client/src/assets/inlineSprites.ts: data URIs for the small game sprites
+# (Mines bombs and gems), so hot game screens draw their first frame without extra
+# image requests. Each sprite is scaled down to the size it is displayed at,
+# re-encoded as optimized PNG and as WebP, and the smaller one is inlined when it
+# fits under the byte threshold. Anything bigger stays a normal URL.
+# Run it again whenever a sprite changes; the module is only rewritten when its
+# content changes.
+
+from PIL import Image
+import argparse
+import base64
+import glob
+import io
+import os
+import sys
+
+PUBLIC_DIR = "client/public"
+MODULE_PATH = "client/src/assets/inlineSprites.ts"
+
+# Sprites considered for inlining, relative to PUBLIC_DIR
+SPRITE_GLOBS = [
+    "images/bomb.png",
+    "images/diamond.png",
+    "images/games/*.png",
+]
+
+# Largest encoded size that is still inlined (base64 adds a third on top)
+THRESHOLD_BYTES = 8 * 1024
+
+# Longest side after scaling: the Mines tiles draw sprites at 40-48px, this covers 2x screens
+MAX_SIZE = 96
+
+WEBP_QUALITY = 90
+
+def encode_candidates(img):
+    """Every encoding we are willing to inline, as (mime type, bytes)."""
+    png = io.BytesIO()
+    img.save(png, format="PNG", optimize=True)
+    candidates = [("image/png", png.getvalue())]
+
+    webp = io.BytesIO()
+    img.save(webp, format="WEBP", quality=WEBP_QUALITY, method=6)
+    candidates.append(("image/webp", webp.getvalue()))
+    return candidates
+
+def optimize_sprite(path, max_size=MAX_SIZE):
+    """Scale a sprite to its display size and return its smallest encoding as (mime type, bytes, size)."""
+    with Image.open(path) as img:
+        img = img.convert("RGBA")
+    img.thumbnail((max_size, max_size), Image.LANCZOS)
+    mime, data = min(encode_candidates(img), key=lambda candidate: len(candidate[1]))
+    return mime, data, img.size
+
+def find_sprites(public_dir=PUBLIC_DIR, patterns=SPRITE_GLOBS):
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(os.path.join(public_dir, pattern)))
+    return sorted(paths)
+
+def render_module(sprites, threshold):
+    """The TypeScript module for the inlined sprites, keyed by their public URL."""
+    lines = [
+        "// Generated by inline_sprites.py from the PNGs in client/public. Do not edit;",
+        "// re-run `python inline_sprites.py` after changing a sprite.",
+        "",
+        f"// Sprites whose optimized encoding is at most {threshold} bytes, as data URIs",
+        "export const INLINE_SPRITES: Record<string, string> = {",
+    ]
+    for url, (mime, data, size) in sorted(sprites.items()):
+        lines.append(f"  // {size[0]}x{size[1]}, {len(data)} bytes")
+        lines.append(f"  '{url}': 'data:{mime};base64,{base64.b64encode(data).decode('ascii')}',")
+    lines += [
+        "};",
+        "",
+        "// The inlined copy of a sprite when there is one, otherwise its URL",
+        "export function inlineSprite(src: string): string {",
+        "  return INLINE_SPRITES[src] ?? src;",
+        "}",
+        "",
+    ]
+    return "\n".join(lines)
+
+def generate_inline_sprites(public_dir=PUBLIC_DIR, module_path=MODULE_PATH,
+                            threshold=THRESHOLD_BYTES, max_size=MAX_SIZE):
+    inlined = {}
+    for path in find_sprites(public_dir):
+        url = "/" + os.path.relpath(path, public_dir).replace(os.sep, "/")
+        try:
+            mime, data, size = optimize_sprite(path, max_size)
+        except OSError as e:
+            print(f"Warning: skipping {url}: {e}")
+            continue
+
+        if len(data) > threshold:
+            print(f"Not inlining {url}: {len(data)} bytes after optimizing (threshold {threshold})")
+            continue
+        inlined[url] = (mime, data, size)
+        print(f"Inlining {url}: {os.path.getsize(path)} -> {len(data)} bytes ({mime}, {size[0]}x{size[1]})")
+
+    module = render_module(inlined, threshold)
+    if os.path.exists(module_path):
+        with open(module_path) as f:
+            if f.read() == module:
+                print(f"{module_path} is up to date")
+                return inlined
+
+    with open(module_path, "w") as f:
+        f.write(module)
+    print(f"Wrote {len(inlined)} sprites to {module_path}")
+    return inlined
+
+if __name__ == "__main__":
+    # The shared profiling hooks live with the other tooling in scripts/
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+    from profiling import add_profile_arguments, profiled
+
+    parser = argparse.ArgumentParser(description="Inline small game sprites as data URIs")
+    parser.add_argument("--threshold", type=int, default=THRESHOLD_BYTES,
+                        help="Largest optimized sprite (bytes) that is inlined")
+    parser.add_argument("--max-size", type=int, default=MAX_SIZE, help="Longest side after scaling (px)")
+    parser.add_argument("--output", default=MODULE_PATH, help="TypeScript module to write")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiled("inline_sprites", args.profile, args.profile_dir, args.profile_memory):
+        generate_inline_sprites(PUBLIC_DIR, args.output, args.threshold, args.max_size)
@@ -0,0 +1,267 @@
+# Generates the Mines payout table from the combinatorics instead of by hand.
+# Cashing out after g gems with m mines on the 25-tile board pays
+# (1 - house edge) * C(25, g) / C(25 - m, g), the inverse of the chance of
+# picking g safe tiles in a row. Every (mines, gems) pair is computed at once as
+# exact integer fractions and rounded to cents without floating point.
+# Writes attached_assets/stake_mines_gems_multiplier_table.csv in its existing
+# layout and shared/minesExactMultipliers.ts, a flat table the server indexes
+# directly. Before overwriting anything it reports every cell of the current CSV
+# and of shared/minesMultiplierTable.ts that differs from the exact value
+# (--check only reports, and exits non-zero on drift).
+
+from decimal import Decimal
+from fractions import Fraction
+import argparse
+import json
+import numpy as np
+import os
+import re
+import sys
+
+TILES = 25
+MAX_MINES = TILES - 1
+
+CSV_PATH = "attached_assets/stake_mines_gems_multiplier_table.csv"
+MODULE_PATH = "shared/minesExactMultipliers.ts"
+LIVE_TABLE_PATH = "shared/minesMultiplierTable.ts"
+
+# The pasted table pays the fair odds: 1 mine, 1 gem is 25/24 = 1.04x
+HOUSE_EDGE = Decimal("0")
+
+
+def binomials(n=TILES):
+    """Pascal's triangle as an exact int64 table: binom[n, k] = C(n, k), 0 where k > n."""
+    binom = np.zeros((n + 1, n + 1), dtype=np.int64)
+    binom[:, 0] = 1
+    for row in range(1, n + 1):
+        binom[row, 1:] = binom[row - 1, 1:] + binom[row - 1, :-1]
+    return binom
+
+
+def exact_multipliers(house_edge=HOUSE_EDGE, round_down=False):
+    """
+    The payout for every (mines, gems) pair, in cents.
+
+    Returns a (MAX_MINES, MAX_MINES) int64 array indexed [mines - 1, gems - 1],
+    0 where the pair can't happen (more gems than safe tiles). Each cell is
+    rounded from the exact fraction to the nearest cent (halves to even), or
+    down with round_down.
+    """
+    edge = Fraction(house_edge)
+    if not 0 <= edge < 1:
+        raise ValueError(f"House edge must be in [0, 1), got {house_edge}")
+    keep = 1 - edge
+
+    # Python ints (object arrays): an edge like 1e-12 has a denominator that would
+    # overflow int64 once multiplied by the binomials
+    binom = binomials().astype(object)
+    mines = np.arange(1, MAX_MINES + 1)[:, None]
+    gems = np.arange(1, MAX_MINES + 1)[None, :]
+    # C(25, g) / C(25 - m, g) scaled by the edge, as numerator / denominator
+    numerator = np.broadcast_to(binom[TILES, gems] * keep.numerator, (MAX_MINES, MAX_MINES))
+    denominator = binom[TILES - mines, gems] * keep.denominator
+    valid = denominator > 0
+
+    divisor = np.where(valid, denominator, 1)
+    cents, remainder = numerator * 100 // divisor, numerator * 100 % divisor
+    if not round_down:
+        # Nearest cent, exact halves to even (3.125 -> 3.12), as the pasted table has them
+        twice = 2 * remainder
+        cents += (twice > denominator) | ((twice == denominator) & (cents % 2 == 1))
+    # At most 25.00x times 100, so the cents themselves fit int64
+    return np.where(valid, cents, 0).astype(np.int64)
+
+
+def format_multiplier(cents):
+    """Cents as the table writes them: 1.04, 1.3, 25.0."""
+    return repr(int(cents) / 100)
+
+
+def render_csv(cents):
+    """The multiplier CSV, one row per gems collected and one column per mine count."""
+    lines = ["Gem(s) Collected," + ",".join(f"{m} Mine(s)" for m in range(1, MAX_MINES + 1))]
+    for gems in range(1, MAX_MINES + 1):
+        cells = [format_multiplier(c) if c else "" for c in cents[:, gems - 1]]
+        lines.append(f"{gems}," + ",".join(cells))
+    return "\n".join(lines) + "\n"
+
+
+def render_module(cents, house_edge, round_down):
+    """
+    The TypeScript lookup table: one flat array, multiplier at (mines - 1) * 24 + (gems - 1).
+
+    0 marks pairs that can't happen, so a lookup is one bounds check and an index.
+    """
+    width = MAX_MINES
+    lines = [
+        "// Generated by mines_table.py from the Mines combinatorics. Do not edit;",
+        "// re-run `python mines_table.py` to change the house edge or rounding.",
+        "",
+        f"export const MINES_TILES = {TILES};",
+        f"export const MINES_HOUSE_EDGE = {house_edge};",
+        "",
+        f"// Payout multiplier, {'rounded down' if round_down else 'rounded'} to cents, at index "
+        f"(mines - 1) * {width} + (gems - 1); 0 where the pair can't happen",
+        "export const MINES_EXACT_MULTIPLIERS: readonly number[] = [",
+    ]
+    for mines in range(1, MAX_MINES + 1):
+        row = ", ".join(format_multiplier(c).removesuffix(".0") for c in cents[mines - 1])
+        lines.append(f"  /* {mines:>2} mines */ {row},")
+    lines += [
+        "];",
+        "",
+        "// The exact multiplier for a cash-out, or undefined if the pair can't happen",
+        "export function exactMinesMultiplier(mines: number, gems: number): number | undefined {",
+        f"  if (!Number.isInteger(mines) || !Number.isInteger(gems) || mines < 1 || gems < 1 || "
+        f"mines > {width} || gems > {width}) {{",
+        "    return undefined;",
+        "  }",
+        f"  return MINES_EXACT_MULTIPLIERS[(mines - 1) * {width} + gems - 1] || undefined;",
+        "}",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def read_csv_table(path=CSV_PATH):
+    """The current CSV as {mines: {gems: multiplier}}."""
+    table = {}
+    with open(path) as f:
+        header = f.readline().rstrip("\n").split(",")
+        mine_counts = [int(col.split()[0]) for col in header[1:]]
+        for line in f:
+            fields = line.rstrip("\n").split(",")
+            if not fields[0]:
+                continue
+            gems = int(fields[0])
+            for mines, value in zip(mine_counts, fields[1:]):
+                if value.strip():
+                    table.setdefault(mines, {})[gems] = float(value)
+    return table
+
+
+def read_ts_table(path=LIVE_TABLE_PATH):
+    """MINES_MULTIPLIER_TABLE from the TypeScript module, as {mines: {gems: multiplier}}."""
+    with open(path) as f:
+        source = f.read()
+    block = re.search(r"MINES_MULTIPLIER_TABLE[^=]*=\s*\{(.*?)\};", source, re.S)
+    if not block:
+        raise ValueError(f"No MINES_MULTIPLIER_TABLE found in {path}")
+    table = {}
+    for mines, values in re.findall(r"(\d+)\s*:\s*\[([^\]]*)\]", block.group(1)):
+        table[int(mines)] = {gems: float(v) for gems, v in enumerate(values.split(","), start=1) if v.strip()}
+    return table
+
+
+def find_drift(table, cents):
+    """
+    Every cell of a {mines: {gems: multiplier}} table that isn't the exact value.
+
+    Kinds: "value" (differs by a cent or more), "extra" (a pair that can't
+    happen) and "missing" (a possible pair with no value). rtp is what the cell
+    returns per unit staked at that cash-out, relative to the exact payout.
+    """
+    drift = []
+    for mines in range(1, MAX_MINES + 1):
+        row = table.get(mines, {})
+        for gems in sorted(set(row) | set(range(1, TILES - mines + 1))):
+            exact = int(cents[mines - 1, gems - 1]) if gems <= MAX_MINES else 0
+            current = row.get(gems)
+            if current is None:
+                kind = "missing"
+            elif not exact:
+                kind = "extra"
+            elif round(current * 100) != exact:
+                kind = "value"
+            else:
+                continue
+            drift.append({
+                "mines": mines,
+                "gems": gems,
+                "kind": kind,
+                "current": current,
+                "exact": exact / 100 if exact else None,
+                "rtp": round(current * 100 / exact, 4) if current is not None and exact else None,
+            })
+    return drift
+
+
+def print_drift(name, drift, limit):
+    if not drift:
+        print(f"{name}: matches the exact table")
+        return
+    counts = {kind: sum(d["kind"] == kind for d in drift) for kind in ("value", "extra", "missing")}
+    print(f"{name}: {len(drift)} cells drift ({counts['value']} wrong, {counts['extra']} impossible, "
+          f"{counts['missing']} missing)")
+    # Worst first: the furthest from paying the exact odds in either direction
+    ranked = sorted(drift, key=lambda d: -abs(np.log(d["rtp"])) if d["rtp"] else 0)
+    for d in ranked[:limit]:
+        if d["kind"] == "value":
+            detail = f"{d['current']} vs exact {d['exact']} (pays {d['rtp']:.2%} of exact)"
+        elif d["kind"] == "extra":
+            detail = f"{d['current']}, but only {TILES - d['mines']} gems exist"
+        else:
+            detail = f"no value, exact {d['exact']}"
+        print(f"  {d['mines']:>2} mines, {d['gems']:>2} gems: {detail}")
+    if len(ranked) > limit:
+        print(f"  ... and {len(ranked) - limit} more")
+
+
+def write_if_changed(path, content):
+    if os.path.exists(path):
+        with open(path) as f:
+            if f.read() == content:
+                print(f"{path} is up to date")
+                return False
+    with open(path, "w") as f:
+        f.write(content)
+    print(f"Wrote {path}")
+    return True
+
+
+def generate_mines_table(house_edge=HOUSE_EDGE, round_down=False, csv_path=CSV_PATH, module_path=MODULE_PATH,
+                         check=False, report_path=None, limit=20):
+    """Report drift in the current tables, then (unless check) write the CSV and lookup module."""
+    cents = exact_multipliers(house_edge, round_down)
+
+    report = {}
+    for name, path, reader in ((csv_path, csv_path, read_csv_table), (LIVE_TABLE_PATH, LIVE_TABLE_PATH, read_ts_table)):
+        if not os.path.exists(path):
+            continue
+        report[name] = find_drift(reader(path), cents)
+        print_drift(name, report[name], limit)
+
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump({"house_edge": str(house_edge), "round_down": round_down, "drift": report}, f, indent=2)
+        print(f"Drift report written to {report_path}")
+
+    if not check:
+        write_if_changed(csv_path, render_csv(cents))
+        write_if_changed(module_path, render_module(cents, house_edge.normalize(), round_down))
+    return report
+
+
+if __name__ == "__main__":
+    # The shared profiling hooks live with the other tooling in scripts/
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+    from profiling import add_profile_arguments, profiled
+
+    parser = argparse.ArgumentParser(description="Generate the Mines multiplier table from the combinatorics")
+    parser.add_argument("--house-edge", type=Decimal, default=HOUSE_EDGE,
+                        help="Fraction kept by the house, e.g. 0.01 for 1%% (default: %(default)s)")
+    parser.add_argument("--round-down", action="store_true",
+                        help="Round payouts down to the cent instead of to the nearest cent")
+    parser.add_argument("--csv", default=CSV_PATH, help="Multiplier CSV to check and write")
+    parser.add_argument("--output", default=MODULE_PATH, help="TypeScript lookup module to write")
+    parser.add_argument("--check", action="store_true",
+                        help="Only report drift; exit non-zero if any table differs from the exact values")
+    parser.add_argument("--report", help="Write the drift report as JSON")
+    parser.add_argument("--limit", type=int, default=20, help="Drifting cells to print per table")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiled("mines_table", args.profile, args.profile_dir, args.profile_memory, near=args.report):
+        report = generate_mines_table(args.house_edge, args.round_down, args.csv, args.output,
+                                      args.check, args.report, args.limit)
+    if args.check and any(report.values()):
+        sys.exit(1)
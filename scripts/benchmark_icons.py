@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+"""
+Icon Pipeline Benchmark and Golden-Output Check
+Times the slicer's per-icon crop, mask and encode steps on synthetic sprite sheets
+of several resolutions and grid sizes, records peak memory per configuration, and
+compares every icon's pixels against golden hashes so a speedup can be shown not
+to change the art.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Configuration
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "scripts", "benchmark_results")
+GOLDEN_PATH = os.path.join(REPO_ROOT, "scripts", "icon_golden_hashes.json")
+SHEET_SIZES = (1024, 2048, 4096)
+GRIDS = (5, 8)
+KEYINGS = ("alpha", "black")  # transparent sheets vs black-background sheets keyed by colour
+
+# The slicer lives at the repo root
+sys.path.insert(0, REPO_ROOT)
+import extract_icons  # noqa: E402
+
+
+def pixel_hash(pixels):
+    """SHA-256 of an RGBA array's shape and bytes, independent of how the PNG was encoded."""
+    pixels = np.ascontiguousarray(pixels)
+    digest = hashlib.sha256(repr(pixels.shape).encode())
+    digest.update(pixels.tobytes())
+    return digest.hexdigest()
+
+
+def peak_rss_mb():
+    """
+    This process's peak resident set size.
+
+    Linux's VmHWM starts over at exec, unlike ru_maxrss, which a spawned worker
+    inherits from the parent it was forked from.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def file_pixel_hash(path):
+    with Image.open(path) as img:
+        return pixel_hash(np.asarray(img.convert("RGBA")))
+
+
+def generate_sheet(path, size, grid, keying="alpha", seed=0):
+    """
+    Draw a synthetic sprite sheet: one symbol per cell, centred with a margin.
+
+    Symbols are gradient-filled ellipses and polygons on a transparent background
+    ("alpha") or on black ("black", like the colour-keyed sheets). Everything comes from `seed`, so a sheet is the same on
+    every run and its icons can have golden hashes.
+    """
+    rng = np.random.default_rng(seed)
+    cell = size // grid
+    background = (0, 0, 0, 0) if keying == "alpha" else (0, 0, 0, 255)
+    sheet = Image.new("RGBA", (size, size), background)
+
+    # A shared vertical gradient, tinted per symbol
+    ramp = np.linspace(0.55, 1.0, cell, dtype=np.float32)[:, None, None]
+    for row in range(grid):
+        for col in range(grid):
+            color = rng.integers(60, 256, 3)
+            fill = np.empty((cell, cell, 4), dtype=np.uint8)
+            fill[..., :3] = np.clip(ramp * color, 0, 255).astype(np.uint8)
+            fill[..., 3] = 255
+
+            mask = Image.new("L", (cell, cell), 0)
+            draw = ImageDraw.Draw(mask)
+            margin = int(cell * rng.uniform(0.08, 0.2))
+            if rng.random() < 0.5:
+                draw.ellipse((margin, margin, cell - margin, cell - margin), fill=255)
+            else:
+                sides = int(rng.integers(3, 9))
+                angles = np.sort(rng.uniform(0, 2 * np.pi, sides))
+                radius = cell / 2 - margin
+                points = [(cell / 2 + radius * np.cos(a), cell / 2 + radius * np.sin(a)) for a in angles]
+                draw.polygon(points, fill=255)
+
+            symbol = Image.fromarray(fill, "RGBA")
+            symbol.putalpha(mask)
+            sheet.alpha_composite(symbol, (col * cell, row * cell))
+
+    if keying == "black":
+        sheet = sheet.convert("RGB")
+    sheet.save(path, format="PNG")
+    return path
+
+
+def sheet_spec(path, grid, keying):
+    """A manifest sheet entry for a synthetic sheet, exporting every cell."""
+    return {
+        "name": os.path.basename(path),
+        "path": path,
+        "grid": {"rows": grid, "cols": grid},
+        "padding": 0.25,
+        "crop": "tight",
+        "keying": ["color_key"] if keying == "black" else [],
+        "cells": [{"cell": [r, c], "output": f"bench/{r}_{c}.png"} for r in range(grid) for c in range(grid)],
+    }
+
+
+def run_config(path, size, grid, keying, variants):
+    """
+    Time one sheet through the slicer stages, in a fresh process so peak RSS is its own.
+
+    Returns per-stage totals, per-icon means, peak memory and the icons' pixel hashes.
+    """
+    sheet = sheet_spec(path, grid, keying)
+    timings = dict.fromkeys(("decode", "crop", "mask", "encode", "variants"), 0.0)
+
+    started = time.perf_counter()
+    img = extract_icons.open_sheet(path)
+    timings["decode"] = time.perf_counter() - started
+
+    hashes = {}
+    encoded_bytes = 0
+    with tempfile.TemporaryDirectory(prefix="icon_bench_") as out_dir:
+        for entry in sheet["cells"]:
+            row, col = entry["cell"]
+
+            started = time.perf_counter()
+            pixels, box = extract_icons.crop_cell(img, sheet, row, col)
+            cropped = time.perf_counter()
+            pixels, anchor = extract_icons.key_cell(pixels, img.size, sheet, row, col, box)
+            masked = time.perf_counter()
+            output_path = os.path.join(out_dir, f"{row}_{col}.png")
+            extract_icons.save_icon(pixels, output_path, verbose=False)
+            encoded = time.perf_counter()
+            extract_icons.save_variants(pixels, output_path, anchor, variants)
+            done = time.perf_counter()
+
+            timings["crop"] += cropped - started
+            timings["mask"] += masked - cropped
+            timings["encode"] += encoded - masked
+            timings["variants"] += done - encoded
+            encoded_bytes += os.path.getsize(output_path)
+            hashes[f"{row}_{col}"] = pixel_hash(pixels)
+
+    icons = len(sheet["cells"])
+    return {
+        "sheet_size": size,
+        "grid": grid,
+        "keying": keying,
+        "icons": icons,
+        "seconds": {stage: round(seconds, 4) for stage, seconds in timings.items()},
+        "ms_per_icon": {stage: round(seconds / icons * 1000, 3)
+                        for stage, seconds in timings.items() if stage != "decode"},
+        "icons_per_sec": round(icons / max(sum(timings.values()), 1e-9), 1),
+        "png_bytes": encoded_bytes,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "hashes": hashes,
+    }
+
+
+def benchmark(sizes, grids, keyings, variants, work_dir, seed):
+    results = []
+    for size in sizes:
+        for grid in grids:
+            for keying in keyings:
+                path = os.path.join(work_dir, f"sheet_{size}_{grid}_{keying}.png")
+                generate_sheet(path, size, grid, keying, seed)
+                print(f"Sheet {size}px, {grid}x{grid}, {keying}: ", end="", flush=True)
+                # One fresh worker per configuration, so the peak RSS isn't inherited
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    result = pool.submit(run_config, path, size, grid, keying, variants).result()
+                per_icon = result["ms_per_icon"]
+                print(f"decode {result['seconds']['decode'] * 1000:.0f} ms, per icon crop {per_icon['crop']} ms, "
+                      f"mask {per_icon['mask']} ms, encode {per_icon['encode']} ms, "
+                      f"variants {per_icon['variants']} ms, peak RSS {result['peak_rss_mb']} MB")
+                results.append(result)
+    return results
+
+
+def repo_icon_hashes(jobs=None):
+    """Build the real manifest from scratch into a temp dir and hash every icon's pixels."""
+    with tempfile.TemporaryDirectory(prefix="icon_golden_") as out_dir:
+        manifest_path = os.path.join(REPO_ROOT, extract_icons.MANIFEST_PATH)
+        cache_path = os.path.join(out_dir, "cache.json")
+        started = time.perf_counter()
+        extract_icons.extract_icons(manifest_path, cache_path, force=True, output_dir=out_dir, jobs=jobs)
+        seconds = time.perf_counter() - started
+        hashes = {}
+        for root, _, files in os.walk(out_dir):
+            for name in files:
+                if name.endswith(".png") and os.path.basename(root) != extract_icons.ATLAS_DIR:
+                    path = os.path.join(root, name)
+                    hashes[os.path.relpath(path, out_dir).replace(os.sep, "/")] = file_pixel_hash(path)
+    return dict(sorted(hashes.items())), seconds
+
+
+def check_golden(current, golden):
+    """Print every icon whose pixels differ from (or are missing in) the golden set; returns the count."""
+    mismatches = 0
+    for group, hashes in current.items():
+        expected = golden.get(group)
+        if expected is None:
+            print(f"  {group}: no golden hashes recorded, run with --update-golden")
+            continue
+        for name in sorted(set(expected) | set(hashes)):
+            if expected.get(name) != hashes.get(name):
+                state = "missing" if name not in hashes else "new" if name not in expected else "changed"
+                print(f"  {group}: {name} {state}")
+                mismatches += 1
+    return mismatches
+
+
+def compare(results, baseline_path, tolerance):
+    """Print icons/sec changes against an earlier results file and return the regressions."""
+    with open(baseline_path) as f:
+        baseline = {(r["sheet_size"], r["grid"], r["keying"]): r for r in json.load(f)["results"]}
+
+    regressions = []
+    print("\nComparison with baseline:")
+    for result in results:
+        old = baseline.get((result["sheet_size"], result["grid"], result["keying"]))
+        if not old:
+            continue
+        change = result["icons_per_sec"] / old["icons_per_sec"] - 1
+        flag = "REGRESSION" if change < -tolerance else ""
+        print(f"  {result['sheet_size']:>5}px {result['grid']}x{result['grid']} {result['keying']:<6}"
+              f"{change:+.1%} {flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+
+def print_report(results):
+    print("\n======================================")
+    print("  ICON PIPELINE BENCHMARK RESULTS    ")
+    print("======================================")
+    print(f"{'sheet':>6}{'grid':>6}{'keying':>8}{'decode ms':>11}{'crop':>8}{'mask':>8}{'encode':>8}"
+          f"{'variants':>10}{'icons/s':>9}{'RSS MB':>8}")
+    for r in results:
+        per_icon = r["ms_per_icon"]
+        print(f"{r['sheet_size']:>6}{r['grid']:>6}{r['keying']:>8}{r['seconds']['decode'] * 1000:>11.1f}"
+              f"{per_icon['crop']:>8}{per_icon['mask']:>8}{per_icon['encode']:>8}{per_icon['variants']:>10}"
+              f"{r['icons_per_sec']:>9}{r['peak_rss_mb']:>8}")
+    print("(crop/mask/encode/variants are ms per icon)")
+    print("======================================")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the icon slicer and check its output against golden hashes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SHEET_SIZES), help="Sheet widths/heights (px)")
+    parser.add_argument("--grids", type=int, nargs="+", default=list(GRIDS), help="Cells per side")
+    parser.add_argument("--keyings", nargs="+", choices=KEYINGS, default=list(KEYINGS))
+    parser.add_argument("--variants", action="store_true",
+                        help="Also encode the manifest's AVIF/WebP variants for every icon")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-repo", action="store_true",
+                        help="Don't rebuild the real sheets from icon_sheets.json for the golden check")
+    parser.add_argument("--jobs", type=int, help="Workers for the real-sheet rebuild")
+    parser.add_argument("--golden", default=GOLDEN_PATH, help="Golden pixel hashes (JSON)")
+    parser.add_argument("--update-golden", action="store_true",
+                        help="Record the current output as golden instead of checking it")
+    parser.add_argument("--output", help="Results JSON path (default: scripts/benchmark_results/)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare icons/sec against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed icons/sec drop vs the baseline before flagging a regression")
+    args = parser.parse_args()
+
+    variants = None
+    if args.variants:
+        with open(os.path.join(REPO_ROOT, extract_icons.MANIFEST_PATH)) as f:
+            variants = extract_icons.load_variants(json.load(f).get("variants"))
+
+    print("======================================")
+    print("  ICON PIPELINE BENCHMARK            ")
+    print("======================================")
+
+    with tempfile.TemporaryDirectory(prefix="icon_sheets_") as work_dir:
+        results = benchmark(args.sizes, args.grids, args.keyings, variants, work_dir, args.seed)
+    print_report(results)
+
+    # Golden groups: one per synthetic configuration, plus the real sheets
+    current = {f"synthetic/{r['sheet_size']}_{r['grid']}_{r['keying']}_seed{args.seed}": r.pop("hashes")
+               for r in results}
+    repo_seconds = None
+    if not args.skip_repo:
+        print("\nRebuilding the real sheets from icon_sheets.json...")
+        current["repo"], repo_seconds = repo_icon_hashes(args.jobs)
+        print(f"Full rebuild took {repo_seconds:.2f}s for {len(current['repo'])} icons")
+
+    golden = {}
+    if os.path.exists(args.golden):
+        with open(args.golden) as f:
+            golden = json.load(f)
+
+    failed = False
+    if args.update_golden:
+        golden.update(current)
+        with open(args.golden, "w") as f:
+            json.dump(golden, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nGolden hashes for {len(current)} groups written to {args.golden}")
+    else:
+        print("\nGolden pixel check:")
+        mismatches = check_golden(current, golden)
+        print(f"  {mismatches} icon(s) differ" if mismatches else "  all icons match")
+        failed = mismatches > 0
+
+    output = args.output or os.path.join(RESULTS_DIR, f"icons_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "host": {"platform": platform.platform(), "python": platform.python_version(),
+                     "pillow": Image.__version__, "numpy": np.__version__, "cpus": os.cpu_count()},
+            "params": {"sizes": args.sizes, "grids": args.grids, "keyings": args.keyings,
+                       "variants": bool(variants), "seed": args.seed},
+            "repo_rebuild_seconds": repo_seconds,
+            "results": results,
+        }, f, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
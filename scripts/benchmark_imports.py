@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+
+"""
+User Import Benchmark Harness
+Generates synthetic user sheets in the real CSV layout and runs each importer
+against a throwaway Postgres database, recording rows/sec, peak RSS, DB round
+trips and WAL bytes as JSON so regressions can be tracked over time.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urlunsplit
+
+import numpy as np
+import pandas as pd
+import psycopg2
+
+# Configuration
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_NAME = "users - Sheet1.csv"
+CHUNK_ROWS = 1_000_000
+RESULTS_DIR = os.path.join(REPO_ROOT, "scripts", "benchmark_results")
+
+# Phones are 10 digits starting with 6-9; an affine map over this range gives
+# unique numbers for any row index without keeping a set in memory
+PHONE_BASE = 6_000_000_000
+PHONE_RANGE = 4_000_000_000
+PHONE_STRIDE = 2_654_435_761  # odd and not a multiple of 5, so coprime with PHONE_RANGE
+PHONE_OFFSET = 1_234_567
+
+# Importer name -> command (relative to the sandbox workspace, {csv} is substituted)
+IMPORTERS = {
+    "bulk_import_users.py": [sys.executable, "scripts/bulk_import_users.py", "--csv", "{csv}"],
+    "fast-import.py": [sys.executable, "scripts/fast-import.py", "--csv", "{csv}"],
+    "import_users_subset.py": [sys.executable, "scripts/import_users_subset.py"],
+    "direct-import.js": ["node", "scripts/direct-import.js"],
+    "bulk_import_users.js": ["node", "scripts/bulk_import_users.js"],
+    "efficient_bulk_import.js": ["node", "scripts/efficient_bulk_import.js"],
+    "optimized_bulk_import.js": ["node", "scripts/optimized_bulk_import.js"],
+    "bulk_one_shot_import.js": ["node", "scripts/bulk_one_shot_import.js"],
+}
+
+# Matches the users table in shared/schema.ts
+USERS_DDL = """
+CREATE TABLE users (
+    id serial PRIMARY KEY,
+    username text NOT NULL UNIQUE,
+    password text NOT NULL,
+    is_admin boolean NOT NULL DEFAULT false,
+    is_banned boolean NOT NULL DEFAULT false,
+    balance jsonb NOT NULL DEFAULT '{"INR": 0, "BTC": 0, "ETH": 0, "USDT": 0}',
+    created_at timestamp NOT NULL DEFAULT now(),
+    email text NOT NULL UNIQUE,
+    full_name text NOT NULL,
+    phone text NOT NULL,
+    referral_code text,
+    language text DEFAULT 'English'
+)
+"""
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def synthetic_phones(indices):
+    """Unique 10-digit phone numbers for the given row indices."""
+    indices = np.asarray(indices, dtype=np.int64)
+    return PHONE_BASE + (indices * PHONE_STRIDE + PHONE_OFFSET) % PHONE_RANGE
+
+
+def _timestamp_tables():
+    """Lookup tables so dates and times are formatted once, not once per row."""
+    start = datetime(2025, 1, 1)
+    dates = np.array([f"{d.month}/{d.day}/{d.year}" for d in (start + timedelta(days=i) for i in range(365))])
+    times = np.array([f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in range(86400)])
+    return dates, times
+
+
+def generate_users_csv(path, rows, duplicate_rate=0.0, collision_rate=0.0, seed=0):
+    """
+    Write a synthetic sheet in the `users - Sheet1.csv` layout.
+
+    duplicate_rate is the share of rows whose phone repeats an earlier row in the
+    file; collision_rate is the share of rows whose username belongs to one of the
+    users returned for pre-seeding the database. Returns the seed users as a
+    list of (username, phone) tuples.
+    """
+    rng = np.random.default_rng(seed)
+    dates, times = _timestamp_tables()
+    seed_count = int(rows * collision_rate)
+    seed_phones = synthetic_phones(np.arange(rows, rows + seed_count))
+    seed_names = np.char.add("seed_", np.arange(seed_count).astype(str))
+
+    with open(path, "w", newline="") as f:
+        for start in range(0, rows, CHUNK_ROWS):
+            stop = min(start + CHUNK_ROWS, rows)
+            index = np.arange(start, stop, dtype=np.int64)
+            n = len(index)
+
+            phone_index = index.copy()
+            duplicate = (rng.random(n) < duplicate_rate) & (index > 0)
+            phone_index[duplicate] = (rng.random(duplicate.sum()) * index[duplicate]).astype(np.int64)
+            phones = synthetic_phones(phone_index).astype(str)
+
+            ids = (rows - index).astype(str)  # the real sheet is newest first
+            usernames = np.char.add("user_", np.char.zfill((index + 1).astype(str), 6))
+            if seed_count:
+                collide = rng.random(n) < collision_rate
+                usernames = usernames.astype(object)
+                usernames[collide] = seed_names[rng.integers(0, seed_count, collide.sum())]
+
+            frame = pd.DataFrame({
+                "ID": ids,
+                "Username": usernames,
+                "Balance": np.char.add(ids, np.asarray(usernames, dtype=str)),
+                "Phone": phones,
+                "Is Admin": np.where(rng.random(n) < 0.001, "Yes", "No"),
+                "Is Banned": np.where(rng.random(n) < 0.01, "Yes", "No"),
+                "Created At": dates[rng.integers(0, len(dates), n)],
+                "Status": times[rng.integers(0, len(times), n)],
+                "": "",
+            })
+            frame.to_csv(f, header=(start == 0), index=False)
+
+    return list(zip(seed_names.tolist(), seed_phones.astype(str).tolist()))
+
+
+# ---------------------------------------------------------------------------
+# Database
+# ---------------------------------------------------------------------------
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pg_bin(name):
+    found = shutil.which(name)
+    if found:
+        return found
+    try:
+        bindir = subprocess.run(["pg_config", "--bindir"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    candidate = os.path.join(bindir, name)
+    return candidate if os.path.exists(candidate) else None
+
+
+def _has_pg_stat_statements():
+    """Whether the local install ships pg_stat_statements (used to count round trips)."""
+    try:
+        libdir = subprocess.run([_pg_bin("pg_config"), "--pkglibdir"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, TypeError, subprocess.CalledProcessError):
+        return False
+    return os.path.exists(os.path.join(libdir, "pg_stat_statements.so"))
+
+
+class DisposablePostgres:
+    """A throwaway Postgres cluster in a temp directory (initdb + pg_ctl)."""
+
+    def __init__(self):
+        self.dir = None
+        self.port = None
+        self.user = os.environ.get("USER") or "postgres"
+
+    def __enter__(self):
+        initdb, pg_ctl = _pg_bin("initdb"), _pg_bin("pg_ctl")
+        if not initdb or not pg_ctl:
+            raise RuntimeError("initdb/pg_ctl not found - install Postgres or pass --database-url")
+
+        self.dir = tempfile.mkdtemp(prefix="import-bench-pg-")
+        self.port = _free_port()
+        data = os.path.join(self.dir, "data")
+        subprocess.run([initdb, "-D", data, "-U", self.user, "--auth=trust", "-E", "UTF8"],
+                       check=True, capture_output=True)
+        options = f"-p {self.port} -c listen_addresses=127.0.0.1 -c unix_socket_directories={self.dir}"
+        if _has_pg_stat_statements():
+            options += " -c shared_preload_libraries=pg_stat_statements"
+        subprocess.run([pg_ctl, "-D", data, "-o", options, "-l", os.path.join(self.dir, "pg.log"), "-w", "start"],
+                       check=True, capture_output=True)
+        return self
+
+    def __exit__(self, *exc):
+        subprocess.run([_pg_bin("pg_ctl"), "-D", os.path.join(self.dir, "data"), "-m", "immediate", "stop"],
+                       capture_output=True)
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    @property
+    def url(self):
+        return f"postgresql://{self.user}@127.0.0.1:{self.port}/postgres"
+
+
+def with_database(url, dbname):
+    """The same server URL pointing at another database."""
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(path="/" + dbname))
+
+
+class BenchDatabase:
+    """
+    A fresh database created on the server for one benchmark run and dropped
+    afterwards, so the target server's own data is never touched.
+    """
+
+    def __init__(self, server_url, name):
+        self.server_url = server_url
+        self.name = name
+        self.url = with_database(server_url, name)
+        self.conn = None
+        self.has_statements = False
+
+    def _admin(self, sql):
+        conn = psycopg2.connect(self.server_url)
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+        finally:
+            conn.close()
+
+    def __enter__(self):
+        self._admin(f'DROP DATABASE IF EXISTS "{self.name}"')
+        self._admin(f'CREATE DATABASE "{self.name}"')
+        self.conn = psycopg2.connect(self.url)
+        self.conn.autocommit = True
+        with self.conn.cursor() as cur:
+            cur.execute(USERS_DDL)
+            try:
+                cur.execute("CREATE EXTENSION IF NOT EXISTS pg_stat_statements")
+                cur.execute("SELECT 1 FROM pg_stat_statements LIMIT 1")
+                self.has_statements = True
+            except psycopg2.Error:
+                self.has_statements = False
+        return self
+
+    def __exit__(self, *exc):
+        self.conn.close()
+        self._admin(f'DROP DATABASE IF EXISTS "{self.name}" WITH (FORCE)')
+
+    def seed(self, users):
+        """Bulk-load the pre-existing users that the sheet collides with."""
+        if not users:
+            return
+        buf = io.StringIO()
+        for username, phone in users:
+            buf.write(f"{username}\tseed\t{username}@seed.example.com\tSeed {username}\t{phone}\n")
+        buf.seek(0)
+        with self.conn.cursor() as cur:
+            cur.copy_expert("COPY users (username, password, email, full_name, phone) FROM STDIN", buf)
+            cur.execute("ANALYZE users")
+
+    def snapshot(self):
+        """Counters read before and after a run."""
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT count(*) FROM users")
+            users = cur.fetchone()[0]
+            cur.execute("SELECT pg_current_wal_lsn()")
+            lsn = cur.fetchone()[0]
+            cur.execute("SELECT xact_commit + xact_rollback FROM pg_stat_database WHERE datname = current_database()")
+            xacts = cur.fetchone()[0]
+            statements = None
+            if self.has_statements:
+                cur.execute("""
+                    SELECT coalesce(sum(calls), 0) FROM pg_stat_statements s
+                    JOIN pg_database d ON d.oid = s.dbid WHERE d.datname = current_database()
+                """)
+                statements = int(cur.fetchone()[0])
+        return {"users": users, "lsn": lsn, "xacts": xacts, "statements": statements}
+
+    def wal_bytes(self, start_lsn, end_lsn):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_wal_lsn_diff(%s, %s)", (end_lsn, start_lsn))
+            return int(cur.fetchone()[0])
+
+    def reset_stats(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_stat_reset()")
+            if self.has_statements:
+                cur.execute("SELECT pg_stat_statements_reset()")
+            cur.execute("CHECKPOINT")
+
+
+# ---------------------------------------------------------------------------
+# Running importers
+# ---------------------------------------------------------------------------
+
+def build_workspace(root, csv_source):
+    """
+    Lay out a sandbox that looks like the repo: the importers resolve the CSV
+    relative to the cwd or to their own directory, so both point at the synthetic sheet.
+    """
+    shutil.copytree(os.path.join(REPO_ROOT, "scripts"), os.path.join(root, "scripts"),
+                    ignore=shutil.ignore_patterns("benchmark_results", "__pycache__"))
+    os.makedirs(os.path.join(root, "attached_assets"), exist_ok=True)
+    target = os.path.join(root, "attached_assets", CSV_NAME)
+    try:
+        os.link(csv_source, target)
+    except OSError:
+        shutil.copyfile(csv_source, target)
+    shutil.copy2(os.path.join(REPO_ROOT, "package.json"), root)
+    node_modules = os.path.join(REPO_ROOT, "node_modules")
+    if os.path.isdir(node_modules):
+        os.symlink(node_modules, os.path.join(root, "node_modules"))
+    os.makedirs(os.path.join(root, "logs"), exist_ok=True)
+
+
+def importer_available(name, workspace):
+    command = IMPORTERS[name]
+    if command[0] == "node":
+        return shutil.which("node") is not None and os.path.isdir(os.path.join(workspace, "node_modules"))
+    return True
+
+
+def run_importer(name, workspace, database_url, timeout):
+    """Run one importer to completion and return wall time, exit code and peak RSS."""
+    csv_path = os.path.join(workspace, "attached_assets", CSV_NAME)
+    command = [part.replace("{csv}", csv_path) for part in IMPORTERS[name]]
+    env = dict(os.environ, DATABASE_URL=database_url)
+    log_path = os.path.join(workspace, "logs", f"{name}.log")
+
+    with open(log_path, "w") as log:
+        started = time.perf_counter()
+        proc = subprocess.Popen(command, cwd=workspace, env=env, stdout=log, stderr=subprocess.STDOUT)
+        deadline = started + timeout
+        while True:
+            # wait4 gives the rusage of this child alone, unlike RUSAGE_CHILDREN
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.perf_counter() > deadline:
+                proc.kill()
+                pid, status, usage = os.wait4(proc.pid, 0)
+                break
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+    return {
+        "seconds": round(elapsed, 3),
+        "exit_code": proc.returncode,
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),  # ru_maxrss is in KiB on Linux
+        "log": log_path,
+    }
+
+
+def benchmark(server_url, importers, sizes, duplicate_rate, collision_rate, timeout, seed):
+    results = []
+    for rows in sizes:
+        with tempfile.TemporaryDirectory(prefix="import-bench-data-") as data_dir:
+            csv_path = os.path.join(data_dir, CSV_NAME)
+            seed_users = generate_users_csv(csv_path, rows, duplicate_rate, collision_rate, seed)
+            for name in importers:
+                results.extend(_benchmark_one(server_url, name, rows, csv_path, seed_users, timeout))
+    return results
+
+
+def _benchmark_one(server_url, name, rows, csv_path, seed_users, timeout):
+    """Run a single importer on a fresh workspace and database; returns a list of 0 or 1 results."""
+    with tempfile.TemporaryDirectory(prefix="import-bench-") as workspace:
+        build_workspace(workspace, csv_path)
+
+        if not importer_available(name, workspace):
+            print(f"Skipping {name}: node or node_modules not available")
+            return []
+
+        db_name = f"import_bench_{os.getpid()}"
+        with BenchDatabase(server_url, db_name) as db:
+            db.seed(seed_users)
+            db.reset_stats()
+            before = db.snapshot()
+
+            print(f"Running {name} on {rows} rows...")
+            run = run_importer(name, workspace, db.url, timeout)
+
+            after = db.snapshot()
+            inserted = after["users"] - before["users"]
+            result = {
+                "importer": name,
+                "rows": rows,
+                "rows_inserted": inserted,
+                "seconds": run["seconds"],
+                "rows_per_sec": round(inserted / run["seconds"], 1) if run["seconds"] else None,
+                "peak_rss_mb": run["peak_rss_mb"],
+                "statements": (after["statements"] - before["statements"]
+                               if before["statements"] is not None else None),
+                "transactions": after["xacts"] - before["xacts"],
+                "wal_bytes": db.wal_bytes(before["lsn"], after["lsn"]),
+                "exit_code": run["exit_code"],
+            }
+            if run["exit_code"] != 0:
+                with open(run["log"]) as log:
+                    result["log_tail"] = log.read()[-2000:]
+            print(f"  {inserted} rows in {run['seconds']}s "
+                  f"({result['rows_per_sec']} rows/sec, {run['peak_rss_mb']} MB peak RSS, "
+                  f"{result['statements']} statements, {result['wal_bytes']} WAL bytes)")
+            return [result]
+
+
+def compare(results, baseline_path, tolerance):
+    """Print rows/sec changes against an earlier results file and return the regressions."""
+    with open(baseline_path) as f:
+        baseline = {(r["importer"], r["rows"]): r for r in json.load(f)["results"]}
+
+    regressions = []
+    print("\nComparison with baseline:")
+    for result in results:
+        old = baseline.get((result["importer"], result["rows"]))
+        if not old or not old.get("rows_per_sec") or not result.get("rows_per_sec"):
+            continue
+        change = result["rows_per_sec"] / old["rows_per_sec"] - 1
+        flag = "REGRESSION" if change < -tolerance else ""
+        print(f"  {result['importer']:<26}{result['rows']:>10} rows  {change:+.1%} {flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+
+def print_report(results):
+    print("\n======================================")
+    print("  IMPORT BENCHMARK RESULTS           ")
+    print("======================================")
+    print(f"{'importer':<26}{'rows':>10}{'inserted':>10}{'rows/s':>12}{'RSS MB':>9}{'stmts':>10}{'WAL MB':>9}")
+    for r in results:
+        statements = r["statements"] if r["statements"] is not None else "-"
+        print(f"{r['importer']:<26}{r['rows']:>10}{r['rows_inserted']:>10}{str(r['rows_per_sec']):>12}"
+              f"{r['peak_rss_mb']:>9}{statements:>10}{r['wal_bytes'] / 1e6:>9.1f}")
+    print("======================================")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the user importers against a throwaway Postgres")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000],
+                        help="Sheet sizes to generate (e.g. 10000 100000 1000000 10000000)")
+    parser.add_argument("--importers", nargs="+", choices=sorted(IMPORTERS), default=list(IMPORTERS))
+    parser.add_argument("--duplicate-rate", type=float, default=0.01,
+                        help="Share of rows repeating an earlier phone in the same file")
+    parser.add_argument("--collision-rate", type=float, default=0.01,
+                        help="Share of rows whose username already exists in the database")
+    parser.add_argument("--database-url",
+                        help="Server to benchmark on (a scratch database is created and dropped); "
+                             "by default a disposable local cluster is started")
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds before an importer is killed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Results JSON path (default: scripts/benchmark_results/)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare rows/sec against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed rows/sec drop vs the baseline before flagging a regression")
+    parser.add_argument("--generate-only", metavar="PATH",
+                        help="Only write a synthetic sheet of --rows[0] rows to PATH")
+    args = parser.parse_args()
+
+    if args.generate_only:
+        generate_users_csv(args.generate_only, args.rows[0], args.duplicate_rate, 0.0, args.seed)
+        print(f"Wrote {args.rows[0]} synthetic rows to {args.generate_only}")
+        return
+
+    params = {
+        "rows": args.rows,
+        "importers": args.importers,
+        "duplicate_rate": args.duplicate_rate,
+        "collision_rate": args.collision_rate,
+        "seed": args.seed,
+    }
+
+    if args.database_url:
+        results = benchmark(args.database_url, args.importers, args.rows, args.duplicate_rate,
+                            args.collision_rate, args.timeout, args.seed)
+    else:
+        with DisposablePostgres() as pg:
+            results = benchmark(pg.url, args.importers, args.rows, args.duplicate_rate,
+                                args.collision_rate, args.timeout, args.seed)
+
+    print_report(results)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"imports_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "host": {"platform": platform.platform(), "python": platform.python_version(),
+                     "cpus": os.cpu_count()},
+            "params": params,
+            "results": results,
+        }, f, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
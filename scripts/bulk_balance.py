@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+
+"""
+Bulk Balance Tool
+Resets, sets or adjusts per-currency values in the users.balance JSONB column in
+small keyset-paginated transactions (by id), so it can run alongside live games.
+Progress is stored in the database with each chunk, so an interrupted job resumes
+exactly where it stopped and adjustments are never applied twice.
+"""
+
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+
+import psycopg2
+from psycopg2 import errors
+
+from profiling import add_profile_arguments, profiled
+
+# Configuration
+CURRENCIES = ("INR", "BTC", "ETH", "USDT")
+BULK_IMPORT_PATTERN = "user\\_%"  # usernames generated by the bulk importers
+CHUNK_SIZE = 1000
+SLEEP_SECONDS = 0.05  # pause between chunks so live traffic gets the row locks
+LOCK_TIMEOUT = "2s"
+MAX_LOCK_RETRIES = 10
+
+# Database connection from environment variables
+DB_URL = os.environ.get('DATABASE_URL')
+
+JOBS_DDL = """
+CREATE TABLE IF NOT EXISTS balance_jobs (
+    job text PRIMARY KEY,
+    last_id integer NOT NULL DEFAULT 0,
+    rows_updated bigint NOT NULL DEFAULT 0,
+    started_at timestamp NOT NULL DEFAULT now(),
+    updated_at timestamp NOT NULL DEFAULT now(),
+    finished_at timestamp
+)
+"""
+
+
+def build_balance_expression(operation, currencies, amount=None):
+    """
+    Build the new-balance SQL expression as nested jsonb_set calls, one per currency.
+
+    reset sets each currency to 0, set writes `amount`, adjust adds `amount` to the
+    current value (a missing key counts as 0). Returns (sql, params).
+    """
+    expr, params = "balance", []
+    for currency in currencies:
+        if currency not in CURRENCIES:
+            raise ValueError(f"Unknown currency {currency!r} (expected one of {', '.join(CURRENCIES)})")
+        if operation == "reset":
+            value_sql, value_params = "to_jsonb(0)", []
+        elif operation == "set":
+            value_sql, value_params = "to_jsonb(%s::numeric)", [amount]
+        elif operation == "adjust":
+            value_sql = "to_jsonb(coalesce((balance->>%s)::numeric, 0) + %s::numeric)"
+            value_params = [currency, amount]
+        else:
+            raise ValueError(f"Unknown operation {operation!r}")
+        expr = f"jsonb_set({expr}, ARRAY[%s], {value_sql}, true)"
+        params = params + [currency] + value_params
+    return expr, params
+
+
+def build_filter(username_like=None):
+    """Row filter shared by the chunk scan and the update. Returns (sql, params)."""
+    if username_like is None:
+        return "TRUE", []
+    return "username LIKE %s", [username_like]
+
+
+def default_job_name(operation, currencies, amount, username_like):
+    target = username_like if username_like is not None else "*"
+    value = "" if operation == "reset" else f"={amount}"
+    return f"{operation}{value}:{','.join(currencies)}:{target}"
+
+
+class BalanceJob:
+    """One resumable keyset pass over users, committing progress with every chunk."""
+
+    def __init__(self, conn, job, operation, currencies, amount=None, username_like=None,
+                 chunk_size=CHUNK_SIZE, sleep=SLEEP_SECONDS, max_rows_per_sec=None):
+        self.conn = conn
+        self.job = job
+        self.chunk_size = chunk_size
+        self.sleep = sleep
+        self.max_rows_per_sec = max_rows_per_sec
+        self.expr, self.expr_params = build_balance_expression(operation, currencies, amount)
+        self.filter, self.filter_params = build_filter(username_like)
+        # Resetting or setting a value that is already there would only create a dead tuple
+        self.skip_unchanged = operation in ("reset", "set")
+
+    def prepare(self, restart=False):
+        """
+        Create the progress table and the job row; returns the id to resume after.
+
+        Only an unfinished job is resumed. A job that already finished starts over
+        from the first id, so re-running a completed reset or adjust covers every user.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(JOBS_DDL)
+            if restart:
+                cur.execute("DELETE FROM balance_jobs WHERE job = %s", (self.job,))
+            cur.execute("INSERT INTO balance_jobs (job) VALUES (%s) ON CONFLICT (job) DO NOTHING", (self.job,))
+            cur.execute("""
+                UPDATE balance_jobs
+                SET last_id = CASE WHEN finished_at IS NULL THEN last_id ELSE 0 END,
+                    rows_updated = CASE WHEN finished_at IS NULL THEN rows_updated ELSE 0 END,
+                    started_at = CASE WHEN finished_at IS NULL THEN started_at ELSE now() END,
+                    finished_at = NULL
+                WHERE job = %s
+                RETURNING last_id
+            """, (self.job,))
+            last_id = cur.fetchone()[0]
+            cur.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        self.conn.commit()
+        return last_id
+
+    def count_remaining(self, after_id):
+        with self.conn.cursor() as cur:
+            cur.execute(f"SELECT count(*) FROM users WHERE id > %s AND {self.filter}",
+                        [after_id] + self.filter_params)
+            count = cur.fetchone()[0]
+        self.conn.rollback()
+        return count
+
+    def run_chunk(self):
+        """
+        Update the next chunk in its own short transaction.
+
+        Returns (last_id, rows_updated), or None when the job is finished.
+        """
+        with self.conn.cursor() as cur:
+            # Locking the job row keeps two runners of the same job from overlapping
+            cur.execute("SELECT last_id FROM balance_jobs WHERE job = %s FOR UPDATE", (self.job,))
+            last_id = cur.fetchone()[0]
+
+            cur.execute(f"""
+                SELECT max(id) FROM (
+                    SELECT id FROM users WHERE id > %s AND {self.filter} ORDER BY id LIMIT %s
+                ) chunk
+            """, [last_id] + self.filter_params + [self.chunk_size])
+            upper = cur.fetchone()[0]
+
+            if upper is None:
+                cur.execute("UPDATE balance_jobs SET finished_at = now(), updated_at = now() WHERE job = %s",
+                            (self.job,))
+                self.conn.commit()
+                return None
+
+            sql = f"UPDATE users SET balance = {self.expr} WHERE id > %s AND id <= %s AND {self.filter}"
+            params = self.expr_params + [last_id, upper] + self.filter_params
+            if self.skip_unchanged:
+                sql += f" AND balance IS DISTINCT FROM {self.expr}"
+                params += self.expr_params
+            cur.execute(sql, params)
+            updated = cur.rowcount
+
+            cur.execute("""
+                UPDATE balance_jobs
+                SET last_id = %s, rows_updated = rows_updated + %s, updated_at = now()
+                WHERE job = %s
+            """, (upper, updated, self.job))
+        self.conn.commit()
+        return upper, updated
+
+    def run(self, total=None):
+        scanned_target = total
+        started = time.perf_counter()
+        total_updated = 0
+        chunks = 0
+        retries = 0
+
+        while True:
+            chunk_started = time.perf_counter()
+            try:
+                result = self.run_chunk()
+            except errors.LockNotAvailable:
+                # A live game holds a row in this chunk; back off and retry the same chunk
+                self.conn.rollback()
+                retries += 1
+                if retries > MAX_LOCK_RETRIES:
+                    raise
+                time.sleep(min(max(self.sleep, 0.1) * 2 ** retries, 5))
+                continue
+            retries = 0
+
+            if result is None:
+                break
+            last_id, updated = result
+            chunks += 1
+            total_updated += updated
+
+            elapsed = time.perf_counter() - started
+            progress = f"chunk {chunks}: up to id {last_id}, {updated} updated ({total_updated} total"
+            if scanned_target:
+                progress += f", ~{min(chunks * self.chunk_size, scanned_target)}/{scanned_target} scanned"
+            print(progress + f", {total_updated / elapsed:.0f} rows/sec)")
+
+            # Throttle: fixed pause, plus whatever keeps us under the rate cap
+            pause = self.sleep
+            if self.max_rows_per_sec:
+                pause = max(pause, self.chunk_size / self.max_rows_per_sec - (time.perf_counter() - chunk_started))
+            if pause > 0:
+                time.sleep(pause)
+
+        return total_updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reset or adjust user balances in small keyset chunks")
+    parser.add_argument("operation", choices=("reset", "set", "adjust"))
+    parser.add_argument("--currency", nargs="+", default=list(CURRENCIES), choices=CURRENCIES,
+                        help="Currencies to change (default: all)")
+    parser.add_argument("--amount", type=Decimal,
+                        help="Value for set, or signed delta for adjust (exact decimal, e.g. 100 or -0.5)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--username-like", default=BULK_IMPORT_PATTERN,
+                        help="Only users whose username matches this LIKE pattern (default: bulk-imported users)")
+    target.add_argument("--all-users", action="store_true", help="Apply to every user")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per transaction")
+    parser.add_argument("--sleep", type=float, default=SLEEP_SECONDS, help="Seconds to pause between chunks")
+    parser.add_argument("--max-rows-per-sec", type=float, help="Cap the scan rate")
+    parser.add_argument("--job", help="Job name used to resume an interrupted run (default: derived from the operation)")
+    parser.add_argument("--restart", action="store_true", help="Forget saved progress and start from the first id")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the users that would be scanned")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    if args.operation in ("set", "adjust") and args.amount is None:
+        parser.error(f"{args.operation} needs --amount")
+
+    username_like = None if args.all_users else args.username_like
+    job_name = args.job or default_job_name(args.operation, args.currency, args.amount, username_like)
+
+    print("======================================")
+    print("  BULK BALANCE TOOL (PYTHON)         ")
+    print("======================================")
+
+    conn = psycopg2.connect(DB_URL)
+    try:
+        with profiled("bulk_balance", args.profile, args.profile_dir, args.profile_memory):
+            job = BalanceJob(conn, job_name, args.operation, args.currency, args.amount, username_like,
+                             args.chunk_size, args.sleep, args.max_rows_per_sec)
+            if args.dry_run:
+                print(f"{job.count_remaining(0)} users match; nothing was changed")
+                return
+
+            after_id = job.prepare(restart=args.restart)
+            remaining = job.count_remaining(after_id)
+            print(f"\nJob '{job_name}': resuming after id {after_id}, {remaining} users to scan")
+
+            updated = job.run(remaining)
+            print(f"\nUpdated balances for {updated} users")
+    except Exception as e:
+        conn.rollback()
+        print(f"Error updating balances: {e}")
+        print(f"Re-run the same command to resume job '{job_name}'")
+        sys.exit(1)
+    finally:
+        conn.close()
+        print("\nDatabase connection closed")
+
+
+if __name__ == "__main__":
+    main()
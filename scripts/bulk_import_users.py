@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import pandas as pd
 import psycopg2
@@ -6,9 +7,14 @@ import json
 import datetime
 import hashlib
 import secrets
+import sys
 import time
 from psycopg2.extras import Json
 
+from import_metrics import ImportMetrics, format_progress
+from profiling import add_profile_arguments, profiled
+from validate_import import run_dry_run
+
 # Get the database URL from environment variable
 db_url = os.environ.get('DATABASE_URL')
 
@@ -50,24 +56,41 @@ def get_existing_usernames(conn):
     cur.close()
     return existing_usernames
 
-def process_csv(file_path, conn, batch_size=50):
+def insert_batch(conn, insert_query, users_to_insert, metrics):
+    """Insert and commit one batch, timing both stages."""
+    with metrics.stage("insert"):
+        cur = conn.cursor()
+        cur.executemany(insert_query, users_to_insert)
+        cur.close()
+    with metrics.stage("commit"):
+        conn.commit()
+
+def process_csv(file_path, conn, batch_size=50, metrics=None):
     """Process the CSV file and import users to the database."""
+    metrics = metrics or ImportMetrics()
     try:
         # Read the CSV file
-        df = pd.read_csv(file_path)
+        with metrics.stage("parse"):
+            df = pd.read_csv(file_path)
+        metrics.set_total(len(df))
         print(f"Read {len(df)} rows from CSV")
 
         # Get existing phone numbers and usernames to avoid duplicates
-        existing_phones = get_existing_phones(conn)
-        existing_usernames = get_existing_usernames(conn)
+        with metrics.stage("dedup"):
+            existing_phones = get_existing_phones(conn)
+            existing_usernames = get_existing_usernames(conn)
         
         # Default password - everyone can login with any password
-        default_password = hash_password("password123")
+        with metrics.stage("hash"):
+            default_password = hash_password("password123")
         
         # Prepare for insertion
         users_to_insert = []
         skipped_count = 0
         total_inserted = 0
+        # Rows consumed and rows skipped since the last batch record
+        batch_rows = 0
+        batch_skipped = 0
         
         # Define the INSERT query
         insert_query = """
@@ -77,7 +100,14 @@ def process_csv(file_path, conn, batch_size=50):
         """
         
         # Process in batches for better performance
+        clock = time.perf_counter
+        last = clock()
         for _, row in df.iterrows():
+            # Time spent in iterrows itself is part of parsing
+            now = clock()
+            metrics.add("parse", now - last)
+            last = now
+            batch_rows += 1
             try:
                 # Get phone number and clean it
                 phone = str(row['Phone']).strip()
@@ -85,6 +115,10 @@ def process_csv(file_path, conn, batch_size=50):
                 # Skip if phone number already exists
                 if phone in existing_phones:
                     skipped_count += 1
+                    batch_skipped += 1
+                    now = clock()
+                    metrics.add("dedup", now - last)
+                    last = now
                     continue
                 
                 # User ID from CSV (used only for reference, not inserted as ID)
@@ -101,6 +135,9 @@ def process_csv(file_path, conn, batch_size=50):
                 
                 # Add the new username to our tracking set
                 existing_usernames.add(username)
+                now = clock()
+                metrics.add("dedup", now - last)
+                last = now
                 
                 # Process is_admin and is_banned columns
                 is_admin = row['Is Admin'].lower() == 'yes' if isinstance(row['Is Admin'], str) else False
@@ -137,40 +174,58 @@ def process_csv(file_path, conn, batch_size=50):
                 
                 # Add to existing phones set to avoid duplicates within this batch
                 existing_phones.add(phone)
+                now = clock()
+                metrics.add("transform", now - last)
+                last = now
                 
                 # Insert in smaller batches to improve performance
                 if len(users_to_insert) >= batch_size:
-                    cur = conn.cursor()
-                    cur.executemany(insert_query, users_to_insert)
-                    conn.commit()
-                    cur.close()
+                    insert_batch(conn, insert_query, users_to_insert, metrics)
                     
                     total_inserted += len(users_to_insert)
-                    print(f"Inserted batch of {len(users_to_insert)} users - Total: {total_inserted}")
+                    record = metrics.batch_done(batch_rows, inserted=len(users_to_insert), skipped=batch_skipped)
+                    print(f"Inserted batch of {len(users_to_insert)} users - Total: {total_inserted} "
+                          f"({format_progress(record)})")
                     users_to_insert = []
+                    batch_rows = 0
+                    batch_skipped = 0
+                    last = clock()
                 
             except Exception as e:
                 print(f"Error processing row {_}: {e}")
+                last = clock()
                 continue
         
         # Insert any remaining users
         if users_to_insert:
-            cur = conn.cursor()
-            cur.executemany(insert_query, users_to_insert)
-            conn.commit()
-            cur.close()
+            insert_batch(conn, insert_query, users_to_insert, metrics)
             
             total_inserted += len(users_to_insert)
             print(f"Inserted final batch of {len(users_to_insert)} users")
+        if batch_rows:
+            metrics.batch_done(batch_rows, inserted=len(users_to_insert), skipped=batch_skipped)
             
+        summary = metrics.summary(inserted=total_inserted, skipped=skipped_count)
         print(f"Successfully inserted {total_inserted} users")
         print(f"Skipped {skipped_count} users with existing phone numbers")
+        print(f"Throughput: {summary['rows_per_sec']} rows/sec, slowest stage: {summary['bottleneck']}")
         
     except Exception as e:
         print(f"Error processing CSV: {e}")
         conn.rollback()
 
-def main():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import users from the users CSV")
+    parser.add_argument("--csv", default='attached_assets/users - Sheet1.csv', help="CSV file to import")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Validate the whole CSV and write an error report without importing")
+    parser.add_argument("--errors", help="Where to write the per-row error file in --dry-run mode")
+    parser.add_argument("--metrics", help="Append per-batch stage metrics as JSON lines to this file")
+    parser.add_argument("--prometheus", help="Keep a Prometheus textfile with the current metrics at this path")
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
+def run(args):
     # Connect to the database
     conn = connect_to_db()
     if not conn:
@@ -178,10 +233,22 @@ def main():
     
     try:
         # Path to the CSV file
-        csv_file = 'attached_assets/users - Sheet1.csv'
+        csv_file = args.csv
+        
+        if args.dry_run:
+            # Validate only - nothing is written to the database
+            ok = run_dry_run(csv_file, conn, args.errors)
+            if not ok:
+                sys.exit(1)
+            return
         
         # Process the CSV file
-        process_csv(csv_file, conn)
+        metrics = ImportMetrics(jsonl_path=args.metrics, prometheus_path=args.prometheus,
+                                job="bulk_import_users")
+        try:
+            process_csv(csv_file, conn, metrics=metrics)
+        finally:
+            metrics.close()
         
     except Exception as e:
         print(f"Error in main function: {e}")
@@ -190,5 +257,11 @@ def main():
         conn.close()
         print("Database connection closed")
 
+def main():
+    args = parse_args()
+    with profiled("bulk_import_users", args.profile, args.profile_dir, args.profile_memory,
+                  near=args.metrics or args.csv):
+        run(args)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
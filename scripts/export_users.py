@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+"""
+User Export Tool
+Streams users out of Postgres with COPY ... TO STDOUT in the layout of the import sheet
+(`users - Sheet1.csv`), so exports can be edited and imported again. One currency of the
+JSONB balance is flattened into the Balance column. Output is CSV (optionally gzip, bzip2
+or xz compressed, by file extension) or Parquet, written as it streams in constant memory.
+"""
+
+import argparse
+import bz2
+import gzip
+import lzma
+import os
+import sys
+import threading
+import time
+
+import psycopg2
+
+from profiling import add_profile_arguments, profiled
+
+# Configuration
+CURRENCIES = ("INR", "BTC", "ETH", "USDT")
+COPY_BUFFER = 1 << 20        # bytes per read from the COPY stream
+COMPRESS_LEVEL = 3           # gzip/bzip2/xz level; higher is smaller but much slower
+PARQUET_BLOCK = 8 << 20      # CSV bytes per Parquet record batch (bounds memory)
+
+# Database connection from environment variables
+DB_URL = os.environ.get('DATABASE_URL')
+
+COMPRESSORS = {
+    ".gz": lambda path, level: gzip.open(path, "wb", compresslevel=level),
+    ".bz2": lambda path, level: bz2.open(path, "wb", compresslevel=max(level, 1)),
+    ".xz": lambda path, level: lzma.open(path, "wb", preset=level),
+}
+
+
+def build_export_query(cur, currency="INR", username_like=None, since=None, until=None,
+                       admin=None, banned=None):
+    """
+    The SELECT behind the COPY, in the sheet's column order, with filters bound client side.
+
+    Rows come newest first, like the sheet. COPY takes no parameters, so values
+    are inlined with mogrify.
+    """
+    if currency not in CURRENCIES:
+        raise ValueError(f"Unknown currency {currency!r} (expected one of {', '.join(CURRENCIES)})")
+    conditions, params = [], []
+    if username_like is not None:
+        conditions.append("username LIKE %s")
+        params.append(username_like)
+    if since is not None:
+        conditions.append("created_at >= %s")
+        params.append(since)
+    if until is not None:
+        conditions.append("created_at < %s")
+        params.append(until)
+    if admin is not None:
+        conditions.append("is_admin = %s")
+        params.append(admin)
+    if banned is not None:
+        conditions.append("is_banned = %s")
+        params.append(banned)
+    where = " AND ".join(conditions) or "TRUE"
+    query = f"""
+        SELECT id AS "ID",
+               username AS "Username",
+               coalesce((balance->>%s)::numeric, 0) AS "Balance",
+               phone AS "Phone",
+               CASE WHEN is_admin THEN 'Yes' ELSE 'No' END AS "Is Admin",
+               CASE WHEN is_banned THEN 'Yes' ELSE 'No' END AS "Is Banned",
+               to_char(created_at, 'FMMM/FMDD/YYYY') AS "Created At",
+               to_char(created_at, 'HH24:MI:SS') AS "Status"
+        FROM users
+        WHERE {where}
+        ORDER BY id DESC
+    """
+    return cur.mogrify(query, [currency] + params).decode()
+
+
+def copy_csv(conn, query, out):
+    """COPY the query as CSV with a header into a binary file object; returns the row count."""
+    with conn.cursor() as cur:
+        cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)", out, size=COPY_BUFFER)
+        rows = cur.rowcount
+    conn.rollback()
+    return rows
+
+
+def export_csv(conn, query, path, level=COMPRESS_LEVEL):
+    """Stream the export into a CSV file, compressed according to its extension."""
+    opener = COMPRESSORS.get(os.path.splitext(path)[1].lower())
+    with (opener(path, level) if opener else open(path, "wb")) as out:
+        return copy_csv(conn, query, out)
+
+
+def export_parquet(conn, query, path):
+    """
+    Stream the export into a Parquet file.
+
+    COPY writes into a pipe on a thread while pyarrow parses the other end in blocks
+    and appends each block as a record batch, so the table is never held in memory.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet output needs pyarrow (the 'parquet' extra); use a .csv or .csv.gz output instead")
+
+    read_fd, write_fd = os.pipe()
+    result = {}
+
+    def produce():
+        try:
+            with open(write_fd, "wb", buffering=COPY_BUFFER) as out:
+                result["rows"] = copy_csv(conn, query, out)
+        except BaseException as e:
+            result["error"] = e
+
+    producer = threading.Thread(target=produce, name="copy", daemon=True)
+    producer.start()
+    column_types = {"ID": pa.int64(), "Balance": pa.float64(), "Phone": pa.string(),
+                    "Username": pa.string(), "Created At": pa.string(), "Status": pa.string()}
+    writer = None
+    try:
+        with open(read_fd, "rb") as source:
+            reader = pa_csv.open_csv(source, read_options=pa_csv.ReadOptions(block_size=PARQUET_BLOCK),
+                                     convert_options=pa_csv.ConvertOptions(column_types=column_types))
+            for batch in reader:
+                if writer is None:
+                    writer = pq.ParquetWriter(path, batch.schema, compression="zstd")
+                writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+        producer.join()
+    if "error" in result:
+        raise result["error"]
+    if writer is None:
+        # No rows at all: still write an empty file with the sheet's columns
+        pq.write_table(pa.table({name: pa.array([], type=column_types.get(name, pa.string()))
+                                 for name in ("ID", "Username", "Balance", "Phone", "Is Admin", "Is Banned",
+                                              "Created At", "Status")}), path)
+    return result["rows"]
+
+
+def yes_no(value):
+    value = value.lower()
+    if value not in ("yes", "no"):
+        raise argparse.ArgumentTypeError("expected yes or no")
+    return value == "yes"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export users in the import sheet layout")
+    parser.add_argument("output", help="File to write: .csv, .csv.gz, .csv.bz2, .csv.xz or .parquet")
+    parser.add_argument("--currency", choices=CURRENCIES, default="INR",
+                        help="Balance currency written to the Balance column (default: %(default)s)")
+    parser.add_argument("--username-like", help="Only users whose username matches this LIKE pattern")
+    parser.add_argument("--since", help="Only users created at or after this timestamp")
+    parser.add_argument("--until", help="Only users created before this timestamp")
+    parser.add_argument("--admin", type=yes_no, help="yes/no: only admins, or only non-admins")
+    parser.add_argument("--banned", type=yes_no, help="yes/no: only banned, or only unbanned users")
+    parser.add_argument("--level", type=int, default=COMPRESS_LEVEL,
+                        help="Compression level for .gz/.bz2/.xz output (default: %(default)s)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    print("======================================")
+    print("  USER EXPORT TOOL                   ")
+    print("======================================")
+
+    conn = psycopg2.connect(DB_URL)
+    started = time.perf_counter()
+    try:
+        with conn.cursor() as cur:
+            query = build_export_query(cur, args.currency, args.username_like, args.since, args.until,
+                                       args.admin, args.banned)
+        with profiled("export_users", args.profile, args.profile_dir, args.profile_memory, near=args.output):
+            if args.output.lower().endswith(".parquet"):
+                rows = export_parquet(conn, query, args.output)
+            else:
+                rows = export_csv(conn, query, args.output, args.level)
+    except (ValueError, psycopg2.Error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(args.output)
+    print(f"Exported {rows:,} users to {args.output} ({size / 1e6:.1f} MB) in {elapsed:.1f}s "
+          f"({rows / elapsed if elapsed > 0 else 0:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,11 @@ Fast Bulk User Import Tool (Python version)
 Efficiently imports users from CSV with parallel processing
 """
 
+import argparse
 import os
 import csv
+import sys
+import time
 import hashlib
 import random
 import string
@@ -15,6 +18,10 @@ import psycopg2
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from import_metrics import ImportMetrics, format_progress
+from profiling import add_profile_arguments, profiled
+from validate_import import run_dry_run
+
 # Configuration
 CSV_PATH = "../attached_assets/users - Sheet1.csv"
 BATCH_SIZE = 50
@@ -55,15 +62,22 @@ def is_yes_value(value):
 
 # Process a batch of users
 def process_batch(batch, conn, cursor):
+    """Insert one batch on a worker connection; returns (imported, skipped, stage seconds of this batch)."""
     imported = 0
     skipped = 0
+    # Timed here rather than into the shared metrics, so each batch record gets its own worker's time
+    stages = {}
+    clock = time.perf_counter
     
     try:
         # Start transaction
         cursor.execute("BEGIN")
         
         # Use a standard password for all users
+        started = clock()
         standard_password = hash_password("password")
+        insert_started = clock()
+        stages["hash"] = insert_started - started
         
         # Process each user in the batch
         for user in batch:
@@ -109,8 +123,12 @@ def process_batch(batch, conn, cursor):
                 print(f"Error inserting user with phone {phone}: {e}")
                 skipped += 1
         
+        commit_started = clock()
+        stages["insert"] = commit_started - insert_started
+        
         # Commit transaction
         cursor.execute("COMMIT")
+        stages["commit"] = clock() - commit_started
         
     except Exception as e:
         # Rollback on error
@@ -119,16 +137,39 @@ def process_batch(batch, conn, cursor):
         skipped += len(batch)
         imported = 0
     
-    return imported, skipped
+    return imported, skipped, stages
 
-def main():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fast bulk user import")
+    parser.add_argument("--csv", help="CSV file to import (defaults to the attached users sheet)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Validate the whole CSV and write an error report without importing")
+    parser.add_argument("--errors", help="Where to write the per-row error file in --dry-run mode")
+    parser.add_argument("--metrics", help="Append per-batch stage metrics as JSON lines to this file")
+    parser.add_argument("--prometheus", help="Keep a Prometheus textfile with the current metrics at this path")
+    add_profile_arguments(parser)
+    return parser.parse_args()
+
+def run(args):
     print("======================================")
     print("  FAST BULK USER IMPORT TOOL (PYTHON) ")
     print("======================================")
     
+    csv_path = args.csv or os.path.join(os.path.dirname(os.path.abspath(__file__)), CSV_PATH)
+    
     # Connect to database
     conn = psycopg2.connect(DB_URL)
+    
+    if args.dry_run:
+        # Validate before any write transaction is opened
+        try:
+            ok = run_dry_run(csv_path, conn, args.errors)
+        finally:
+            conn.close()
+        sys.exit(0 if ok else 1)
+    
     cursor = conn.cursor()
+    metrics = ImportMetrics(jsonl_path=args.metrics, prometheus_path=args.prometheus, job="fast_import")
     
     try:
         # Get current user count
@@ -144,15 +185,15 @@ def main():
         """)
         
         # Populate with existing phones
-        cursor.execute("""
-            INSERT INTO existing_phones (phone)
-            SELECT phone FROM users
-        """)
+        with metrics.stage("dedup"):
+            cursor.execute("""
+                INSERT INTO existing_phones (phone)
+                SELECT phone FROM users
+            """)
         
         print("Loaded existing phone numbers to prevent duplicates")
         
         # Read CSV file
-        csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), CSV_PATH)
         print(f"\nReading CSV file from {csv_path}")
         
         valid_users = []
@@ -160,20 +201,25 @@ def main():
         invalid_count = 0
         
         with open(csv_path, 'r') as csvfile:
-            reader = csv.DictReader(csvfile)
-            total_rows = sum(1 for _ in reader)
-            
-            # Reset file pointer to start
-            csvfile.seek(0)
-            # Skip header row
-            next(csvfile)
-            
-            reader = csv.DictReader(csvfile)
+            with metrics.stage("parse"):
+                reader = csv.DictReader(csvfile)
+                total_rows = sum(1 for _ in reader)
+                
+                # Reset file pointer to start (DictReader reads the header row again)
+                csvfile.seek(0)
+                reader = csv.DictReader(csvfile)
+            metrics.set_total(total_rows)
             print(f"CSV file contains {total_rows} records")
             
             # Process each CSV record
+            clock = time.perf_counter
+            last = clock()
             for record in reader:
-                phone = record.get('Phone', '').strip()
+                now = clock()
+                metrics.add("parse", now - last)
+                last = now
+                
+                phone = (record.get('Phone') or '').strip()
                 
                 # Skip records with invalid phones
                 if not is_valid_phone(phone):
@@ -185,13 +231,19 @@ def main():
                 cursor.execute("SELECT 1 FROM existing_phones WHERE phone = %s", (phone,))
                 if cursor.fetchone():
                     duplicate_count += 1
+                    now = clock()
+                    metrics.add("dedup", now - last)
+                    last = now
                     continue
                 
                 # Add to our tracking table
                 cursor.execute("INSERT INTO existing_phones (phone) VALUES (%s)", (phone,))
+                now = clock()
+                metrics.add("dedup", now - last)
+                last = now
                 
                 # Prepare user data
-                username = record.get('Username', '').strip() or generate_username_from_phone(phone)
+                username = (record.get('Username') or '').strip() or generate_username_from_phone(phone)
                 is_admin = is_yes_value(record.get('Is Admin'))
                 is_banned = is_yes_value(record.get('Is Banned'))
                 
@@ -204,6 +256,13 @@ def main():
                     'is_banned': is_banned,
                     'referral_code': generate_referral_code()
                 })
+                now = clock()
+                metrics.add("transform", now - last)
+                last = now
+        
+        # The scan's parse/dedup/transform time gets its own record, with the rows it rejected
+        metrics.batch_done(duplicate_count + invalid_count, phase="scan",
+                           duplicates=duplicate_count, invalid=invalid_count)
         
         # Create batches for processing
         batches = []
@@ -231,12 +290,17 @@ def main():
                 futures.append((future, worker_conn, worker_cursor, batch_index + 1))
             
             # Process results as they complete
-            for future, worker_conn, worker_cursor, batch_num in futures:
-                imported, skipped = future.result()
+            for position, (future, worker_conn, worker_cursor, batch_num) in enumerate(futures):
+                imported, skipped, stages = future.result()
                 total_imported += imported
                 total_skipped += skipped
                 
-                print(f"Completed batch {batch_num}: {imported} imported, {skipped} skipped")
+                # Batches submitted but not finished yet
+                metrics.set_queue_depth("batches", len(futures) - position - 1)
+                record = metrics.batch_done(imported + skipped, stages=stages, imported=imported, failed=skipped)
+                
+                print(f"Completed batch {batch_num}: {imported} imported, {skipped} skipped "
+                      f"({format_progress(record)})")
                 
                 # Close worker connection
                 worker_cursor.close()
@@ -246,6 +310,9 @@ def main():
         cursor.execute("SELECT COUNT(*) FROM users")
         final_count = cursor.fetchone()[0]
         
+        summary = metrics.summary(imported=total_imported, duplicates=duplicate_count,
+                                  invalid=invalid_count, failed=total_skipped)
+        
         # Print summary report
         print("\n======================================")
         print("  IMPORT SUMMARY                     ")
@@ -257,6 +324,9 @@ def main():
         print(f"Duplicate phones:       {duplicate_count}")
         print(f"Invalid phone numbers:  {invalid_count}")
         print(f"Failed imports:         {total_skipped}")
+        print(f"Throughput:             {summary['rows_per_sec']} rows/sec")
+        print("Time per stage:         " + ", ".join(
+            f"{name} {seconds:.2f}s" for name, seconds in summary["stages"].items()))
         print("======================================")
         
         print("\nImport process complete!")
@@ -273,9 +343,16 @@ def main():
             pass
         
         # Close connections
+        metrics.close()
         cursor.close()
         conn.close()
         print("\nDatabase connection closed")
 
+def main():
+    args = parse_args()
+    with profiled("fast_import", args.profile, args.profile_dir, args.profile_memory,
+                  near=args.metrics or args.csv):
+        run(args)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
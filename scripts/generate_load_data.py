@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+
+"""
+Load-Test Data Generator
+Fills a database with synthetic users, bets and transactions shaped like shared/schema.ts,
+so slow queries and index regressions on large bets/transactions tables can be reproduced
+locally. Games come from client/src/games/index.ts and are picked in proportion to their
+player counts. Each game's outcomes follow its engine's rules (the NumPy samplers shared
+with rtp_simulator.py). Chunks of rows are generated and loaded with COPY, one
+transaction per chunk, by a pool of worker processes with a connection each.
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from math import comb
+
+import numpy as np
+import psycopg2
+
+from benchmark_imports import USERS_DDL, synthetic_phones
+from import_metrics import ImportMetrics, format_progress
+from profiling import add_profile_arguments, profiled
+from rtp_simulator import (LIMBO_HOUSE_EDGE, load_plinko_multipliers, load_slot_multipliers, random_numbers,
+                           slots_payouts, to_fixed_2)
+
+# Configuration
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAMES_TS = os.path.join(REPO_ROOT, "client", "src", "games", "index.ts")
+CHUNK_ROWS = 200_000
+DAYS = 90                 # history the generated rows are spread over, ending now
+PENDING_RATE = 0.02       # bets created but never completed
+BANNED_RATE = 0.01
+ACTIVITY_SKEW = 3.0       # higher puts more of the bets and transactions on fewer users
+MINES_TILES = 25
+
+# Outcome family per game slug; games not listed get a generic win/multiplier outcome at their RTP
+OUTCOME_FAMILIES = {
+    "dice": "dice", "dice-trading": "dice",
+    "limbo": "limbo",
+    "crash": "crash", "crash-car": "crash", "rocket-launch": "crash",
+    "plinko": "plinko",
+    "mines": "mines", "cricket-mines": "mines",
+    "slots": "slots",
+}
+DICE_TARGETS = np.array([10.0, 25.0, 49.5, 50.0, 75.0, 90.0])
+TARGET_MULTIPLIERS = np.array([1.1, 1.5, 2.0, 3.0, 5.0, 10.0, 100.0])  # limbo targets and crash cash-outs
+MINE_COUNTS = np.array([1, 3, 5, 10, 24])
+GENERIC_MULTIPLIERS = np.array([1.5, 2.0, 3.0, 5.0, 10.0])
+NULL = r"\N"             # COPY text format
+
+CURRENCIES = {"INR": (0.80, 1.0), "BTC": (0.08, 1 / 5e6), "ETH": (0.05, 1 / 2.5e5), "USDT": (0.07, 1 / 83)}  # share, per INR
+TRANSACTION_TYPES = {"deposit": 0.45, "withdrawal": 0.15, "bet_win": 0.25, "bet_loss": 0.15}
+DESCRIPTIONS = {"deposit": "Deposit via UPI", "withdrawal": "Withdrawal to bank account",
+                "bet_win": "Bet win", "bet_loss": "Bet loss"}
+
+# Database connection from environment variables
+DB_URL = os.environ.get('DATABASE_URL')
+
+GAMES_DDL = """
+CREATE TABLE IF NOT EXISTS games (
+    id serial PRIMARY KEY,
+    name text NOT NULL,
+    slug text NOT NULL UNIQUE,
+    type text NOT NULL,
+    active_players integer DEFAULT 0,
+    rtp real NOT NULL,
+    max_multiplier real NOT NULL,
+    min_bet real NOT NULL,
+    max_bet real NOT NULL,
+    image_url text
+)
+"""
+
+BETS_DDL = """
+CREATE TABLE IF NOT EXISTS bets (
+    id serial PRIMARY KEY,
+    user_id integer NOT NULL,
+    game_id integer NOT NULL,
+    amount real NOT NULL,
+    multiplier real,
+    profit real,
+    outcome jsonb NOT NULL,
+    server_seed text NOT NULL,
+    client_seed text NOT NULL,
+    nonce integer NOT NULL,
+    completed boolean DEFAULT false,
+    created_at timestamp NOT NULL DEFAULT now()
+)
+"""
+
+TRANSACTIONS_DDL = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id serial PRIMARY KEY,
+    user_id integer NOT NULL,
+    type varchar(20) NOT NULL,
+    amount real NOT NULL,
+    currency varchar(10) NOT NULL DEFAULT 'INR',
+    status varchar(20) NOT NULL,
+    txid varchar(100),
+    description text,
+    created_at timestamp NOT NULL DEFAULT now()
+)
+"""
+
+USER_COLUMNS = ("id", "username", "password", "is_admin", "is_banned", "balance", "created_at",
+                "email", "full_name", "phone", "referral_code", "language")
+BET_COLUMNS = ("id", "user_id", "game_id", "amount", "multiplier", "profit", "outcome",
+               "server_seed", "client_seed", "nonce", "completed", "created_at")
+TRANSACTION_COLUMNS = ("id", "user_id", "type", "amount", "currency", "status", "txid", "description", "created_at")
+COPY_COLUMNS = {"users": USER_COLUMNS, "bets": BET_COLUMNS, "transactions": TRANSACTION_COLUMNS}
+
+
+# Generate password hash (same format as fast-import.py)
+def hash_password(password):
+    salt = hashlib.md5(str(random.random()).encode()).hexdigest()
+    hashed = hashlib.sha512((password + salt).encode()).hexdigest()
+    return f"{hashed}.{salt}"
+
+
+def load_games(path=GAMES_TS):
+    """The GAMES list of the client as dicts, so new games are picked up without editing this file."""
+    with open(path) as f:
+        source = f.read()
+    games = []
+    for block in re.findall(r"\{\s*id:\s*\d+,(.*?)\n  \}", source, re.S):
+        fields = dict(re.findall(r"(\w+):\s*'([^']*)'", block))
+        numbers = {key: float(value) for key, value in re.findall(r"(\w+):\s*(-?[\d.]+|Infinity)", block)}
+        if "slug" in fields:
+            games.append({
+                "name": fields["name"], "slug": fields["slug"], "type": fields["type"],
+                "rtp": numbers.get("rtp", 99.0), "max_multiplier": numbers.get("maxMultiplier", 1000.0),
+                "min_bet": numbers.get("minBet", 0.00000001), "max_bet": numbers.get("maxBet", 100.0),
+                "active_players": int(numbers.get("activePlayers", 1)),
+            })
+    if not games:
+        raise ValueError(f"No GAMES found in {path}")
+    return games
+
+
+def hex_strings(rng, n, chars):
+    """n random lowercase hex strings of the given length."""
+    digits = rng.bytes(n * chars // 2).hex()
+    return [digits[i:i + chars] for i in range(0, len(digits), chars)]
+
+
+def timestamps(rng, n, start, span):
+    """n sorted timestamps in [start, start + span) seconds, so ids and created_at increase together."""
+    seconds = np.sort(rng.random(n)) * span
+    return (np.datetime64(int(start), "s") + seconds.astype("timedelta64[s]")).astype(str)
+
+
+def copy_text(chunk, columns):
+    """
+    A chunk ({column: values}) as COPY text-format rows.
+
+    Generated values never contain tabs, newlines or backslashes, so nothing needs
+    escaping; NaN floats become NULL.
+    """
+    fields = []
+    for column in columns:
+        values = chunk[column]
+        if isinstance(values, np.ndarray):
+            if values.dtype == bool:
+                values = np.where(values, "t", "f").tolist()
+            elif values.dtype.kind == "f":
+                values = [NULL if v != v else repr(v) for v in values.tolist()]
+            elif values.dtype.kind in "iu":
+                values = list(map(str, values.tolist()))
+            else:
+                values = values.tolist()
+        fields.append(values)
+    return "\n".join(map("\t".join, zip(*fields))) + "\n"
+
+
+def json_bool(values):
+    return np.where(values, "true", "false")
+
+
+# ---------------------------------------------------------------------------
+# Outcomes: (payout per unit staked, outcome JSON) for n completed bets
+# ---------------------------------------------------------------------------
+
+def dice_outcomes(rng, n, game, tables):
+    """DiceOutcome; pays 100 / target in both directions, as calculateDicePayout() does."""
+    target = rng.choice(DICE_TARGETS, n)
+    roll = to_fixed_2(random_numbers(rng, n) * 100)
+    win = np.where(rng.random(n) < 0.5, roll > target, roll < target)
+    payout = np.where(win, np.round(100 / target, 4), 0.0)
+    outcomes = [f'{{"target": {t}, "result": {r}, "win": {w}}}' for t, r, w in zip(target, roll, json_bool(win))]
+    return payout, outcomes
+
+
+def limbo_outcomes(rng, n, game, tables):
+    target = rng.choice(TARGET_MULTIPLIERS, n)
+    # The server result for a random of 0 is Infinity, which JSON can't hold
+    result = to_fixed_2(1 / (np.maximum(random_numbers(rng, n), 1e-9) * (1 - LIMBO_HOUSE_EDGE)))
+    win = result >= target
+    payout = np.where(win, target, 0.0)
+    outcomes = [f'{{"targetMultiplier": {t}, "result": {r}, "win": {w}}}'
+                for t, r, w in zip(target, result, json_bool(win))]
+    return payout, outcomes
+
+
+def crash_outcomes(rng, n, game, tables):
+    """CrashOutcome; crashPoint as calculateCrashPoint() derives it."""
+    cashout = rng.choice(TARGET_MULTIPLIERS, n)
+    crash_point = to_fixed_2(np.maximum(1, 1 / (1 - random_numbers(rng, n) * 0.99)))
+    win = crash_point >= cashout
+    payout = np.where(win, cashout, 0.0)
+    outcomes = [f'{{"crashPoint": {c}, "cashoutAt": {a}, "win": {w}}}'
+                for c, a, w in zip(crash_point, cashout, json_bool(win))]
+    return payout, outcomes
+
+
+def plinko_outcomes(rng, n, game, tables):
+    """PlinkoOutcome; the path is the running slot after each row, as generatePlinkoPath() records it."""
+    plinko = tables["plinko"]
+    risks = np.array(sorted(plinko))
+    risk = rng.choice(risks, n)
+    rows = rng.integers(8, 17, n)
+    payout = np.zeros(n)
+    outcomes = np.empty(n, dtype=object)
+    for risk_name in risks:
+        for row_count in np.unique(rows):
+            index = np.flatnonzero((risk == risk_name) & (rows == row_count))
+            if not len(index):
+                continue
+            bits = rng.integers(0, 1 << int(row_count), size=len(index), dtype=np.uint32)
+            paths = ((bits[:, None] >> np.arange(row_count, dtype=np.uint32)) & 1).cumsum(axis=1)
+            payout[index] = plinko[risk_name][int(row_count)][paths[:, -1]]
+            outcomes[index] = [f'{{"path": [{",".join(map(str, path))}], "multiplier": {m}, '
+                               f'"risk": "{risk_name}", "rows": {row_count}}}'
+                               for path, m in zip(paths.tolist(), payout[index])]
+    return payout, list(outcomes)
+
+
+def mines_outcomes(rng, n, game, tables):
+    """MinesOutcome; a loss stops at the first mine revealed, a win cashes out at the fair multiplier."""
+    mines = rng.choice(MINE_COUNTS, n)
+    payout = np.zeros(n)
+    outcomes = np.empty(n, dtype=object)
+    for mine_count in np.unique(mines):
+        index = np.flatnonzero(mines == mine_count)
+        m = len(index)
+        gems = int(rng.integers(1, min(8, MINES_TILES - mine_count) + 1))
+        board = np.argsort(rng.random((m, MINES_TILES)), axis=1)[:, :mine_count]
+        picks = np.argsort(rng.random((m, MINES_TILES)), axis=1)[:, :gems]
+        is_mine = np.zeros((m, MINES_TILES), dtype=bool)
+        np.put_along_axis(is_mine, board, True, axis=1)
+        hits = np.take_along_axis(is_mine, picks, axis=1)
+        win = ~hits.any(axis=1)
+        revealed = np.where(win, gems, hits.argmax(axis=1) + 1)
+        multiplier = round(comb(MINES_TILES, gems) / comb(MINES_TILES - int(mine_count), gems), 2)
+        payout[index] = np.where(win, multiplier, 0.0)
+        outcomes[index] = [f'{{"minePositions": [{",".join(map(str, sorted(b)))}], '
+                           f'"revealedPositions": [{",".join(map(str, p[:r]))}], "win": {w}}}'
+                           for b, p, r, w in zip(board.tolist(), picks.tolist(), revealed, json_bool(win))]
+    return payout, list(outcomes)
+
+
+def slots_outcomes(rng, n, game, tables):
+    payout = slots_payouts(rng, n, None, tables["slots"])
+    return payout, [f'{{"win": {w}, "multiplier": {m}}}' for m, w in zip(payout, json_bool(payout > 0))]
+
+
+def generic_outcomes(rng, n, game, tables):
+    """A fixed multiplier won with probability rtp / multiplier, so the game returns its advertised RTP."""
+    choices = GENERIC_MULTIPLIERS[GENERIC_MULTIPLIERS <= game["max_multiplier"]]
+    multiplier = rng.choice(choices if len(choices) else GENERIC_MULTIPLIERS[:1], n)
+    win = rng.random(n) < game["rtp"] / 100 / multiplier
+    payout = np.where(win, multiplier, 0.0)
+    return payout, [f'{{"win": {w}, "multiplier": {m}}}' for m, w in zip(multiplier, json_bool(win))]
+
+
+OUTCOMES = {
+    "dice": dice_outcomes,
+    "limbo": limbo_outcomes,
+    "crash": crash_outcomes,
+    "plinko": plinko_outcomes,
+    "mines": mines_outcomes,
+    "slots": slots_outcomes,
+    "generic": generic_outcomes,
+}
+
+
+# ---------------------------------------------------------------------------
+# Chunks
+# ---------------------------------------------------------------------------
+
+def pick_users(rng, user_ids, n):
+    """User ids for n rows, skewed so a few heavy players own a large share of the activity."""
+    return user_ids[(rng.random(n) ** ACTIVITY_SKEW * len(user_ids)).astype(np.int64)]
+
+
+def user_chunk(rng, ids, prefix, password, start, span):
+    n = len(ids)
+    usernames = np.char.add(f"{prefix}_", ids.astype(str))
+    inr = np.round(rng.lognormal(6, 2, n), 2)
+    alphabet = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"))
+    referral_codes = alphabet[rng.integers(0, len(alphabet), (n, 8))].view("U8").ravel()
+    return {
+        "id": ids,
+        "username": usernames,
+        "password": [password] * n,
+        "is_admin": np.zeros(n, dtype=bool),
+        "is_banned": rng.random(n) < BANNED_RATE,
+        "balance": [f'{{"INR": {b}, "BTC": 0, "ETH": 0, "USDT": 0}}' for b in inr],
+        "created_at": timestamps(rng, n, start, span),
+        "email": np.char.add(usernames, "@example.com"),
+        "full_name": usernames,
+        "phone": synthetic_phones(ids).astype(str),
+        "referral_code": referral_codes,
+        "language": ["English"] * n,
+    }
+
+
+def bet_chunk(rng, ids, user_ids, games, game_ids, tables, start, span):
+    n = len(ids)
+    weights = np.array([game["active_players"] for game in games], dtype=float)
+    game_index = rng.choice(len(games), n, p=weights / weights.sum())
+    completed = rng.random(n) >= PENDING_RATE
+    amount = np.round(np.clip(rng.lognormal(3, 1.5, n), 1, 100_000), 2)
+
+    payout = np.full(n, np.nan)
+    outcomes = np.full(n, "{}", dtype=object)
+    for i, game in enumerate(games):
+        index = np.flatnonzero((game_index == i) & completed)
+        if len(index):
+            family = OUTCOME_FAMILIES.get(game["slug"], "generic")
+            payout[index], outcomes[index] = OUTCOMES[family](rng, len(index), game, tables)
+
+    return {
+        "id": ids,
+        "user_id": pick_users(rng, user_ids, n),
+        "game_id": game_ids[game_index],
+        "amount": amount,
+        "multiplier": payout,
+        "profit": np.round(amount * payout - amount, 2),
+        "outcome": outcomes,
+        "server_seed": hex_strings(rng, n, 64),
+        "client_seed": hex_strings(rng, n, 16),
+        "nonce": rng.integers(0, 100_000, n),
+        "completed": completed,
+        "created_at": timestamps(rng, n, start, span),
+    }
+
+
+def transaction_chunk(rng, ids, user_ids, start, span):
+    n = len(ids)
+    types = np.array(list(TRANSACTION_TYPES))
+    kind = rng.choice(types, n, p=list(TRANSACTION_TYPES.values()))
+    currencies = np.array(list(CURRENCIES))
+    shares, rates = zip(*CURRENCIES.values())
+    currency_index = rng.choice(len(currencies), n, p=shares)
+    amount_inr = np.clip(rng.lognormal(6.5, 1.5, n), 10, 5_000_000)
+    amount = np.round(amount_inr * np.array(rates)[currency_index], 8)
+
+    # Withdrawals wait for an admin, so they are the ones left pending
+    roll = rng.random(n)
+    withdrawal = kind == "withdrawal"
+    status = np.where(roll < 0.03, "failed", "completed")
+    status = np.where(withdrawal & (roll >= 0.03) & (roll < 0.18), "pending", status)
+    external = withdrawal | (kind == "deposit")
+    txid = np.where(external, np.array(hex_strings(rng, n, 32)), NULL)
+
+    return {
+        "id": ids,
+        "user_id": pick_users(rng, user_ids, n),
+        "type": kind,
+        "amount": amount,
+        "currency": currencies[currency_index],
+        "status": status,
+        "txid": txid,
+        "description": [DESCRIPTIONS[k] for k in kind],
+        "created_at": timestamps(rng, n, start, span),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Database
+# ---------------------------------------------------------------------------
+
+def prepare_tables(conn, games):
+    """Create any missing table from the schema and make sure every game has a row; returns {slug: id}."""
+    with conn.cursor() as cur:
+        cur.execute(USERS_DDL.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1))
+        for ddl in (GAMES_DDL, BETS_DDL, TRANSACTIONS_DDL):
+            cur.execute(ddl)
+        cur.executemany("""
+            INSERT INTO games (name, slug, type, active_players, rtp, max_multiplier, min_bet, max_bet)
+            VALUES (%(name)s, %(slug)s, %(type)s, %(active_players)s, %(rtp)s, %(max_multiplier)s,
+                    %(min_bet)s, %(max_bet)s)
+            ON CONFLICT (slug) DO NOTHING
+        """, games)
+        cur.execute("SELECT slug, id FROM games WHERE slug = ANY(%s)", ([game["slug"] for game in games],))
+        ids = dict(cur.fetchall())
+    conn.commit()
+    return ids
+
+
+def reserve_ids(conn, table, n):
+    """
+    Take n ids from a table's sequence, in increasing order.
+
+    Users are reserved up front so generated bets can reference them before they
+    are loaded; bets and transactions chunk by chunk in time order, so ids follow
+    created_at even though chunks commit out of order.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)", (table, n))
+        ids = np.array([row[0] for row in cur.fetchall()], dtype=np.int64)
+    conn.commit()
+    return ids
+
+
+def existing_user_ids(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM users ORDER BY id")
+        ids = np.array([row[0] for row in cur.fetchall()], dtype=np.int64)
+    conn.rollback()
+    return ids
+
+
+# Per worker process: its connection and what every chunk needs (set by init_worker)
+_worker = {}
+
+
+def init_worker(db_url, context):
+    _worker["conn"] = psycopg2.connect(db_url)
+    _worker["context"] = context
+
+
+def make_chunk(table, rng, ids, start, span):
+    """Generate the rows with these ids; start/span is the slice of the time range they share."""
+    ctx = _worker["context"]
+    if table == "users":
+        return user_chunk(rng, ids, ctx["prefix"], ctx["password"], start, span)
+    if table == "bets":
+        return bet_chunk(rng, ids, ctx["user_ids"], ctx["games"], ctx["game_ids"], ctx["tables"], start, span)
+    return transaction_chunk(rng, ids, ctx["user_ids"], start, span)
+
+
+def load_chunk(task):
+    """
+    Generate one chunk and COPY it in its own transaction, in a worker process.
+
+    Returns (rows, seconds generating, seconds copying, seconds committing).
+    """
+    table, columns, ids, seed, start, span = task
+    conn = _worker["conn"]
+    started = time.perf_counter()
+    text = copy_text(make_chunk(table, np.random.default_rng(seed), ids, start, span), columns)
+    generated = time.perf_counter()
+    try:
+        with conn.cursor() as cur:
+            cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", io.StringIO(text), size=1 << 20)
+        copied = time.perf_counter()
+        conn.commit()
+    except Exception:
+        # Leave the connection usable for this worker's next chunk
+        conn.rollback()
+        raise
+    return len(ids), generated - started, copied - generated, time.perf_counter() - copied
+
+
+def load_table(pool, conn, jobs, table, columns, total, seed, start, span, chunk_rows=CHUNK_ROWS, metrics=None,
+               ids=None):
+    """
+    Load total generated rows into table across the worker pool, one COPY transaction per chunk.
+
+    Chunk k covers the k-th slice of the time range and gets the next block of ids
+    (ids, when given, or reserved from the table's sequence as the chunk is queued),
+    so created_at grows with the id across the table whatever order chunks commit
+    in. Returns the rows loaded.
+    """
+    metrics = metrics or ImportMetrics(job=f"load_{table}")
+    metrics.set_total(total)
+    table_key = list(COPY_COLUMNS).index(table)
+
+    def tasks():
+        for offset in range(0, total, chunk_rows):
+            n = min(chunk_rows, total - offset)
+            chunk_ids = ids[offset:offset + n] if ids is not None else reserve_ids(conn, table, n)
+            yield (table, columns, chunk_ids,
+                   np.random.SeedSequence(seed, spawn_key=(table_key, offset // chunk_rows)),
+                   start + span * offset / total, span * n / total)
+
+    loaded = 0
+
+    def collect(futures):
+        nonlocal loaded
+        for future in futures:
+            rows, generate_s, copy_s, commit_s = future.result()
+            metrics.add("transform", generate_s)
+            metrics.add("insert", copy_s)
+            metrics.add("commit", commit_s)
+            metrics.set_queue_depth("chunks", len(pending))
+            loaded += rows
+            record = metrics.batch_done(rows, table=table)
+            print(f"{table}: {format_progress(record)}")
+
+    pending = set()
+    for task in tasks():
+        pending.add(pool.submit(load_chunk, task))
+        # Keep one chunk per worker queued so a worker never waits for its next task
+        while len(pending) > 2 * jobs:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(finished)
+    while pending:
+        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+        collect(finished)
+    return loaded
+
+
+def generate(conn, users, bets, transactions, seed=None, prefix=None, days=DAYS, jobs=None,
+             chunk_rows=CHUNK_ROWS, metrics_path=None, prometheus_path=None):
+    """Generate and load everything; returns {table: (rows, seconds)}."""
+    jobs = jobs or os.cpu_count()
+    games = load_games()
+    game_ids_by_slug = prepare_tables(conn, games)
+    new_user_ids = reserve_ids(conn, "users", users) if users else np.array([], dtype=np.int64)
+    user_ids = new_user_ids if users else existing_user_ids(conn)
+    if (bets or transactions) and not len(user_ids):
+        raise ValueError("No users to attach bets and transactions to; pass --users")
+
+    context = {
+        "games": games,
+        "game_ids": np.array([game_ids_by_slug[game["slug"]] for game in games], dtype=np.int64),
+        "tables": {"plinko": load_plinko_multipliers(), "slots": load_slot_multipliers()},
+        "user_ids": user_ids,
+        "prefix": prefix or f"load{int(time.time())}",
+        # One hash for everyone, as the importers do
+        "password": hash_password("password"),
+    }
+    seed = seed if seed is not None else np.random.SeedSequence().entropy
+    span = days * 86400
+    start = time.time() - span
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(DB_URL, context)) as pool:
+        for table, total in (("users", users), ("bets", bets), ("transactions", transactions)):
+            if not total:
+                continue
+            metrics = ImportMetrics(jsonl_path=metrics_path, prometheus_path=prometheus_path, job=f"load_{table}")
+            started = time.perf_counter()
+            try:
+                rows = load_table(pool, conn, jobs, table, COPY_COLUMNS[table], total, seed, start, span,
+                                  chunk_rows, metrics, new_user_ids if table == "users" else None)
+                metrics.summary(table=table)
+            finally:
+                metrics.close()
+            results[table] = (rows, time.perf_counter() - started)
+
+    # Fresh planner statistics, so query plans match a real table of this size
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        for table in results:
+            cur.execute(f"ANALYZE {table}")
+    conn.autocommit = False
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill a database with synthetic users, bets and transactions")
+    parser.add_argument("--users", type=int, default=100_000,
+                        help="Users to create (0 = attach bets and transactions to the existing users)")
+    parser.add_argument("--bets", type=int, default=1_000_000, help="Bets to create")
+    parser.add_argument("--transactions", type=int, default=300_000, help="Transactions to create")
+    parser.add_argument("--days", type=int, default=DAYS, help="History to spread the rows over, ending now")
+    parser.add_argument("--prefix", help="Username prefix for the generated users (default: load<timestamp>)")
+    parser.add_argument("--seed", type=int, help="Random seed, for a reproducible data set")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="Worker processes, each generating chunks and loading them over its own connection")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows per COPY transaction")
+    parser.add_argument("--metrics", help="Append per-chunk stage metrics as JSON lines to this file")
+    parser.add_argument("--prometheus", help="Keep a Prometheus textfile with the current metrics at this path")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    print("======================================")
+    print("  LOAD-TEST DATA GENERATOR           ")
+    print("======================================")
+
+    conn = psycopg2.connect(DB_URL)
+    try:
+        with profiled("generate_load_data", args.profile, args.profile_dir, args.profile_memory,
+                      near=args.metrics):
+            results = generate(conn, args.users, args.bets, args.transactions, args.seed, args.prefix,
+                               args.days, args.jobs, args.chunk_rows, args.metrics, args.prometheus)
+    except (ValueError, psycopg2.Error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    print("\n======================================")
+    print("  LOAD SUMMARY                       ")
+    print("======================================")
+    for table, (rows, seconds) in results.items():
+        print(f"{table:<14}{rows:>12,} rows in {seconds:6.1f}s ({rows / seconds:,.0f} rows/sec)")
+    print("======================================")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@
 
 """
 User Import Tool Wrapper Script (Python version)
-This script runs the fast-import.py script and then the batch-update-referrals.mjs script
+This script runs fast-import.py, resets the imported balances with bulk_balance.py
+and then runs the batch-update-referrals.mjs script
 """
 
 import os
@@ -15,14 +16,23 @@ print("======================================")
 
 scripts_dir = os.path.dirname(os.path.abspath(__file__))
 
+# Extra arguments (e.g. --csv PATH) are passed through to the import step
+import_args = sys.argv[1:]
+
 try:
+    if "--dry-run" in import_args:
+        # Only validate the CSV, nothing is imported or reset
+        print("\nDry run: validating the CSV without importing...")
+        subprocess.run(["python3", os.path.join(scripts_dir, "fast-import.py")] + import_args, check=True)
+        sys.exit(0)
+    
     # Run the Python import script
     print("\nStep 1: Running bulk user import (Python version)...")
-    subprocess.run(["python3", os.path.join(scripts_dir, "fast-import.py")], check=True)
+    subprocess.run(["python3", os.path.join(scripts_dir, "fast-import.py")] + import_args, check=True)
     
-    # Reset all balances to zero
+    # Reset all balances to zero (chunked, so live games are not blocked)
     print("\nStep 2: Resetting user balances to zero...")
-    subprocess.run(["node", os.path.join(scripts_dir, "reset-balances.js")], check=True)
+    subprocess.run(["python3", os.path.join(scripts_dir, "bulk_balance.py"), "reset"], check=True)
     
     # Run the referral code generator (Node.js script)
     print("\nStep 3: Generating referral codes for users...")
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+
+"""
+User Import Daemon
+A resident importer: watches an inbox directory (inotify on Linux, polling elsewhere)
+and imports every users CSV dropped into it, with the same rules as fast-import.py.
+The connection pool, the password hash and the set of phones and usernames already in
+the database stay warm between files, so a small partner upload costs only its own rows.
+Imported users get a zero balance and a referral code on insert, so the reset and
+referral steps of import-script.py are not needed for them.
+"""
+
+import argparse
+import csv
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import queue
+import random
+import select
+import signal
+import string
+import struct
+import threading
+import time
+import traceback
+
+import psycopg2
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+from import_metrics import ImportMetrics, format_progress
+from profiling import add_profile_arguments, profiled
+
+# Configuration
+INBOX_DIR = "../attached_assets/inbox"
+BATCH_SIZE = 1000
+WORKERS = 2               # files imported at the same time
+POLL_SECONDS = 2.0        # directory scan interval when inotify is unavailable
+IGNORED_SUFFIXES = (".part", ".tmp", ".crdownload")
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")
+
+# Database connection from environment variables
+DB_URL = os.environ.get('DATABASE_URL')
+
+
+# Generate password hash (same format as fast-import.py)
+def hash_password(password):
+    salt = hashlib.md5(str(random.random()).encode()).hexdigest()
+    hashed = hashlib.sha512((password + salt).encode()).hexdigest()
+    return f"{hashed}.{salt}"
+
+
+def generate_referral_code():
+    chars = string.ascii_uppercase + string.digits
+    return ''.join(random.choice(chars) for _ in range(8))
+
+
+def is_valid_phone(phone):
+    return phone.isdigit() and len(phone) == 10
+
+
+def is_yes_value(value):
+    return (value or '').lower().strip() in ('yes', 'true', '1')
+
+
+# ---------------------------------------------------------------------------
+# Inbox
+# ---------------------------------------------------------------------------
+
+def is_import_file(name):
+    return name.lower().endswith(".csv") and not name.startswith(".") and not name.endswith(IGNORED_SUFFIXES)
+
+
+def arrival_name(name):
+    """A unique processing/ name: the arrival time (to the nanosecond) before the uploaded name."""
+    now = time.time_ns()
+    return f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now // 10**9))}-{now % 10**9:09d}-{name}"
+
+
+def uploaded_name(path):
+    """The name a file was uploaded as, without the arrival prefix."""
+    parts = os.path.basename(path).split("-", 3)
+    if len(parts) == 4 and all(part.isdigit() for part in parts[:3]):
+        return parts[3]
+    return os.path.basename(path)
+
+
+class InotifyWatcher:
+    """Reports files finished in a directory: closed after writing, or renamed into it."""
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.path = path
+
+    def wait(self, timeout):
+        """Names of the files that arrived within timeout seconds; None means rescan everything."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        names, offset = [], 0
+        while offset < len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            if mask & IN_Q_OVERFLOW:
+                return None
+            names.append(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback for platforms without inotify: a file counts once its size stops changing."""
+
+    def __init__(self, path, interval=POLL_SECONDS):
+        self.path = path
+        self.interval = interval
+        self.sizes = {}
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        sizes = {entry.name: entry.stat().st_size for entry in os.scandir(self.path) if entry.is_file()}
+        stable = [name for name, size in sizes.items() if self.sizes.get(name) == size]
+        self.sizes = sizes
+        return stable
+
+    def close(self):
+        pass
+
+
+def make_watcher(path):
+    try:
+        watcher = InotifyWatcher(path)
+        print(f"Watching {path} with inotify")
+    except (OSError, AttributeError, TypeError):
+        watcher = PollingWatcher(path)
+        print(f"inotify unavailable, polling {path} every {watcher.interval}s")
+    return watcher
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+class DedupeState:
+    """
+    Phones and usernames already taken, shared by every import thread.
+
+    Loaded once at startup and then kept current from the users.id high-water mark,
+    so users created by the app between files are seen too. Rows are reserved under
+    the lock before they are inserted, so two files can't import the same phone.
+    """
+
+    def __init__(self):
+        self.phones = set()
+        self.usernames = set()
+        self.last_id = 0
+        self.lock = threading.Lock()
+
+    def refresh(self, conn):
+        """Pick up users inserted since the last refresh; returns how many were new."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT id, phone, username FROM users WHERE id > %s", (self.last_id,))
+            rows = cur.fetchall()
+        conn.rollback()
+        with self.lock:
+            for user_id, phone, username in rows:
+                self.phones.add(phone)
+                self.usernames.add(username)
+                self.last_id = max(self.last_id, user_id)
+        return len(rows)
+
+    def reserve(self, users):
+        """Split users into (reserved, duplicate phones, taken usernames)."""
+        reserved, duplicates, taken = [], 0, 0
+        with self.lock:
+            for user in users:
+                if user['phone'] in self.phones:
+                    duplicates += 1
+                elif user['username'] in self.usernames:
+                    taken += 1
+                else:
+                    self.phones.add(user['phone'])
+                    self.usernames.add(user['username'])
+                    reserved.append(user)
+        return reserved, duplicates, taken
+
+    def release(self, users):
+        with self.lock:
+            for user in users:
+                self.phones.discard(user['phone'])
+                self.usernames.discard(user['username'])
+
+
+def read_users(path):
+    """Yield (users, invalid) per BATCH_SIZE rows of a users CSV."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        reader.fieldnames = [(name or "").strip() for name in reader.fieldnames or []]
+        if "Phone" not in reader.fieldnames:
+            raise ValueError(f"No Phone column (columns: {', '.join(reader.fieldnames)})")
+        users, invalid = [], 0
+        for record in reader:
+            phone = (record.get('Phone') or '').strip()
+            if not is_valid_phone(phone):
+                invalid += 1
+                continue
+            username = (record.get('Username') or '').strip() or f"user_{phone[-6:]}"
+            users.append({
+                'username': username,
+                'phone': phone,
+                'is_admin': is_yes_value(record.get('Is Admin')),
+                'is_banned': is_yes_value(record.get('Is Banned')),
+            })
+            if len(users) == BATCH_SIZE:
+                yield users, invalid
+                users, invalid = [], 0
+        if users or invalid:
+            yield users, invalid
+
+
+class ImportDaemon:
+    """Imports queued inbox files on a few threads sharing one pool and one DedupeState."""
+
+    def __init__(self, inbox, workers=WORKERS, metrics=None):
+        self.inbox = inbox
+        self.workers = workers
+        self.metrics = metrics or ImportMetrics(job="import_daemon")
+        self.pool = ThreadedConnectionPool(1, workers + 1, DB_URL)
+        self.dedupe = DedupeState()
+        self.queue = queue.Queue()
+        self.stopping = threading.Event()
+        self.password = hash_password("password")
+        self.balance = json.dumps({"INR": 0, "BTC": 0, "ETH": 0, "USDT": 0})
+        for name in ("processing", "done", "failed"):
+            os.makedirs(os.path.join(inbox, name), exist_ok=True)
+
+    def warm_up(self):
+        conn = self.pool.getconn()
+        try:
+            with self.metrics.stage("dedup"):
+                loaded = self.dedupe.refresh(conn)
+        finally:
+            self.pool.putconn(conn)
+        print(f"Loaded {loaded} existing users for de-duplication")
+
+    def enqueue(self, name):
+        """Move an arrived file into processing/ and queue it; returns False if it is gone or not a CSV."""
+        if not is_import_file(name):
+            return False
+        source = os.path.join(self.inbox, name)
+        # A unique name, so a second upload of the same name never replaces a queued copy
+        target = os.path.join(self.inbox, "processing", arrival_name(name))
+        while os.path.exists(target):
+            target = os.path.join(self.inbox, "processing", arrival_name(name))
+        try:
+            os.replace(source, target)
+        except FileNotFoundError:
+            return False
+        self.queue.put(target)
+        print(f"Queued {name}")
+        return True
+
+    def enqueue_existing(self):
+        """Queue files left in processing/ by a previous run, then everything waiting in the inbox."""
+        processing = os.path.join(self.inbox, "processing")
+        for name in sorted(os.listdir(processing)):
+            if is_import_file(name):
+                # Rows committed before the interruption are skipped as duplicates
+                self.queue.put(os.path.join(processing, name))
+                print(f"Re-queued interrupted {uploaded_name(name)}")
+        for name in sorted(os.listdir(self.inbox)):
+            if os.path.isfile(os.path.join(self.inbox, name)):
+                self.enqueue(name)
+
+    def import_batch(self, conn, users):
+        """Insert one batch of reserved users; returns the users that were not inserted."""
+        with conn.cursor() as cur:
+            inserted = execute_values(cur, """
+                INSERT INTO users (
+                    username, full_name, phone, password,
+                    email, balance, created_at,
+                    is_admin, is_banned, referral_code
+                ) VALUES %s
+                ON CONFLICT DO NOTHING
+                RETURNING phone
+            """, [(u['username'], u['username'], u['phone'], self.password,
+                   f"{u['phone']}@example.com", self.balance, u['is_admin'], u['is_banned'],
+                   generate_referral_code()) for u in users],
+                template="(%s, %s, %s, %s, %s, %s::jsonb, now(), %s, %s, %s)", fetch=True)
+        inserted = {phone for phone, in inserted}
+        return [u for u in users if u['phone'] not in inserted]
+
+    def import_file(self, path):
+        """Import one queued file and move it to done/ or failed/ with a summary next to it."""
+        name = uploaded_name(path)
+        if not os.path.exists(path):
+            print(f"Skipping {name}: {path} is gone (already handled)")
+            return None
+        counts = {"imported": 0, "duplicates": 0, "invalid": 0, "failed": 0}
+        started = time.perf_counter()
+        conn = self.pool.getconn()
+        error = None
+        try:
+            with self.metrics.stage("dedup"):
+                self.dedupe.refresh(conn)
+            clock = time.perf_counter
+            last = clock()
+            for users, invalid in read_users(path):
+                now = clock()
+                self.metrics.add("parse", now - last)
+                with self.metrics.stage("dedup"):
+                    reserved, duplicates, taken = self.dedupe.reserve(users)
+                rejected = []
+                if reserved:
+                    try:
+                        with self.metrics.stage("insert"):
+                            rejected = self.import_batch(conn, reserved)
+                        with self.metrics.stage("commit"):
+                            conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        self.dedupe.release(reserved)
+                        raise
+                    # Taken by a row the refresh hadn't seen yet (e.g. a duplicate email)
+                    self.dedupe.release(rejected)
+
+                batch = {"imported": len(reserved) - len(rejected), "duplicates": duplicates,
+                         "invalid": invalid, "failed": taken + len(rejected)}
+                counts = {key: counts[key] + batch[key] for key in counts}
+                record = self.metrics.batch_done(len(users) + invalid, file=name, **batch)
+                print(f"{name}: {batch['imported']} imported, {duplicates} duplicate ({format_progress(record)})")
+                last = clock()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+            if isinstance(e, psycopg2.OperationalError):
+                # The connection is gone; don't hand it out again
+                self.pool.putconn(conn, close=True)
+                conn = None
+        finally:
+            if conn is not None:
+                self.pool.putconn(conn)
+
+        outcome = "failed" if error else "done"
+        # Keeps the arrival prefix, so repeated uploads of one name stay apart
+        stored = os.path.basename(path)
+        target = os.path.join(self.inbox, outcome, stored if stored != name else arrival_name(name))
+        os.replace(path, target)
+        summary = {"file": name, "elapsed_s": round(time.perf_counter() - started, 3), **counts}
+        if error:
+            summary["error"] = error
+        with open(f"{target}.summary.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"{'Failed' if error else 'Imported'} {name}: {counts['imported']} imported, "
+              f"{counts['duplicates']} duplicate phones, {counts['invalid']} invalid, {counts['failed']} failed "
+              f"in {summary['elapsed_s']}s -> {os.path.relpath(target, self.inbox)}")
+        return summary
+
+    def worker(self):
+        while True:
+            path = self.queue.get()
+            if path is None:
+                return
+            try:
+                self.import_file(path)
+            except Exception:
+                # One bad file must not take the worker thread down with it
+                print(f"Error handling {path}:")
+                traceback.print_exc()
+            finally:
+                self.queue.task_done()
+
+    def run(self, once=False):
+        """Import files until stopped (SIGINT / SIGTERM), or until the inbox is empty with once."""
+        self.warm_up()
+        threads = [threading.Thread(target=self.worker, name=f"import-{i}", daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        watcher = None if once else make_watcher(self.inbox)
+        try:
+            # Start watching before the scan so nothing that lands in between is missed
+            self.enqueue_existing()
+            while watcher and not self.stopping.is_set():
+                names = watcher.wait(1.0)
+                if names is None:
+                    print("inotify queue overflowed, rescanning the inbox")
+                    names = sorted(os.listdir(self.inbox))
+                for name in names:
+                    if os.path.isfile(os.path.join(self.inbox, name)):
+                        self.enqueue(name)
+        finally:
+            # Let queued files finish, then stop the workers
+            for _ in threads:
+                self.queue.put(None)
+            for thread in threads:
+                thread.join()
+            if watcher:
+                watcher.close()
+            self.pool.closeall()
+
+    def stop(self, *_):
+        print("\nStopping after the files already queued...")
+        self.stopping.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident importer for users CSVs dropped into an inbox directory")
+    parser.add_argument("--inbox", help="Directory to watch (defaults to attached_assets/inbox)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Files imported concurrently")
+    parser.add_argument("--once", action="store_true", help="Import what is in the inbox now, then exit")
+    parser.add_argument("--metrics", help="Append per-batch stage metrics as JSON lines to this file")
+    parser.add_argument("--prometheus", help="Keep a Prometheus textfile with the current metrics at this path")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    print("======================================")
+    print("  USER IMPORT DAEMON                 ")
+    print("======================================")
+
+    inbox = os.path.abspath(args.inbox or os.path.join(os.path.dirname(os.path.abspath(__file__)), INBOX_DIR))
+    os.makedirs(inbox, exist_ok=True)
+    metrics = ImportMetrics(jsonl_path=args.metrics, prometheus_path=args.prometheus, job="import_daemon")
+    daemon = ImportDaemon(inbox, args.workers, metrics)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    try:
+        with profiled("import_daemon", args.profile, args.profile_dir, args.profile_memory,
+                      near=args.metrics):
+            daemon.run(args.once)
+    finally:
+        summary = metrics.summary()
+        metrics.close()
+    print(f"Stopped after {summary['rows_done']} rows ({summary['rows_per_sec']} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+"""
+Import Metrics
+Per-stage timings, throughput, queue depths and ETA for the import scripts,
+written as JSON lines and optionally as a Prometheus textfile
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Stages every importer reports, in pipeline order
+STAGES = ("parse", "transform", "dedup", "hash", "insert", "commit")
+
+
+class ImportMetrics:
+    """
+    Collects stage timings between batches and emits one record per batch.
+
+    Stage time is accumulated with `stage()` / `add()` from any thread and is
+    attributed to the next `batch_done()` call. Work timed by a worker thread
+    can instead be passed to `batch_done(stages=...)`, so it lands in the record
+    of the batch it belongs to.
+    """
+
+    def __init__(self, total_rows=None, jsonl_path=None, prometheus_path=None, job="user_import"):
+        self.total_rows = total_rows
+        self.job = job
+        self.prometheus_path = prometheus_path
+        self.started = time.perf_counter()
+        self.rows_done = 0
+        self.batches = 0
+        self.stage_totals = dict.fromkeys(STAGES, 0.0)
+        self.queues = {}
+        self._pending = dict.fromkeys(STAGES, 0.0)
+        self._last_batch = self.started
+        self._lock = threading.Lock()
+        self._jsonl = open(jsonl_path, "a") if jsonl_path else None
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name, seconds):
+        with self._lock:
+            self._pending[name] = self._pending.get(name, 0.0) + seconds
+            self.stage_totals[name] = self.stage_totals.get(name, 0.0) + seconds
+
+    def set_total(self, total_rows):
+        self.total_rows = total_rows
+
+    def set_queue_depth(self, name, depth):
+        with self._lock:
+            self.queues[name] = depth
+
+    def _rates(self, now):
+        elapsed = now - self.started
+        rate = self.rows_done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.total_rows is not None and rate > 0:
+            eta = max(self.total_rows - self.rows_done, 0) / rate
+        return elapsed, rate, eta
+
+    def batch_done(self, rows, stages=None, **extra):
+        """
+        Close the current batch and emit its record; returns the record.
+
+        rows counts every row the batch finished, imported or not. With stages
+        (seconds per stage, timed by the caller) the record carries those and the
+        time accumulated with add() stays pending for the next batch.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            self.rows_done += rows
+            self.batches += 1
+            if stages is None:
+                stages, self._pending = self._pending, dict.fromkeys(STAGES, 0.0)
+            else:
+                stages = {**dict.fromkeys(STAGES, 0.0), **stages}
+                for name, seconds in stages.items():
+                    self.stage_totals[name] = self.stage_totals.get(name, 0.0) + seconds
+            batch_seconds, self._last_batch = now - self._last_batch, now
+            elapsed, rate, eta = self._rates(now)
+            record = {
+                "event": "batch",
+                "ts": time.time(),
+                "job": self.job,
+                "batch": self.batches,
+                "rows": rows,
+                "rows_done": self.rows_done,
+                "total_rows": self.total_rows,
+                "elapsed_s": round(elapsed, 4),
+                "rows_per_sec": round(rate, 1),
+                "batch_rows_per_sec": round(rows / batch_seconds, 1) if batch_seconds > 0 else None,
+                "eta_s": round(eta, 1) if eta is not None else None,
+                "stages": {name: round(seconds, 6) for name, seconds in stages.items()},
+                "queues": dict(self.queues),
+                **extra,
+            }
+        self._emit(record)
+        return record
+
+    def summary(self, **extra):
+        """Emit the end-of-run record with the total time spent in every stage."""
+        now = time.perf_counter()
+        with self._lock:
+            elapsed, rate, _ = self._rates(now)
+            record = {
+                "event": "summary",
+                "ts": time.time(),
+                "job": self.job,
+                "batches": self.batches,
+                "rows_done": self.rows_done,
+                "total_rows": self.total_rows,
+                "elapsed_s": round(elapsed, 4),
+                "rows_per_sec": round(rate, 1),
+                "stages": {name: round(seconds, 6) for name, seconds in self.stage_totals.items()},
+                "bottleneck": max(self.stage_totals, key=self.stage_totals.get) if self.stage_totals else None,
+                **extra,
+            }
+        self._emit(record)
+        return record
+
+    def _emit(self, record):
+        if self._jsonl:
+            self._jsonl.write(json.dumps(record) + "\n")
+            self._jsonl.flush()
+        if self.prometheus_path:
+            self.write_prometheus()
+
+    def write_prometheus(self):
+        """Write the current totals in the node_exporter textfile format (atomically)."""
+        elapsed, rate, eta = self._rates(time.perf_counter())
+        job = f'job="{self.job}"'
+        lines = [
+            "# HELP import_rows_processed Rows imported so far.",
+            "# TYPE import_rows_processed gauge",
+            f"import_rows_processed{{{job}}} {self.rows_done}",
+            "# HELP import_rows_per_second Average import throughput.",
+            "# TYPE import_rows_per_second gauge",
+            f"import_rows_per_second{{{job}}} {rate:.3f}",
+            "# HELP import_elapsed_seconds Time since the import started.",
+            "# TYPE import_elapsed_seconds gauge",
+            f"import_elapsed_seconds{{{job}}} {elapsed:.3f}",
+            "# HELP import_stage_seconds Time spent per pipeline stage.",
+            "# TYPE import_stage_seconds gauge",
+        ]
+        lines += [f'import_stage_seconds{{{job},stage="{name}"}} {seconds:.6f}'
+                  for name, seconds in self.stage_totals.items()]
+        if self.total_rows is not None:
+            lines += [
+                "# HELP import_rows_total Rows expected in this import.",
+                "# TYPE import_rows_total gauge",
+                f"import_rows_total{{{job}}} {self.total_rows}",
+            ]
+        if eta is not None:
+            lines += [
+                "# HELP import_eta_seconds Estimated time to completion.",
+                "# TYPE import_eta_seconds gauge",
+                f"import_eta_seconds{{{job}}} {eta:.1f}",
+            ]
+        if self.queues:
+            lines += ["# HELP import_queue_depth Items waiting per queue.", "# TYPE import_queue_depth gauge"]
+            lines += [f'import_queue_depth{{{job},queue="{name}"}} {depth}' for name, depth in self.queues.items()]
+
+        tmp_path = f"{self.prometheus_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.prometheus_path)
+
+    def close(self):
+        if self._jsonl:
+            self._jsonl.close()
+            self._jsonl = None
+
+
+def format_progress(record):
+    """One human-readable progress line for a batch record."""
+    line = f"{record['rows_done']}"
+    if record.get("total_rows"):
+        line += f"/{record['total_rows']}"
+    line += f" rows, {record['rows_per_sec']} rows/sec"
+    if record.get("eta_s") is not None:
+        line += f", ETA {record['eta_s']:.0f}s"
+    return line
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import pandas as pd
 import psycopg2
@@ -6,6 +7,8 @@ import json
 import datetime
 from psycopg2.extras import Json
 
+from profiling import add_profile_arguments, profiled
+
 # Configuration - process next 10 users (smaller batch for reliability)
 START_INDEX = 160  # Continue from where we left off
 MAX_USERS = 10    # Only process this many users
@@ -121,4 +124,8 @@ def main():
             print("Database connection closed")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Import the next small batch of users from the CSV")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiled("import_small_batch", args.profile, args.profile_dir, args.profile_memory):
+        main()
\ No newline at end of file
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import pandas as pd
 import psycopg2
@@ -9,6 +10,8 @@ import secrets
 import time
 from psycopg2.extras import Json
 
+from profiling import add_profile_arguments, profiled
+
 # Configuration
 START_INDEX = 0  # Start with the first user
 MAX_USERS = 100  # Only process this many users
@@ -203,4 +206,8 @@ def main():
         print("Database connection closed")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Import a subset of users from the CSV")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiled("import_users_subset", args.profile, args.profile_dir, args.profile_memory):
+        main()
\ No newline at end of file
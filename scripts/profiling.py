@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+"""
+Profiling Hooks
+Shared --profile option for the Python entry points: a cProfile or stack-sampling
+profile, optionally a tracemalloc peak-memory snapshot, written to a per-run
+directory next to the run's output
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+# Configuration
+PROFILE_ROOT = "profiles"
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 10  # only with --profile-memory, tracing costs several times the run
+
+
+def add_profile_arguments(parser):
+    """Add --profile / --profile-dir to an entry point's argument parser."""
+    parser.add_argument("--profile", nargs="?", const="cprofile", choices=("cprofile", "sample"),
+                        help="Profile this run: deterministic cProfile (default) or low-overhead "
+                             "stack sampling. Both cover threads started during the run; worker "
+                             "processes are not profiled")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="With --profile, also trace allocations with tracemalloc (top sites and "
+                             "peak traced memory); slows the run down several times")
+    parser.add_argument("--profile-dir",
+                        help=f"Where to write the profile (default: {PROFILE_ROOT}/<script>_<timestamp> "
+                             "next to the run's output)")
+
+
+class StackSampler:
+    """Samples every thread's stack on a timer and counts folded stacks (flamegraph input)."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top_functions(self, limit=TOP_FUNCTIONS):
+        """Leaf-frame sample counts, the sampling equivalent of tottime."""
+        leaves = Counter()
+        for stack, count in self.counts.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+
+
+def _write_memory_report(snapshot, path, limit=TOP_ALLOCATIONS):
+    stats = snapshot.statistics("traceback")
+    with open(path, "w") as f:
+        f.write(f"Top {limit} allocation sites still alive at the end of the run\n\n")
+        for index, stat in enumerate(stats[:limit], 1):
+            f.write(f"#{index}: {stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+            for line in stat.traceback.format():
+                f.write(f"    {line}\n")
+            f.write("\n")
+    return [
+        {"size_bytes": stat.size, "blocks": stat.count, "site": str(stat.traceback[0])}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+class ThreadProfiles:
+    """
+    cProfile for the calling thread and every thread started while it is enabled.
+
+    From Python 3.12 cProfile is built on sys.monitoring and already sees every
+    thread, and only one profiler may be active. On 3.11 it only hooks the thread
+    that enables it, so a hook installed with threading.setprofile gives each new
+    thread its own profiler; the stats are merged when the profile is written.
+    """
+
+    PER_THREAD = sys.version_info < (3, 12)
+
+    def __init__(self):
+        self.main = cProfile.Profile()
+        self.threads = []
+
+    def _start_thread(self, *_):
+        profiler = cProfile.Profile()
+        try:
+            # Replaces this hook for the rest of the thread's life
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active; never let profiling kill the thread
+            sys.setprofile(None)
+            return
+        self.threads.append(profiler)
+
+    def enable(self):
+        if self.PER_THREAD:
+            threading.setprofile(self._start_thread)
+        self.main.enable()
+
+    def disable(self):
+        self.main.disable()
+        if self.PER_THREAD:
+            threading.setprofile(None)
+
+    def stats(self, stream):
+        stats = pstats.Stats(self.main, stream=stream)
+        for profiler in list(self.threads):
+            stats.add(profiler)
+        return stats
+
+
+def profile_dir(name, near=None):
+    """The default profile directory: profiles/<name>_<timestamp> beside near (or in the CWD)."""
+    base = os.path.dirname(os.path.normpath(near)) if near else ""
+    return os.path.join(base, PROFILE_ROOT, f"{name}_{datetime.now():%Y%m%d_%H%M%S}")
+
+
+@contextmanager
+def profiled(name, mode="cprofile", out_dir=None, memory=False, near=None):
+    """
+    Profile the enclosed block.
+
+    Writes to out_dir (default: profiles/ beside the run's output file or directory
+    near): profile.pstats + profile.txt (cprofile mode) or stacks.folded + profile.txt
+    (sample mode), and profile.json with wall/CPU time and peak RSS. With memory,
+    tracemalloc also runs and memory.txt lists the top allocation sites.
+    """
+    if not mode:
+        yield None
+        return
+
+    out_dir = out_dir or profile_dir(name, near)
+    os.makedirs(out_dir, exist_ok=True)
+
+    if memory:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    profiler = ThreadProfiles() if mode == "cprofile" else None
+    sampler = StackSampler() if mode == "sample" else None
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+
+    if profiler:
+        profiler.enable()
+    if sampler:
+        sampler.start()
+    try:
+        yield out_dir
+    finally:
+        if profiler:
+            profiler.disable()
+        if sampler:
+            sampler.stop()
+        wall, cpu = time.perf_counter() - wall_started, time.process_time() - cpu_started
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ])
+            tracemalloc.stop()
+
+        report = io.StringIO()
+        if profiler:
+            stats = profiler.stats(report)
+            stats.dump_stats(os.path.join(out_dir, "profile.pstats"))
+            stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            stats.sort_stats("tottime").print_stats(TOP_FUNCTIONS)
+        else:
+            sampler.write(os.path.join(out_dir, "stacks.folded"))
+            report.write(f"{sampler.samples} samples every {sampler.interval * 1000:.0f} ms\n\n")
+            for frame, count in sampler.top_functions():
+                report.write(f"{count:>8}  {count / max(sampler.samples, 1):6.1%}  {frame}\n")
+        with open(os.path.join(out_dir, "profile.txt"), "w") as f:
+            f.write(report.getvalue())
+
+        summary = {
+            "script": name,
+            "mode": mode,
+            "argv": sys.argv,
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": round(cpu, 4),
+            "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        }
+        if memory:
+            summary["tracemalloc_peak_bytes"] = peak
+            summary["tracemalloc_current_bytes"] = current
+            summary["top_allocations"] = _write_memory_report(snapshot, os.path.join(out_dir, "memory.txt"))
+        with open(os.path.join(out_dir, "profile.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        if memory:
+            print(f"Profile written to {out_dir} (peak traced memory {peak / 1e6:.1f} MB)")
+        else:
+            print(f"Profile written to {out_dir}")
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+"""
+Game RTP Simulator
+Replays the outcome and payout rules of the server game engines (server/games/)
+as batched NumPy draws across a process pool, and reports each configuration's
+empirical return to player, payout variance and confidence interval next to the
+RTP the games table advertises.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import psycopg2
+
+from profiling import add_profile_arguments, profiled
+
+# Configuration
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAMES_DIR = os.path.join(REPO_ROOT, "server", "games")
+ROUNDS = 10_000_000       # rounds per configuration
+BATCH_ROUNDS = 1_000_000  # rounds drawn at once (bounds memory per worker)
+TASK_ROUNDS = 20_000_000  # rounds per pool task
+CONFIDENCE_Z = 3.2905     # two-sided 99.9% interval
+
+# generateRandomNumber(): the first 32 bits of a SHA-256, divided by 0xffffffff
+U32_MAX = 0xFFFFFFFF
+
+LIMBO_HOUSE_EDGE = 0.01  # houseEdge in limbo.ts
+
+# RTP the frontend lists (client/src/games/index.ts); the games table overrides these when reachable
+ADVERTISED_RTP = {"limbo": 99.0, "dice": 99.0, "plinko": 99.0, "slots": 97.0}
+
+# Configurations simulated by default, per game
+GAME_CONFIGS = {
+    "limbo": [{"target": t} for t in (1.01, 1.5, 2.0, 10.0, 100.0, 1000.0)],
+    "dice": [{"mode": m, "target": t} for m in ("under", "over") for t in (5.0, 25.0, 50.0, 75.0, 95.0)],
+    "plinko": [{"risk": r, "rows": n} for r in ("low", "medium", "high") for n in range(8, 17)],
+    "slots": [{"lucky": None}, {"lucky": 7}],
+}
+
+# Database connection from environment variables
+DB_URL = os.environ.get('DATABASE_URL')
+
+
+def load_plinko_multipliers(path=os.path.join(GAMES_DIR, "plinko.ts")):
+    """PLINKO_MULTIPLIERS from plinko.ts as {risk: {rows: array}}, so the tables are never copied by hand."""
+    with open(path) as f:
+        source = f.read()
+    tables = {}
+    for risk, body in re.findall(r"'(\w+)':\s*\{(.*?)\}", source, re.S):
+        rows = re.findall(r"(\d+):\s*\[([^\]]*)\]", body)
+        if rows:
+            tables[risk] = {int(n): np.array([float(v) for v in values.split(",")]) for n, values in rows}
+    if not tables:
+        raise ValueError(f"No PLINKO_MULTIPLIERS found in {path}")
+    return tables
+
+
+def load_slot_multipliers(path=os.path.join(GAMES_DIR, "slots.ts")):
+    """SLOT_MULTIPLIERS from slots.ts as {name: value}."""
+    with open(path) as f:
+        source = f.read()
+    block = re.search(r"SLOT_MULTIPLIERS\s*=\s*\{(.*?)\};", source, re.S)
+    if not block:
+        raise ValueError(f"No SLOT_MULTIPLIERS found in {path}")
+    return {name: float(value) for name, value in re.findall(r"(\w+):\s*([\d.]+)", block.group(1))}
+
+
+def random_numbers(rng, n):
+    """generateRandomNumber() for n rounds: a uniform 32-bit integer over 0xffffffff, so 1.0 can occur."""
+    return rng.integers(0, U32_MAX, size=n, dtype=np.uint32, endpoint=True) / U32_MAX
+
+
+def to_fixed_2(values):
+    """parseFloat(x.toFixed(2)): round half away from zero to cents (values here are never negative)."""
+    return np.floor(values * 100 + 0.5) / 100
+
+
+def limbo_payouts(rng, n, target):
+    """limbo.ts: result = 1 / (random * 0.99), to cents; a result at or above the target pays the target."""
+    with np.errstate(divide="ignore"):
+        result = to_fixed_2(1 / (random_numbers(rng, n) * (1 - LIMBO_HOUSE_EDGE)))
+    return np.where(result >= target, target, 0.0)
+
+
+def dice_payouts(rng, n, target, mode):
+    """
+    dice.ts: a roll of random * 100 to cents, won above (over) or below (under) the target.
+
+    calculateDicePayout() pays 100 / target in both modes, as the server does.
+    """
+    roll = to_fixed_2(random_numbers(rng, n) * 100)
+    win = roll > target if mode == "over" else roll < target
+    return np.where(win, 100 / target, 0.0)
+
+
+def plinko_payouts(rng, n, rows, risk, tables):
+    """
+    plinko.ts: one random per row, random < 0.5 goes right (0), else left (1); the slot is the count of 1s.
+
+    random < 0.5 holds for exactly half of the 2**32 values, so each row is a fair bit
+    and a round's slot is the popcount of `rows` random bits.
+    """
+    bits = rng.integers(0, 1 << rows, size=n, dtype=np.uint32)
+    return tables[risk][rows][np.bitwise_count(bits)]
+
+
+def slots_payouts(rng, n, lucky, multipliers):
+    """
+    slots.ts: three reels of floor(random * 10) scored by calculateMultiplier(), plus the lucky-number bonus.
+
+    A random of exactly 1.0 gives a reel of 10, and calculateMultiplier() sorts the reels
+    as strings, so "10" lands between 1 and 2; both are reproduced.
+    """
+    reels = np.floor(random_numbers(rng, 3 * n) * 10).astype(np.int8).reshape(n, 3)
+    a, b, c = reels[:, 0], reels[:, 1], reels[:, 2]
+
+    # JavaScript's default sort compares "0".."9" and "10" as text
+    order = np.argsort(np.where(reels == 10, 3, reels.astype(np.int16) * 2), axis=1, kind="stable")
+    s = np.take_along_axis(reels, order, axis=1).astype(np.int16)
+
+    multiplier = np.select(
+        [
+            (a == 7) & (b == 7) & (c == 7),
+            (a == b) & (b == c),
+            (s[:, 1] == s[:, 0] + 1) & (s[:, 2] == s[:, 1] + 1),
+            (a == b) | (b == c) | (a == c),
+        ],
+        [multipliers["THREE_SEVENS"], multipliers["THREE_SAME"], multipliers["SEQUENTIAL"], multipliers["TWO_SAME"]],
+        default=multipliers["NONE"],
+    )
+    if lucky is not None:
+        multiplier = multiplier + np.where((reels == lucky).any(axis=1), multipliers["LUCKY_NUMBER_HIT"], 0.0)
+    return multiplier
+
+
+def payouts(rng, n, game, params, tables):
+    """Payout per unit staked for n rounds of one configuration."""
+    if game == "limbo":
+        return limbo_payouts(rng, n, params["target"])
+    if game == "dice":
+        return dice_payouts(rng, n, params["target"], params["mode"])
+    if game == "plinko":
+        return plinko_payouts(rng, n, params["rows"], params["risk"], tables["plinko"])
+    if game == "slots":
+        return slots_payouts(rng, n, params["lucky"], tables["slots"])
+    raise ValueError(f"Unknown game {game!r}")
+
+
+def merge_stats(a, b):
+    """Combine two (rounds, mean, M2, wins, max) summaries; a win pays back at least the stake (Chan et al.'s parallel variance)."""
+    n = a[0] + b[0]
+    if n == 0:
+        return a
+    delta = b[1] - a[1]
+    mean = a[1] + delta * b[0] / n
+    m2 = a[2] + b[2] + delta * delta * a[0] * b[0] / n
+    return (n, mean, m2, a[3] + b[3], max(a[4], b[4]))
+
+
+EMPTY_STATS = (0, 0.0, 0.0, 0, 0.0)
+
+
+def simulate_task(game, params, rounds, seed, batch_rounds=BATCH_ROUNDS):
+    """Run one pool task: `rounds` rounds in batches, returning their running summary."""
+    tables = {"plinko": load_plinko_multipliers(), "slots": load_slot_multipliers()}
+    rng = np.random.default_rng(seed)
+    stats = EMPTY_STATS
+    for start in range(0, rounds, batch_rounds):
+        x = payouts(rng, min(batch_rounds, rounds - start), game, params, tables)
+        mean = float(x.mean())
+        batch = (len(x), mean, float(np.square(x - mean).sum()), int(np.count_nonzero(x >= 1)), float(x.max()))
+        stats = merge_stats(stats, batch)
+    return stats
+
+
+def config_label(game, params):
+    return f"{game} " + " ".join(f"{key}={value}" for key, value in params.items())
+
+
+def summarize(game, params, stats, advertised):
+    n, mean, m2, wins, max_payout = stats
+    std = math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
+    margin = CONFIDENCE_Z * std / math.sqrt(n) if n else 0.0
+    result = {
+        "game": game,
+        "params": params,
+        "rounds": n,
+        "rtp": mean * 100,
+        "ci_low": (mean - margin) * 100,
+        "ci_high": (mean + margin) * 100,
+        "std": std,
+        "variance": std * std,
+        "win_rate": wins / n if n else 0.0,
+        "max_payout": max_payout,
+        "advertised_rtp": advertised,
+    }
+    # Only flag what the interval rules out, not noise
+    result["mismatch"] = advertised is not None and not result["ci_low"] <= advertised <= result["ci_high"]
+    return result
+
+
+def simulate(games, rounds, jobs, seed, advertised):
+    """Simulate every configuration of the given games across a process pool."""
+    tasks = []
+    for game in games:
+        for params in GAME_CONFIGS[game]:
+            for start in range(0, rounds, TASK_ROUNDS):
+                tasks.append((game, params, min(TASK_ROUNDS, rounds - start)))
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+
+    stats = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [(game, params, pool.submit(simulate_task, game, params, n, s))
+                   for (game, params, n), s in zip(tasks, seeds)]
+        for game, params, future in futures:
+            key = config_label(game, params)
+            stats[key] = (game, params, merge_stats(stats.get(key, (None, None, EMPTY_STATS))[2], future.result()))
+
+    return [summarize(game, params, s, advertised.get(game)) for game, params, s in stats.values()]
+
+
+def get_advertised_rtp(conn):
+    """RTP per simulated game from the games table (read-only), falling back to ADVERTISED_RTP."""
+    advertised = dict(ADVERTISED_RTP)
+    cur = conn.cursor()
+    cur.execute("SELECT slug, rtp FROM games WHERE slug = ANY(%s)", (list(GAME_CONFIGS),))
+    advertised.update({slug: float(rtp) for slug, rtp in cur.fetchall()})
+    cur.close()
+    conn.rollback()
+    return advertised
+
+
+def print_report(results, seconds):
+    print("\n======================================")
+    print("  GAME RTP SIMULATION RESULTS        ")
+    print("======================================")
+    print(f"{'configuration':<34}{'rounds':>13}{'RTP %':>10}{'99.9% CI':>20}{'std':>10}{'win rate':>10}  advertised")
+    for r in results:
+        ci = f"{r['ci_low']:.3f}-{r['ci_high']:.3f}"
+        flag = "  MISMATCH" if r["mismatch"] else ""
+        advertised = "" if r["advertised_rtp"] is None else f"{r['advertised_rtp']:g}"
+        print(f"{config_label(r['game'], r['params']):<34}{r['rounds']:>13,}{r['rtp']:>10.3f}{ci:>20}"
+              f"{r['std']:>10.3f}{r['win_rate']:>10.4f}  {advertised}{flag}")
+    total = sum(r["rounds"] for r in results)
+    print("======================================")
+    print(f"{total:,} rounds in {seconds:.1f}s ({total / seconds * 60 / 1e6:,.0f}M rounds/min)")
+    mismatches = sum(r["mismatch"] for r in results)
+    if mismatches:
+        print(f"{mismatches} configuration(s) pay outside the advertised RTP")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo RTP check for the server game engines")
+    parser.add_argument("--games", nargs="+", choices=sorted(GAME_CONFIGS), default=list(GAME_CONFIGS))
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="Rounds per configuration")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-db", action="store_true",
+                        help="Compare against the frontend's RTP list instead of the games table")
+    parser.add_argument("--output", help="Also write the results as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    print("======================================")
+    print("  GAME RTP SIMULATOR                 ")
+    print("======================================")
+
+    advertised = dict(ADVERTISED_RTP)
+    if DB_URL and not args.no_db:
+        conn = psycopg2.connect(DB_URL)
+        try:
+            advertised = get_advertised_rtp(conn)
+        finally:
+            conn.close()
+
+    print(f"Simulating {args.rounds:,} rounds per configuration with {args.jobs} worker(s)...")
+    with profiled("rtp_simulator", args.profile, args.profile_dir, args.profile_memory, near=args.output):
+        started = time.perf_counter()
+        results = simulate(args.games, args.rounds, args.jobs, args.seed, advertised)
+        seconds = time.perf_counter() - started
+    print_report(results, seconds)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "params": {"games": args.games, "rounds": args.rounds, "seed": args.seed},
+                "seconds": round(seconds, 2),
+                "results": results,
+            }, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+    sys.exit(1 if any(r["mismatch"] for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
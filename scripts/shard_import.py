@@ -0,0 +1,687 @@
+#!/usr/bin/env python3
+
+"""
+Sharded User Import
+Splits one users CSV into shards, by byte range or by phone-hash range, and lets any
+number of workers on any number of hosts import it together. Workers coordinate only
+through the target database: a shard-lease table whose leases are held as session
+advisory locks, so a worker that dies (and its connection with it) releases its shard
+for the others to resume from its last committed batch. Duplicate phones are dropped
+across every worker by a per-job claims table with a unique key.
+"""
+
+import argparse
+import csv
+import fcntl
+import hashlib
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+from collections import namedtuple
+
+import psycopg2
+from psycopg2 import errors
+
+from import_metrics import ImportMetrics, format_progress
+from profiling import add_profile_arguments, profiled
+
+# Configuration
+CSV_PATH = "../attached_assets/users - Sheet1.csv"
+SHARDS = 32
+BATCH_SIZE = 1000
+HASH_SPACE = 2 ** 32      # phone hashes are the first 4 bytes of blake2b
+LOCK_NAMESPACE = 0x5348   # first key of every advisory lock taken here
+PLAN_LOCK = 0             # second key of the lock serialising job planning
+POLL_SECONDS = 1.0        # wait between claims while other workers hold the last shards
+LEASE_TIMEOUT = 300       # seconds without a heartbeat before a live owner is terminated
+MAX_RETRIES = 5           # attempts per batch on deadlock / serialization failure
+SPILL_ROOT = os.path.join(tempfile.gettempdir(), "shard_import")  # per-range copies for phone-hash mode
+
+# Database connection from environment variables
+DB_URL = os.environ.get('DATABASE_URL')
+
+SHARDS_DDL = """
+CREATE TABLE IF NOT EXISTS import_shards (
+    job text NOT NULL,
+    shard integer NOT NULL,
+    mode text NOT NULL,
+    source text NOT NULL,
+    lo bigint NOT NULL,
+    hi bigint NOT NULL,
+    progress bigint,
+    owner text,
+    owner_pid integer,
+    attempts integer NOT NULL DEFAULT 0,
+    rows_imported bigint NOT NULL DEFAULT 0,
+    rows_duplicate bigint NOT NULL DEFAULT 0,
+    rows_invalid bigint NOT NULL DEFAULT 0,
+    rows_failed bigint NOT NULL DEFAULT 0,
+    leased_at timestamp,
+    heartbeat_at timestamp,
+    finished_at timestamp,
+    PRIMARY KEY (job, shard)
+)
+"""
+
+CLAIMS_DDL = """
+CREATE TABLE IF NOT EXISTS import_phone_claims (
+    job text NOT NULL,
+    phone text NOT NULL,
+    PRIMARY KEY (job, phone)
+)
+"""
+
+# A shard as claimed; progress is the byte offset (bytes) or data row (phone-hash) to resume at
+Shard = namedtuple("Shard", "number lo hi progress previous_owner")
+
+
+class LeaseLost(Exception):
+    """The shard was re-planned or taken over while this worker held it."""
+
+
+# Generate password hash (same format as fast-import.py)
+def hash_password(password):
+    salt = hashlib.md5(str(random.random()).encode()).hexdigest()
+    hashed = hashlib.sha512((password + salt).encode()).hexdigest()
+    return f"{hashed}.{salt}"
+
+
+def generate_referral_code():
+    chars = string.ascii_uppercase + string.digits
+    return ''.join(random.choice(chars) for _ in range(8))
+
+
+def is_valid_phone(phone):
+    return phone.isdigit() and len(phone) == 10
+
+
+def is_yes_value(value):
+    return (value or '').lower().strip() in ('yes', 'true', '1')
+
+
+def phone_hash(phone):
+    """Where a phone falls in [0, HASH_SPACE); the same on every host and Python version."""
+    return int.from_bytes(hashlib.blake2b(phone.encode(), digest_size=4).digest(), "big")
+
+
+# ---------------------------------------------------------------------------
+# Shards
+# ---------------------------------------------------------------------------
+
+def read_header(path):
+    """The CSV column names and the byte offset where the data rows start."""
+    with open(path, "rb") as f:
+        line = f.readline()
+        return [name.strip() for name in next(csv.reader([line.decode("utf-8-sig")]))], f.tell()
+
+
+def source_id(path):
+    """Identifies the input so workers started on a different file refuse to join the job."""
+    return f"{os.path.basename(path)}:{os.path.getsize(path)}"
+
+
+def byte_ranges(path, shards):
+    """Split the data rows into byte ranges; a row belongs to the range its first byte is in."""
+    _, data_start = read_header(path)
+    size = os.path.getsize(path)
+    step = max((size - data_start) // shards, 1)
+    bounds = [min(data_start + i * step, size) for i in range(shards)] + [size]
+    return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
+
+
+def hash_ranges(shards):
+    step = HASH_SPACE // shards
+    bounds = [i * step for i in range(shards)] + [HASH_SPACE]
+    return list(zip(bounds, bounds[1:]))
+
+
+def read_byte_shard(path, columns, lo, hi, start=None, batch_size=BATCH_SIZE):
+    """
+    Yield (records, resume offset) for the rows starting in [lo, hi).
+
+    Rows must not contain quoted newlines (the users sheet never does). With start
+    the read resumes at that offset, which is always a row boundary.
+    """
+    with open(path, "rb") as f:
+        if start is not None:
+            f.seek(start)
+        else:
+            # Back up one byte: if it is a newline the row at lo is ours, otherwise lo is mid-row
+            f.seek(lo - 1)
+            f.readline()
+        lines = []
+        while f.tell() < hi:
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line.decode("utf-8"))
+            if len(lines) == batch_size:
+                yield [dict(zip(columns, row)) for row in csv.reader(lines)], f.tell()
+                lines = []
+        if lines:
+            yield [dict(zip(columns, row)) for row in csv.reader(lines)], f.tell()
+
+
+def spill_dir(path, shards, root=SPILL_ROOT):
+    """Where this host keeps the per-range copies of one input for one shard count."""
+    key = f"{os.path.abspath(path)}:{source_id(path)}:{os.path.getmtime(path)}:{shards}"
+    return os.path.join(root, hashlib.blake2b(key.encode(), digest_size=8).hexdigest())
+
+
+def spill_path(directory, number):
+    return os.path.join(directory, f"{number}.csv")
+
+
+def partition_by_hash(path, ranges, directory):
+    """
+    Split the data rows into one CSV per phone-hash range, in a single pass over the file.
+
+    Each host does this once, the first time one of its workers needs a phone-hash
+    shard; the other local workers wait on a file lock and then reuse the copies, so
+    the file is parsed and hashed once per host rather than once per shard. Rows keep
+    their file order within a range, so the first copy of a phone still wins.
+    """
+    complete = os.path.join(directory, "complete")
+    if os.path.exists(complete):
+        return
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if os.path.exists(complete):
+            return
+        print(f"Partitioning {path} into {len(ranges)} phone-hash ranges under {directory}")
+        bounds = [lo for lo, _ in ranges]
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader)]
+            phone_at = header.index("Phone") if "Phone" in header else len(header)
+            outputs = [open(spill_path(directory, number), "w", newline="", encoding="utf-8")
+                       for number in range(len(ranges))]
+            try:
+                writers = [csv.writer(out) for out in outputs]
+                for writer in writers:
+                    writer.writerow(header)
+                for row in reader:
+                    phone = row[phone_at].strip() if phone_at < len(row) else ""
+                    writers[bisect_right(bounds, phone_hash(phone)) - 1].writerow(row)
+            finally:
+                for out in outputs:
+                    out.close()
+        with open(complete, "w") as f:
+            f.write(source_id(path))
+
+
+def read_hash_shard(path, start=0, batch_size=BATCH_SIZE):
+    """
+    Yield (records, resume row) from a shard's partition file (see partition_by_hash).
+
+    All copies of a phone land in one shard, so the first one in the file wins, as
+    with the single-host importers.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        records = []
+        index = start
+        for index, record in enumerate(reader):
+            if index < start:
+                continue
+            records.append(record)
+            if len(records) == batch_size:
+                yield records, index + 1
+                records = []
+        if records:
+            yield records, index + 1
+
+
+class ShardLeases:
+    """
+    The shard-lease table of one job, seen from one worker's connection.
+
+    A shard is leased to whoever holds the session advisory lock
+    (LOCK_NAMESPACE, hashtext('job:shard')). Postgres drops the lock the moment the
+    owner's connection ends, so a crashed worker's shard is claimable immediately;
+    a worker that hangs with its connection open is terminated once its heartbeat
+    is older than the lease timeout.
+    """
+
+    def __init__(self, conn, job, owner, lease_timeout=LEASE_TIMEOUT):
+        self.conn = conn
+        self.job = job
+        self.owner = owner
+        self.lease_timeout = lease_timeout
+
+    def plan(self, mode, ranges, source, restart=False):
+        """Create the job's shards and seed its phone claims, unless another worker already has."""
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(%s, %s)", (LOCK_NAMESPACE, PLAN_LOCK))
+            cur.execute(SHARDS_DDL)
+            cur.execute(CLAIMS_DDL)
+            if restart:
+                cur.execute("DELETE FROM import_shards WHERE job = %s", (self.job,))
+                cur.execute("DELETE FROM import_phone_claims WHERE job = %s", (self.job,))
+
+            cur.execute("SELECT mode, source, count(*) FROM import_shards WHERE job = %s GROUP BY mode, source",
+                        (self.job,))
+            planned = cur.fetchall()
+            if planned:
+                if planned != [(mode, source, len(ranges))]:
+                    raise ValueError(f"Job {self.job!r} is already planned as "
+                                     f"{', '.join(f'{n} {m} shards of {s}' for m, s, n in planned)}; "
+                                     f"pass the same input and options, or --restart")
+                self.conn.commit()
+                return False
+
+            cur.executemany("""
+                INSERT INTO import_shards (job, shard, mode, source, lo, hi) VALUES (%s, %s, %s, %s, %s, %s)
+            """, [(self.job, number, mode, source, lo, hi) for number, (lo, hi) in enumerate(ranges)])
+            # Phones already in users count as claimed, so only new ones are imported
+            cur.execute("""
+                INSERT INTO import_phone_claims (job, phone)
+                SELECT %s, phone FROM users
+                ON CONFLICT DO NOTHING
+            """, (self.job,))
+        self.conn.commit()
+        return True
+
+    def _lock_key(self, number):
+        return (LOCK_NAMESPACE, f"{self.job}:{number}")
+
+    def claim(self):
+        """
+        Lease the next unfinished shard nobody holds.
+
+        Returns a Shard, or None when every unfinished shard is held by a live worker.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT shard, owner_pid, extract(epoch FROM now() - heartbeat_at)
+                FROM import_shards WHERE job = %s AND finished_at IS NULL
+                ORDER BY attempts, shard
+            """, (self.job,))
+            candidates = cur.fetchall()
+            self.conn.commit()
+
+            for number, owner_pid, silent_for in candidates:
+                cur.execute("SELECT pg_try_advisory_lock(%s, hashtext(%s))", self._lock_key(number))
+                if not cur.fetchone()[0]:
+                    if owner_pid and silent_for is not None and silent_for > self.lease_timeout:
+                        self._terminate(cur, number, owner_pid, silent_for)
+                    self.conn.commit()
+                    continue
+
+                cur.execute("""
+                    SELECT lo, hi, progress, owner FROM import_shards
+                    WHERE job = %s AND shard = %s AND finished_at IS NULL
+                    FOR UPDATE
+                """, (self.job, number))
+                row = cur.fetchone()
+                if row is None:
+                    # Finished between the scan and the lock
+                    self.conn.commit()
+                    cur.execute("SELECT pg_advisory_unlock(%s, hashtext(%s))", self._lock_key(number))
+                    self.conn.commit()
+                    continue
+                cur.execute("""
+                    UPDATE import_shards
+                    SET owner = %s, owner_pid = pg_backend_pid(), attempts = attempts + 1,
+                        leased_at = now(), heartbeat_at = now()
+                    WHERE job = %s AND shard = %s
+                """, (self.owner, self.job, number))
+                self.conn.commit()
+                return Shard(number, *row)
+        return None
+
+    def _terminate(self, cur, number, owner_pid, silent_for):
+        """End the backend of an owner that holds its lock but stopped heartbeating."""
+        # The stored pid may since belong to another backend; only end it if it holds this shard's lock
+        cur.execute("""
+            SELECT pg_terminate_backend(pid) FROM pg_locks
+            WHERE locktype = 'advisory' AND granted AND pid = %s AND classid = %s
+              AND objid::bigint = (hashtext(%s)::bigint & 4294967295) AND objsubid = 2
+        """, (owner_pid, LOCK_NAMESPACE, self._lock_key(number)[1]))
+        if any(terminated for terminated, in cur.fetchall()):
+            print(f"Shard {number}: owner backend {owner_pid} silent for {silent_for:.0f}s, terminated")
+
+    def checkpoint(self, cur, shard, progress, imported, duplicates, invalid, failed):
+        """Record a batch inside its transaction; raises LeaseLost if the lease is no longer ours."""
+        cur.execute("""
+            UPDATE import_shards
+            SET progress = %s, heartbeat_at = now(),
+                rows_imported = rows_imported + %s, rows_duplicate = rows_duplicate + %s,
+                rows_invalid = rows_invalid + %s, rows_failed = rows_failed + %s
+            WHERE job = %s AND shard = %s AND owner = %s AND owner_pid = pg_backend_pid()
+        """, (progress, imported, duplicates, invalid, failed, self.job, shard.number, self.owner))
+        if cur.rowcount != 1:
+            raise LeaseLost(f"Lost the lease on shard {shard.number} of {self.job!r}")
+
+    def finish(self, shard):
+        with self.conn.cursor() as cur:
+            cur.execute("UPDATE import_shards SET finished_at = now() WHERE job = %s AND shard = %s AND owner = %s",
+                        (self.job, shard.number, self.owner))
+            self.conn.commit()
+        self.release(shard)
+
+    def release(self, shard):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s, hashtext(%s))", self._lock_key(shard.number))
+        self.conn.commit()
+
+    def status(self):
+        """Totals over the job's shards: shards, finished, imported, duplicate, invalid, failed."""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT count(*), count(finished_at), coalesce(sum(rows_imported), 0),
+                       coalesce(sum(rows_duplicate), 0), coalesce(sum(rows_invalid), 0),
+                       coalesce(sum(rows_failed), 0)
+                FROM import_shards WHERE job = %s
+            """, (self.job,))
+            row = cur.fetchone()
+        self.conn.commit()
+        return row
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def prepare_batch(records):
+    """Valid rows as column arrays for insert_batch, dropping repeats within the batch; returns (columns, invalid)."""
+    seen = set()
+    usernames, phones, admins, banned, referral_codes = [], [], [], [], []
+    invalid = 0
+    for record in records:
+        phone = (record.get('Phone') or '').strip()
+        if not is_valid_phone(phone):
+            invalid += 1
+            continue
+        if phone in seen:
+            continue
+        seen.add(phone)
+        usernames.append((record.get('Username') or '').strip() or f"user_{phone[-6:]}")
+        phones.append(phone)
+        admins.append(is_yes_value(record.get('Is Admin')))
+        banned.append(is_yes_value(record.get('Is Banned')))
+        referral_codes.append(generate_referral_code())
+    # Claim phones in one global order so concurrent batches can't deadlock on each other
+    order = sorted(range(len(phones)), key=phones.__getitem__)
+    columns = [[column[i] for i in order] for column in (usernames, phones, admins, banned, referral_codes)]
+    return columns, invalid
+
+
+def insert_batch(cur, job, columns, password):
+    """
+    Claim the batch's phones and insert the users whose claim succeeded, in one statement.
+
+    Returns (claimed, inserted); a claimed row that wasn't inserted had its username
+    or email taken, and its claim is released so a corrected file can import it.
+    """
+    cur.execute("""
+        WITH batch AS (
+            SELECT * FROM unnest(%s::text[], %s::text[], %s::boolean[], %s::boolean[], %s::text[])
+                AS b(username, phone, is_admin, is_banned, referral_code)
+        ), claimed AS (
+            INSERT INTO import_phone_claims (job, phone)
+            SELECT %s, phone FROM batch
+            ON CONFLICT DO NOTHING
+            RETURNING phone
+        ), inserted AS (
+            INSERT INTO users (
+                username, full_name, phone, password,
+                email, balance, created_at,
+                is_admin, is_banned, referral_code
+            )
+            SELECT b.username, b.username, b.phone, %s,
+                   b.phone || '@example.com', %s::jsonb, now(),
+                   b.is_admin, b.is_banned, b.referral_code
+            FROM batch b JOIN claimed c USING (phone)
+            ON CONFLICT DO NOTHING
+            RETURNING phone
+        )
+        SELECT (SELECT count(*) FROM claimed), (SELECT count(*) FROM inserted),
+               ARRAY(SELECT phone FROM claimed EXCEPT SELECT phone FROM inserted)
+    """, columns + [job, password, json.dumps({"INR": 0, "BTC": 0, "ETH": 0, "USDT": 0})])
+    claimed, inserted, rejected = cur.fetchone()
+    if rejected:
+        cur.execute("DELETE FROM import_phone_claims WHERE job = %s AND phone = ANY(%s)", (job, rejected))
+    return claimed, inserted
+
+
+def import_shard(conn, leases, shard, path, mode, metrics, batch_size=BATCH_SIZE, spill=None):
+    """
+    Import one leased shard from its last checkpoint; returns (imported, duplicates, invalid, failed).
+
+    In phone-hash mode the rows are read from the shard's file in the spill directory.
+    """
+    if mode == "bytes":
+        columns, _ = read_header(path)
+        batches = read_byte_shard(path, columns, shard.lo, shard.hi, shard.progress, batch_size)
+    else:
+        batches = read_hash_shard(spill_path(spill, shard.number), shard.progress or 0, batch_size)
+
+    password = hash_password("password")
+    totals = [0, 0, 0, 0]
+    clock = time.perf_counter
+    last = clock()
+    for records, progress in batches:
+        now = clock()
+        metrics.add("parse", now - last)
+        with metrics.stage("transform"):
+            columns, invalid = prepare_batch(records)
+
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                with conn.cursor() as cur:
+                    with metrics.stage("insert"):
+                        claimed, inserted = insert_batch(cur, leases.job, columns, password) if columns[1] else (0, 0)
+                    counts = (inserted, len(records) - invalid - claimed, invalid, claimed - inserted)
+                    leases.checkpoint(cur, shard, progress, *counts)
+                with metrics.stage("commit"):
+                    conn.commit()
+                break
+            except (errors.DeadlockDetected, errors.SerializationFailure):
+                conn.rollback()
+                if attempt == MAX_RETRIES:
+                    raise
+                time.sleep(0.05 * attempt)
+            except Exception:
+                conn.rollback()
+                raise
+
+        totals = [total + count for total, count in zip(totals, counts)]
+        record = metrics.batch_done(len(records), shard=shard.number, imported=counts[0], duplicates=counts[1],
+                                    invalid=counts[2], failed=counts[3])
+        print(f"Shard {shard.number}: {counts[0]} imported, {counts[1]} duplicate "
+              f"({format_progress(record)})")
+        last = clock()
+    return totals
+
+
+def connect():
+    conn = psycopg2.connect(DB_URL)
+    with conn.cursor() as cur:
+        # Have the server notice a vanished worker host quickly, which releases its leases
+        cur.execute("SET tcp_keepalives_idle = 10")
+        cur.execute("SET tcp_keepalives_interval = 5")
+        cur.execute("SET tcp_keepalives_count = 3")
+    conn.commit()
+    return conn
+
+
+def plan_job(args, path, owner=None, conn=None):
+    ranges = byte_ranges(path, args.shards) if args.mode == "bytes" else hash_ranges(args.shards)
+    leases = ShardLeases(conn or connect(), args.job, owner or "planner", args.lease_timeout)
+    if leases.plan(args.mode, ranges, source_id(path), args.restart):
+        print(f"Planned job {args.job!r}: {len(ranges)} {args.mode} shards of {path}")
+    return leases
+
+
+def run_worker(args, path):
+    """Claim and import shards until every shard of the job is finished; returns False if a lease was lost."""
+    owner = args.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    conn = connect()
+    metrics = ImportMetrics(jsonl_path=args.metrics, prometheus_path=args.prometheus, job=f"shard_import:{args.job}")
+    totals = [0, 0, 0, 0]
+    shards_done = 0
+    spill = None
+    try:
+        leases = plan_job(args, path, owner, conn)
+        while True:
+            shard = leases.claim()
+            if shard is None:
+                shards, finished = leases.status()[:2]
+                if finished == shards:
+                    if spill:
+                        shutil.rmtree(spill, ignore_errors=True)
+                    break
+                # Other workers hold the rest; keep polling so their shards are picked up if they die
+                time.sleep(POLL_SECONDS)
+                continue
+
+            if shard.previous_owner and shard.previous_owner != owner:
+                print(f"Reclaimed shard {shard.number} from {shard.previous_owner}, resuming at {shard.progress}")
+            else:
+                print(f"Claimed shard {shard.number} [{shard.lo}, {shard.hi})")
+            try:
+                if args.mode == "phone-hash" and spill is None:
+                    spill = spill_dir(path, args.shards, args.spill_dir)
+                    with metrics.stage("parse"):
+                        partition_by_hash(path, hash_ranges(args.shards), spill)
+                counts = import_shard(conn, leases, shard, path, args.mode, metrics, args.batch_size, spill)
+            except LeaseLost as e:
+                print(f"Error: {e}")
+                leases.release(shard)
+                return False
+            except Exception:
+                leases.release(shard)
+                raise
+            leases.finish(shard)
+            totals = [total + count for total, count in zip(totals, counts)]
+            shards_done += 1
+
+        summary = metrics.summary(imported=totals[0], duplicates=totals[1], invalid=totals[2], failed=totals[3])
+        print_summary(leases.status(), owner, shards_done, totals[0], summary["rows_per_sec"])
+        return True
+    finally:
+        metrics.close()
+        conn.close()
+
+
+def print_summary(status, owner=None, shards_done=0, imported_here=0, rows_per_sec=0.0):
+    shards, finished, imported, duplicates, invalid, failed = status
+    print("\n======================================")
+    print("  SHARDED IMPORT SUMMARY             ")
+    print("======================================")
+    if owner:
+        print(f"Worker:                 {owner}")
+        print(f"Shards imported here:   {shards_done}")
+        print(f"Imported here:          {imported_here} ({rows_per_sec} rows/sec)")
+    print(f"Shards finished:        {finished} of {shards}")
+    print(f"Imported (all workers): {imported}")
+    print(f"Duplicate phones:       {duplicates}")
+    print(f"Invalid phone numbers:  {invalid}")
+    print(f"Failed imports:         {failed}")
+    print("======================================")
+
+
+def run_local_workers(args, path, argv):
+    """
+    Run args.local_workers copies of this command as local processes against one database.
+
+    Returns True when the job finished, even if some workers were killed along the
+    way: their shards are taken over by the survivors.
+    """
+    worker_argv = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in ("--local-workers", "--worker-id"):
+            skip = True
+        elif arg != "--restart" and not arg.startswith(("--local-workers=", "--worker-id=")):
+            worker_argv.append(arg)
+
+    # Plan (or re-plan) once here rather than racing in every worker
+    leases = plan_job(args, path)
+    workers = []
+    for i in range(args.local_workers):
+        command = [sys.executable, os.path.abspath(__file__), *worker_argv,
+                   "--job", args.job, "--worker-id", f"{socket.gethostname()}:local-{i}"]
+        workers.append(subprocess.Popen(command))
+        print(f"Started local worker {i} (pid {workers[-1].pid})")
+
+    try:
+        codes = [worker.wait() for worker in workers]
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.send_signal(signal.SIGINT)
+        codes = [worker.wait() for worker in workers]
+    print(f"Local workers exited with {codes}")
+
+    status = leases.status()
+    leases.conn.close()
+    print_summary(status)
+    return status[0] == status[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import one users CSV with any number of cooperating workers")
+    parser.add_argument("--csv", help="CSV file to import (defaults to the attached users sheet); "
+                                      "every worker needs the same file")
+    parser.add_argument("--job", help="Job name shared by all workers of one import (default: the file name)")
+    parser.add_argument("--mode", choices=("bytes", "phone-hash"), default="bytes",
+                        help="Shard by byte range (each worker reads only its shards) or by phone-hash range "
+                             "(each host splits the file by range once; the first copy of a phone always wins)")
+    parser.add_argument("--shards", type=int, default=SHARDS, help="Shards to plan (fixed when the job is created)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per transaction")
+    parser.add_argument("--spill-dir", default=SPILL_ROOT,
+                        help="Where phone-hash mode keeps this host's per-range copies of the file "
+                             "(default: %(default)s)")
+    parser.add_argument("--worker-id", help="Name recorded on this worker's leases (default: host:pid)")
+    parser.add_argument("--lease-timeout", type=int, default=LEASE_TIMEOUT,
+                        help="Seconds without a heartbeat before a hung owner's backend is terminated")
+    parser.add_argument("--local-workers", type=int,
+                        help="Run this many workers as local processes (for testing on one host)")
+    parser.add_argument("--restart", action="store_true",
+                        help="Discard the job's shards and claims and plan it again (stop all workers first)")
+    parser.add_argument("--plan-only", action="store_true",
+                        help="Create the job's shards and exit, e.g. before starting workers on several hosts")
+    parser.add_argument("--metrics", help="Append per-batch stage metrics as JSON lines to this file")
+    parser.add_argument("--prometheus", help="Keep a Prometheus textfile with the current metrics at this path")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    print("======================================")
+    print("  SHARDED USER IMPORT TOOL           ")
+    print("======================================")
+
+    path = args.csv or os.path.join(os.path.dirname(os.path.abspath(__file__)), CSV_PATH)
+    args.job = args.job or os.path.basename(path)
+
+    try:
+        if args.plan_only:
+            leases = plan_job(args, path)
+            print_summary(leases.status())
+            leases.conn.close()
+            return
+        if args.local_workers:
+            ok = run_local_workers(args, path, sys.argv[1:])
+        else:
+            with profiled("shard_import", args.profile, args.profile_dir, args.profile_memory,
+                          near=args.metrics or args.csv):
+                ok = run_worker(args, path)
+    except ValueError as e:
+        print(f"Error: {e}")
+        ok = False
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+
+"""
+Import Pre-flight Validator
+Scans a whole users CSV with vectorized checks before any importer writes to the database
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import psycopg2
+
+from profiling import add_profile_arguments, profiled
+
+# Configuration
+CSV_PATH = "attached_assets/users - Sheet1.csv"
+PHONE_DIGITS = 10
+TIME_PATTERN = r"\d{1,2}:\d{2}:\d{2}"
+DATE_FORMAT = "%m/%d/%Y %H:%M:%S"
+DATE_FORMATS = (DATE_FORMAT, "%m/%d/%Y")
+
+# Longest value accepted per CSV column (the users table stores these as text,
+# these limits keep display names and emails derived from them sane)
+MAX_FIELD_LENGTHS = {
+    "Username": 50,
+    "Is Admin": 5,
+    "Is Banned": 5,
+}
+
+# Database connection from environment variables
+DB_URL = os.environ.get('DATABASE_URL')
+
+
+def _string_dtype():
+    """Arrow-backed strings when pyarrow is installed (much faster .str methods), else pandas strings."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "string"
+    return "string[pyarrow]"
+
+
+def read_users_csv(file_path):
+    """Read the users sheet with every column as a string so phones keep their digits."""
+    df = pd.read_csv(file_path, dtype=_string_dtype(), keep_default_na=False, engine="c")
+    df.columns = [str(col).strip() for col in df.columns]
+    return df
+
+
+def _text(df, column):
+    """
+    A column as stripped strings.
+
+    Kept as a pandas string column rather than a fixed-width numpy array, whose
+    memory is rows x longest value, so one over-long field cannot blow up the scan.
+    """
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=_string_dtype())
+    column = df[column]
+    if not isinstance(column.dtype, pd.StringDtype):
+        column = column.astype(_string_dtype())
+    return column.str.strip()
+
+
+def _parse_dates(created, status):
+    """Parse the Created At/Status pairs the combined format missed, see parse_created_at."""
+    raw = created.str.replace(",", " ", regex=False).str.split().str.join(" ")
+    split_time = status.str.fullmatch(TIME_PATTERN) & ~raw.str.contains(":", regex=False)
+    raw = raw.where(~split_time, raw + " " + status)
+
+    parsed = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+    for fmt in DATE_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(raw[missing], format=fmt, errors="coerce")
+    return parsed, raw
+
+
+def parse_created_at(df):
+    """
+    Parse the Created At column into timestamps.
+
+    The sheet export splits "4/20/2025, 23:58:44" on its comma, so the time usually
+    lands in the Status column. Sheets repeat the same timestamps many times, so each
+    distinct "date time" pair is parsed once, in a single pass, and broadcast back;
+    only the pairs that miss (dates with the time still attached, date-only values)
+    go through the per-format fallback. Returns the parsed series (NaT where missing
+    or invalid) and the raw text that was parsed.
+    """
+    created = _text(df, "Created At")
+    status = _text(df, "Status")
+    codes, uniques = pd.factorize(created + " " + status)
+    first = pd.Series(codes).drop_duplicates().index  # first row of each distinct pair
+    parsed = pd.Series(pd.to_datetime(uniques, format=DATE_FORMAT, errors="coerce"))
+    raw = pd.Series(created.iloc[first].to_numpy(dtype=object))
+
+    retry = (parsed.isna() & (raw != "")).to_numpy()
+    if retry.any():
+        retried, retried_raw = _parse_dates(created.iloc[first[retry]], status.iloc[first[retry]])
+        parsed[retry] = retried.to_numpy()
+        raw[retry] = retried_raw.to_numpy(dtype=object)
+    return (pd.Series(parsed.to_numpy()[codes], index=df.index),
+            pd.Series(raw.to_numpy()[codes], index=df.index))
+
+
+def _issues(mask, column, code, values):
+    """Collect the rows flagged by a boolean mask as an issues frame."""
+    flagged = np.flatnonzero(mask)
+    return pd.DataFrame({
+        "row": flagged + 2,  # 1-based line number, after the header
+        "column": column,
+        "code": code,
+        "value": values.iloc[flagged].to_numpy(dtype=object),
+    })
+
+
+def validate_users(df, existing_usernames=None, existing_phones=None, max_lengths=None):
+    """
+    Run every pre-flight check over the sheet at once.
+
+    Returns a DataFrame with one line per problem found (row, column, code, value).
+    """
+    max_lengths = MAX_FIELD_LENGTHS if max_lengths is None else max_lengths
+    issues = []
+
+    missing = [col for col in ("Username", "Phone") if col not in df.columns]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+    phone = _text(df, "Phone")
+    username = _text(df, "Username")
+
+    # Phone numbers must be exactly 10 digits
+    valid_phone = (phone.str.isdigit() & (phone.str.len() == PHONE_DIGITS)).to_numpy()
+    issues.append(_issues(~valid_phone, "Phone", "invalid_phone", phone))
+
+    # Duplicates within the file (the first occurrence is the one that gets imported)
+    phone_codes, _ = pd.factorize(phone)
+    duplicate_phone = valid_phone & pd.Series(phone_codes).duplicated(keep="first").to_numpy()
+    issues.append(_issues(duplicate_phone, "Phone", "duplicate_phone", phone))
+
+    username_codes, _ = pd.factorize(username)
+    has_username = (username != "").to_numpy()
+    duplicate_username = has_username & pd.Series(username_codes).duplicated(keep="first").to_numpy()
+    issues.append(_issues(duplicate_username, "Username", "duplicate_username", username))
+
+    # Rows without a username are imported as user_<last 6 phone digits>; two of those
+    # (or one matching a real username) collide, and ON CONFLICT DO NOTHING drops the row
+    importable = valid_phone & ~duplicate_phone
+    fallback = importable & ~has_username
+    effective = username.where(has_username, "user_" + phone.str[-6:])
+    effective_codes, _ = pd.factorize(effective)
+    seen_before = pd.Series(np.where(importable, effective_codes, -1 - np.arange(len(effective_codes))))
+    duplicate_fallback = fallback & seen_before.duplicated(keep="first").to_numpy()
+    issues.append(_issues(duplicate_fallback, "Username", "duplicate_fallback_username", effective))
+
+    # Collisions with users already in the database
+    if existing_phones:
+        existing_phone = valid_phone & phone.isin(existing_phones).to_numpy()
+        issues.append(_issues(existing_phone, "Phone", "existing_phone", phone))
+
+    if existing_usernames:
+        taken = has_username & username.isin(existing_usernames).to_numpy()
+        issues.append(_issues(taken, "Username", "username_collision", username))
+        fallback_taken = fallback & ~duplicate_fallback & effective.isin(existing_usernames).to_numpy()
+        issues.append(_issues(fallback_taken, "Username", "username_collision", effective))
+
+    # Dates that are present but cannot be parsed
+    if "Created At" in df.columns:
+        parsed, raw = parse_created_at(df)
+        bad_date = ((raw != "") & parsed.isna()).to_numpy()
+        issues.append(_issues(bad_date, "Created At", "invalid_date", raw))
+
+    # Over-long fields
+    for column, limit in max_lengths.items():
+        if column not in df.columns:
+            continue
+        values = _text(df, column)
+        issues.append(_issues((values.str.len() > limit).to_numpy(), column, "too_long", values))
+
+    result = pd.concat(issues, ignore_index=True)
+    return result.sort_values(["row", "column"], kind="stable").reset_index(drop=True)
+
+
+def summarize(df, issues):
+    """Build the summary printed at the end of a dry run."""
+    bad_rows = issues["row"].nunique()
+    return {
+        "total_rows": len(df),
+        "valid_rows": len(df) - bad_rows,
+        "rows_with_errors": bad_rows,
+        "errors_by_code": {code: int(count) for code, count in issues["code"].value_counts().items()},
+    }
+
+
+def get_existing_values(conn):
+    """Read existing usernames and phones (read-only, no transaction is left open)."""
+    cur = conn.cursor()
+    cur.execute("SELECT username, phone FROM users")
+    rows = cur.fetchall()
+    cur.close()
+    conn.rollback()
+    return {row[0] for row in rows}, {row[1] for row in rows}
+
+
+def print_summary(summary, error_path=None):
+    print("\n======================================")
+    print("  DRY RUN VALIDATION SUMMARY         ")
+    print("======================================")
+    print(f"Total rows:             {summary['total_rows']}")
+    print(f"Valid rows:             {summary['valid_rows']}")
+    print(f"Rows with errors:       {summary['rows_with_errors']}")
+    for code, count in sorted(summary["errors_by_code"].items()):
+        print(f"  {code:<30}{count}")
+    if error_path:
+        print(f"Per-row errors written to {error_path}")
+    print("======================================")
+
+
+def run_dry_run(file_path, conn=None, error_path=None):
+    """
+    Validate a CSV and report, without writing anything to the database.
+
+    Returns True when the file has no errors.
+    """
+    print(f"\nValidating {file_path} (dry run, nothing will be written)")
+    df = read_users_csv(file_path)
+
+    existing_usernames, existing_phones = (None, None)
+    if conn is not None:
+        existing_usernames, existing_phones = get_existing_values(conn)
+
+    issues = validate_users(df, existing_usernames, existing_phones)
+    summary = summarize(df, issues)
+
+    if error_path is None:
+        error_path = os.path.splitext(file_path)[0] + ".errors.csv"
+    issues.to_csv(error_path, index=False)
+    with open(os.path.splitext(error_path)[0] + ".summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print_summary(summary, error_path)
+    return summary["rows_with_errors"] == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a users CSV before importing it")
+    parser.add_argument("csv", nargs="?", default=CSV_PATH, help="CSV file to validate")
+    parser.add_argument("--errors", help="Where to write the per-row error file")
+    parser.add_argument("--no-db", action="store_true",
+                        help="Skip the username/phone collision checks against DATABASE_URL")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    conn = None
+    if DB_URL and not args.no_db:
+        conn = psycopg2.connect(DB_URL)
+
+    try:
+        with profiled("validate_import", args.profile, args.profile_dir, args.profile_memory,
+                      near=args.errors or args.csv):
+            ok = run_dry_run(args.csv, conn, args.errors)
+    finally:
+        if conn:
+            conn.close()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+
+"""
+Bulk Provably-Fair Verifier
+Streams completed bets from Postgres with a server-side cursor and recomputes each
+result from its server seed, client seed and nonce across a process pool, using
+bit-for-bit ports of the derivations in server/games/provably-fair.ts. Every bet
+whose stored outcome differs from the recomputed one is reported.
+
+Only dice and dice-trading outcomes are produced by those derivations. The other
+engines (limbo's own formula, plinko, crash, client-reported mines) do not use
+them, so their differences are counted separately rather than as mismatches.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from decimal import ROUND_HALF_UP, Decimal
+
+import psycopg2
+
+from profiling import add_profile_arguments, profiled
+
+# Configuration
+CHUNK_ROWS = 20_000      # bets per pool task and per cursor fetch
+MAX_IN_FLIGHT = 4        # chunks queued per worker, bounds memory
+MINES_TILES = 25         # totalSquares passed to generateMinePositions()
+MAX_REPORTED = 1000      # mismatches printed (all are written with --mismatches)
+
+# Database connection from environment variables
+DB_URL = os.environ.get('DATABASE_URL')
+
+
+def sha256_hex(text):
+    # crypto.createHash('sha256').update(string) hashes the UTF-8 bytes
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def random_number(server_seed, client_seed, nonce):
+    """generateRandomNumber(): the first 8 hex digits of sha256("server-client-nonce") over 0xffffffff."""
+    return int(sha256_hex(f"{server_seed}-{client_seed}-{nonce}")[:8], 16) / 0xFFFFFFFF
+
+
+def to_fixed_2(value):
+    """
+    parseFloat(value.toFixed(2)).
+
+    toFixed rounds the double's exact binary value half up, so the fast path is only
+    trusted away from a tie; near one the exact decimal value decides.
+    """
+    scaled = value * 100
+    fraction = scaled - math.floor(scaled)
+    if abs(fraction - 0.5) > 1e-6:
+        return math.floor(scaled + 0.5) / 100
+    return float(Decimal(value).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def dice_roll(server_seed, client_seed, nonce, outcome):
+    """calculateDiceRoll()"""
+    return to_fixed_2(random_number(server_seed, client_seed, nonce) * 100)
+
+
+def crash_point(server_seed, client_seed, nonce, outcome):
+    """calculateCrashPoint()"""
+    random = random_number(server_seed, client_seed, nonce)
+    return to_fixed_2(max(1, 1 / (1 - random * 0.99)))
+
+
+def limbo_result(server_seed, client_seed, nonce, outcome):
+    """calculateLimboResult(), the formula /api/verify shows players"""
+    return to_fixed_2(1 / (1 - random_number(server_seed, client_seed, nonce) * 0.99))
+
+
+def plinko_path(server_seed, client_seed, nonce, outcome):
+    """generatePlinkoPath(): the running position after each row, one hash per row"""
+    path, position = [], 0
+    for row in range(len(outcome.get("path") or ())):
+        position += int(sha256_hex(f"{server_seed}-{client_seed}-{nonce}-{row}")[0], 16) % 2
+        path.append(position)
+    return path
+
+
+def mine_positions(server_seed, client_seed, nonce, outcome):
+    """generateMinePositions() on the 25-tile board, for as many mines as the bet had"""
+    available = list(range(MINES_TILES))
+    positions = []
+    for i in range(len(outcome.get("minePositions") or ())):
+        index = int(sha256_hex(f"{server_seed}-{client_seed}-{nonce}-{i}")[:8], 16) % len(available)
+        positions.append(available.pop(index))
+    return sorted(positions)
+
+
+# Game slug -> (outcome field, derivation)
+GAME_CHECKS = {
+    "dice": ("result", dice_roll),
+    "dice-trading": ("result", dice_roll),
+    "crash": ("crashPoint", crash_point),
+    "limbo": ("result", limbo_result),
+    "plinko": ("path", plinko_path),
+    "mines": ("minePositions", mine_positions),
+}
+
+# Games whose engines store the result of the derivation above (dice.ts and
+# diceTrading.ts call calculateDiceRoll). limbo.ts uses its own 1/(r*0.99) curve,
+# plinko and crash draw their own numbers and mines outcomes come from the client,
+# so for those a difference says nothing about tampering.
+ENGINE_DERIVED = ("dice", "dice-trading")
+
+
+def verify_chunk(rows):
+    """
+    Recompute one chunk of (id, slug, server_seed, client_seed, nonce, outcome_json) rows.
+
+    Returns (checked per game, skipped, mismatches, underived); a mismatch is
+    (id, game, field, stored, expected). Differences in games outside
+    ENGINE_DERIVED are only counted, per game, in underived.
+    """
+    checked = {}
+    skipped = 0
+    mismatches = []
+    underived = {}
+    for bet_id, slug, server_seed, client_seed, nonce, outcome_json in rows:
+        outcome = json.loads(outcome_json) if outcome_json else {}
+        field, derive = GAME_CHECKS[slug]
+        if not outcome:
+            # Created but never completed
+            skipped += 1
+            continue
+        checked[slug] = checked.get(slug, 0) + 1
+        stored = outcome.get(field)
+        expected = derive(server_seed, client_seed, nonce, outcome)
+        if stored == expected:
+            continue
+        if slug in ENGINE_DERIVED:
+            mismatches.append((bet_id, slug, field, stored, expected))
+        else:
+            underived[slug] = underived.get(slug, 0) + 1
+    return checked, skipped, mismatches, underived
+
+
+def stream_bets(conn, games, after_id=0, chunk_rows=CHUNK_ROWS):
+    """Yield completed bets of the given games in id order, chunk_rows at a time, from a server-side cursor."""
+    with conn.cursor(name="verify_bets") as cur:
+        cur.itersize = chunk_rows
+        cur.execute("""
+            SELECT b.id, g.slug, b.server_seed, b.client_seed, b.nonce, b.outcome::text
+            FROM bets b JOIN games g ON g.id = b.game_id
+            WHERE b.completed AND g.slug = ANY(%s) AND b.id > %s
+            ORDER BY b.id
+        """, (list(games), after_id))
+        while True:
+            rows = cur.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield rows
+
+
+def count_bets(conn, games, after_id=0):
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT count(*) FROM bets b JOIN games g ON g.id = b.game_id
+        WHERE b.completed AND g.slug = ANY(%s) AND b.id > %s
+    """, (list(games), after_id))
+    count = cur.fetchone()[0]
+    cur.close()
+    conn.rollback()
+    return count
+
+
+def verify_bets(conn, games, jobs, after_id=0, chunk_rows=CHUNK_ROWS, mismatch_writer=None):
+    """Verify every matching bet; returns (checked per game, skipped, mismatch count, underived differences per game)."""
+    total = count_bets(conn, games, after_id)
+    print(f"{total:,} completed bets to verify ({', '.join(games)})")
+
+    checked, skipped, mismatch_count, done = {}, 0, 0, 0
+    underived = {}
+    started = time.perf_counter()
+
+    def collect(future):
+        nonlocal skipped, mismatch_count, done
+        chunk_checked, chunk_skipped, mismatches, chunk_underived = future.result()
+        for game, count in chunk_checked.items():
+            checked[game] = checked.get(game, 0) + count
+        for game, count in chunk_underived.items():
+            underived[game] = underived.get(game, 0) + count
+        skipped += chunk_skipped
+        done += sum(chunk_checked.values()) + chunk_skipped
+        for bet_id, game, field, stored, expected in mismatches:
+            if mismatch_count < MAX_REPORTED:
+                print(f"  MISMATCH bet {bet_id} ({game}): {field} stored {stored!r}, recomputed {expected!r}")
+            if mismatch_writer:
+                mismatch_writer.writerow([bet_id, game, field, json.dumps(stored), json.dumps(expected)])
+            mismatch_count += 1
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = set()
+        for rows in stream_bets(conn, games, after_id, chunk_rows):
+            # Keep a bounded queue so the cursor never runs far ahead of the workers
+            while len(pending) >= jobs * MAX_IN_FLIGHT:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    collect(future)
+            pending.add(pool.submit(verify_chunk, rows))
+
+            elapsed = time.perf_counter() - started
+            if done:
+                print(f"Verified {done:,}/{total:,} bets, {mismatch_count} mismatches "
+                      f"({done / elapsed * 60 / 1e6:.1f}M bets/min), up to id {rows[-1][0]}")
+        for future in wait(pending).done:
+            collect(future)
+    conn.rollback()
+
+    elapsed = time.perf_counter() - started
+    if done:
+        print(f"Verified {done:,} bets in {elapsed:.1f}s ({done / elapsed * 60 / 1e6:.1f}M bets/min)")
+    return checked, skipped, mismatch_count, underived
+
+
+def print_summary(checked, skipped, mismatch_count, underived=None, mismatch_path=None):
+    print("\n======================================")
+    print("  PROVABLY-FAIR VERIFICATION SUMMARY ")
+    print("======================================")
+    for game, count in sorted(checked.items()):
+        print(f"  {game:<22}{count:,} checked")
+    print(f"Skipped (no outcome):   {skipped:,}")
+    print(f"Mismatches:             {mismatch_count:,}")
+    if underived:
+        print("Differences in games whose engine does not use the provably-fair derivation:")
+        for game, count in sorted(underived.items()):
+            print(f"  {game:<22}{count:,}")
+    if mismatch_path and mismatch_count:
+        print(f"Mismatches written to {mismatch_path}")
+    print("======================================")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute provably-fair results for stored bets and report mismatches")
+    parser.add_argument("--games", nargs="+", choices=sorted(GAME_CHECKS), default=list(ENGINE_DERIVED),
+                        help="Game slugs to verify (default: the games whose engines use the provably-fair "
+                             "derivations; differences in the others are counted, not reported as mismatches)")
+    parser.add_argument("--after-id", type=int, default=0, help="Only verify bets with a larger id (to resume)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Bets per cursor fetch and pool task")
+    parser.add_argument("--mismatches", help="Write every mismatch to this CSV")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    print("======================================")
+    print("  BULK PROVABLY-FAIR VERIFIER        ")
+    print("======================================")
+
+    conn = psycopg2.connect(DB_URL)
+    mismatch_file = open(args.mismatches, "w", newline="") if args.mismatches else None
+    try:
+        writer = None
+        if mismatch_file:
+            writer = csv.writer(mismatch_file)
+            writer.writerow(["bet_id", "game", "field", "stored", "recomputed"])
+        with profiled("verify_bets", args.profile, args.profile_dir, args.profile_memory,
+                      near=args.mismatches):
+            checked, skipped, mismatch_count, underived = verify_bets(conn, args.games, args.jobs, args.after_id,
+                                                                      args.chunk_rows, writer)
+    finally:
+        if mismatch_file:
+            mismatch_file.close()
+        conn.close()
+
+    print_summary(checked, skipped, mismatch_count, underived, args.mismatches)
+    sys.exit(1 if mismatch_count else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+// Generated by mines_table.py from the Mines combinatorics. Do not edit;
+// re-run `python mines_table.py` to change the house edge or rounding.
+
+export const MINES_TILES = 25;
+export const MINES_HOUSE_EDGE = 0;
+
+// Payout multiplier, rounded to cents, at index (mines - 1) * 24 + (gems - 1); 0 where the pair can't happen
+export const MINES_EXACT_MULTIPLIERS: readonly number[] = [
+  /*  1 mines */ 1.04, 1.09, 1.14, 1.19, 1.25, 1.32, 1.39, 1.47, 1.56, 1.67, 1.79, 1.92, 2.08, 2.27, 2.5, 2.78, 3.12, 3.57, 4.17, 5, 6.25, 8.33, 12.5, 25,
+  /*  2 mines */ 1.09, 1.19, 1.3, 1.43, 1.58, 1.75, 1.96, 2.21, 2.5, 2.86, 3.3, 3.85, 4.55, 5.45, 6.67, 8.33, 10.71, 14.29, 20, 30, 50, 100, 300, 0,
+  /*  3 mines */ 1.14, 1.3, 1.49, 1.73, 2.02, 2.37, 2.82, 3.38, 4.11, 5.05, 6.32, 8.04, 10.45, 13.94, 19.17, 27.38, 41.07, 65.71, 115, 230, 575, 2300, 0, 0,
+  /*  4 mines */ 1.19, 1.43, 1.73, 2.11, 2.61, 3.26, 4.13, 5.32, 6.95, 9.27, 12.64, 17.69, 25.56, 38.33, 60.24, 100.4, 180.71, 361.43, 843.33, 2530, 12650, 0, 0, 0,
+  /*  5 mines */ 1.25, 1.58, 2.02, 2.61, 3.43, 4.57, 6.2, 8.59, 12.16, 17.69, 26.54, 41.28, 67.08, 115, 210.83, 421.67, 948.75, 2530, 8855, 53130, 0, 0, 0, 0,
+  /*  6 mines */ 1.32, 1.75, 2.37, 3.26, 4.57, 6.53, 9.54, 14.31, 22.12, 35.38, 58.97, 103.21, 191.67, 383.33, 843.33, 2108.33, 6325, 25300, 177100, 0, 0, 0, 0, 0,
+  /*  7 mines */ 1.39, 1.96, 2.82, 4.13, 6.2, 9.54, 15.1, 24.72, 42.02, 74.7, 140.06, 280.13, 606.94, 1456.67, 4005.83, 13352.78, 60087.5, 480700, 0, 0, 0, 0, 0, 0,
+  /*  8 mines */ 1.47, 2.21, 3.38, 5.32, 8.59, 14.31, 24.72, 44.49, 84.04, 168.08, 360.16, 840.38, 2185, 6555, 24035, 120175, 1081575, 0, 0, 0, 0, 0, 0, 0,
+  /*  9 mines */ 1.56, 2.5, 4.11, 6.95, 12.16, 22.12, 42.02, 84.04, 178.58, 408.19, 1020.47, 2857.31, 9286.25, 37145, 204297.5, 2042975, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 10 mines */ 1.67, 2.86, 5.05, 9.27, 17.69, 35.38, 74.7, 168.08, 408.19, 1088.5, 3265.49, 11429.23, 49526.67, 297160, 3268760, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 11 mines */ 1.79, 3.3, 6.32, 12.64, 26.54, 58.97, 140.06, 360.16, 1020.47, 3265.49, 12245.6, 57146.15, 371450, 4457400, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 12 mines */ 1.92, 3.85, 8.04, 17.69, 41.28, 103.21, 280.13, 840.38, 2857.31, 11429.23, 57146.15, 400023.08, 5200300, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 13 mines */ 2.08, 4.55, 10.45, 25.56, 67.08, 191.67, 606.94, 2185, 9286.25, 49526.67, 371450, 5200300, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 14 mines */ 2.27, 5.45, 13.94, 38.33, 115, 383.33, 1456.67, 6555, 37145, 297160, 4457400, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 15 mines */ 2.5, 6.67, 19.17, 60.24, 210.83, 843.33, 4005.83, 24035, 204297.5, 3268760, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 16 mines */ 2.78, 8.33, 27.38, 100.4, 421.67, 2108.33, 13352.78, 120175, 2042975, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 17 mines */ 3.12, 10.71, 41.07, 180.71, 948.75, 6325, 60087.5, 1081575, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 18 mines */ 3.57, 14.29, 65.71, 361.43, 2530, 25300, 480700, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 19 mines */ 4.17, 20, 115, 843.33, 8855, 177100, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 20 mines */ 5, 30, 230, 2530, 53130, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 21 mines */ 6.25, 50, 575, 12650, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 22 mines */ 8.33, 100, 2300, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 23 mines */ 12.5, 300, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  /* 24 mines */ 25, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+];
+
+// The exact multiplier for a cash-out, or undefined if the pair can't happen
+export function exactMinesMultiplier(mines: number, gems: number): number | undefined {
+  if (!Number.isInteger(mines) || !Number.isInteger(gems) || mines < 1 || gems < 1 || mines > 24 || gems > 24) {
+    return undefined;
+  }
+  return MINES_EXACT_MULTIPLIERS[(mines - 1) * 24 + gems - 1] || undefined;
+}